@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Async dispatcher for per-repo analysis agents.
+
+Each analysis request holds a prompt and the metrics computed locally. A
+request is either a whole repository or one chunk of it, identified by
+its 'key' (the repo name by default). Requests run concurrently on an asyncio event loop under
+a concurrency limit. Each repo has one deadline budget shared by all of
+its chunks and covering every attempt. The budget starts when the repo's
+first chunk starts running, so time spent queued behind other repos does
+not count against it. Failed agent calls are retried with exponential
+backoff, up to `retries` times per call. When a repo still fails, the
+dispatcher returns it as a failure and keeps the results of the repos that
+succeeded.
+
+With a DurationHistory, requests are started longest-expected-first:
+per-repo durations and prompt sizes are recorded across runs, and the
+expected duration of a request is its repo's seconds per character times
+its prompt size. Big repos then start right away while small ones fill the
+gaps, and the predicted makespan can be compared with the actual one.
+
+Backends are pluggable:
+- `local`: deterministic stand-in that returns the locally computed
+  analysis and needs no network
+- `command`: runs an external agent command, passing the prompt on stdin
+  and reading the analysis JSON from stdout
+
+Load test the dispatcher offline:
+  python3 agent_dispatch.py --load-test 500 [--concurrency N] [--fail-rate 0.2]
+"""
+
+import os
+import sys
+import json
+import time
+import heapq
+import random
+import asyncio
+import hashlib
+import argparse
+import tempfile
+
+from instrumentation import span
+
+DEFAULT_CONCURRENCY = 6
+DEFAULT_DEADLINE = 600
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 1.0
+HISTORY_FILE = os.path.expanduser("~/.cache/weekly_summary/agent_durations.json")
+HISTORY_WEIGHT = 0.5  # weight of the newest observation in the moving average
+
+
+class AgentError(Exception):
+    """Raised by a backend when an analysis attempt fails."""
+
+
+def stable_fraction(*parts):
+    """Map the given values to a deterministic float in [0, 1)."""
+    digest = hashlib.sha256('\x1f'.join(str(p) for p in parts).encode()).digest()
+    return int.from_bytes(digest[:8], 'big') / 2 ** 64
+
+
+class AnalysisBackend:
+    """Base class: turn one analysis request into an analysis dict."""
+
+    name = None
+
+    async def analyze(self, request, attempt):
+        raise NotImplementedError
+
+
+class LocalBackend(AnalysisBackend):
+    """Deterministic offline backend.
+
+    Returns the analysis computed from the commit metrics. For load tests it
+    can add a simulated latency and fail a fraction of attempts. Both are
+    derived from the request key and attempt number, so every run gives the
+    same result and a repo's chunks fail independently.
+    """
+
+    name = 'local'
+
+    def __init__(self, latency=0.0, fail_rate=0.0):
+        self.latency = latency
+        self.fail_rate = fail_rate
+
+    async def analyze(self, request, attempt):
+        key = request.get('key', request['repo'])
+        if self.latency:
+            await asyncio.sleep(self.latency * (0.5 + stable_fraction(key, 'latency')))
+        if self.fail_rate and stable_fraction(key, attempt) < self.fail_rate:
+            raise AgentError(f"simulated failure (attempt {attempt + 1})")
+        return dict(request['analysis'])
+
+
+class CommandBackend(AnalysisBackend):
+    """Run an external agent command per repo.
+
+    The prompt is written to the command's stdin, and the command must print
+    the analysis JSON on stdout. If the attempt is cancelled (for example
+    when the deadline passes), the process is killed.
+    """
+
+    name = 'command'
+
+    def __init__(self, command):
+        if not command:
+            raise ValueError("command backend needs an agent command")
+        self.command = command
+
+    async def analyze(self, request, attempt):
+        proc = await asyncio.create_subprocess_shell(
+            self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await proc.communicate(request['prompt'].encode())
+        except asyncio.CancelledError:
+            proc.kill()
+            await proc.wait()
+            raise
+
+        if proc.returncode != 0:
+            detail = stderr.decode(errors='replace').strip()[:200]
+            raise AgentError(f"exit {proc.returncode}" + (f": {detail}" if detail else ""))
+        try:
+            return json.loads(stdout)
+        except json.JSONDecodeError as e:
+            raise AgentError(f"invalid JSON output: {e}")
+
+
+BACKENDS = {
+    'local': LocalBackend,
+    'command': CommandBackend,
+}
+
+
+def make_backend(name='local', command=None):
+    """Instantiate a backend by name."""
+    if name == 'command':
+        return CommandBackend(command)
+    return BACKENDS[name]()
+
+
+def lpt_makespan(durations, workers):
+    """Makespan of running `durations` longest-first on `workers` parallel slots."""
+    slots = [0.0] * max(1, min(workers, len(durations)))
+    for duration in sorted(durations, reverse=True):
+        heapq.heapreplace(slots, slots[0] + duration)
+    return max(slots) if durations else 0.0
+
+
+class DurationHistory:
+    """Agent durations per repo, kept across runs, for longest-first scheduling.
+
+    Durations are stored per backend as seconds per 1000 prompt characters,
+    an exponential moving average over runs, so a repo's chunks of
+    different sizes share one estimate.
+    """
+
+    def __init__(self, path=HISTORY_FILE, backend='local'):
+        self.path = path
+        self.backend = backend
+        try:
+            with open(path, 'r') as f:
+                self.data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.data = {}
+        self.rates = self.data.setdefault(backend, {})
+
+    def predict(self, request):
+        """Expected seconds for a request, or None without any history."""
+        rate = self.rates.get(request['repo'])
+        if rate is None:
+            if not self.rates:
+                return None
+            rate = sum(self.rates.values()) / len(self.rates)
+        return rate * len(request['prompt']) / 1000
+
+    def order(self, requests):
+        """Requests sorted longest-expected-first (by size without history)."""
+        return sorted(
+            requests,
+            key=lambda r: (self.predict(r) or 0, len(r['prompt'])),
+            reverse=True
+        )
+
+    def makespan(self, requests, workers):
+        """Predicted wall time for the requests, or None without history."""
+        predictions = [self.predict(r) for r in requests]
+        if not requests or None in predictions:
+            return None
+        return lpt_makespan(predictions, workers)
+
+    def record(self, request, seconds):
+        rate = seconds / max(len(request['prompt']), 1) * 1000
+        previous = self.rates.get(request['repo'])
+        if previous is not None:
+            rate = HISTORY_WEIGHT * rate + (1 - HISTORY_WEIGHT) * previous
+        self.rates[request['repo']] = rate
+
+    def save(self):
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+async def run_request(backend, request, semaphore, clocks, deadline, retries, backoff, history=None):
+    """Run one request until it succeeds or its repo's deadline passes.
+
+    `clocks` maps each repo to the monotonic time its deadline expires. A
+    repo's clock starts when the first of its requests gets a concurrency
+    slot, so time spent queued behind other repos does not count.
+
+    Returns (key, analysis, error).
+    """
+    key = request.get('key', request['repo'])
+    repo = request['repo']
+    error = None
+
+    for attempt in range(retries + 1):
+        if repo in clocks and clocks[repo] <= time.monotonic():
+            error = error or "deadline exceeded"
+            break
+
+        try:
+            async with semaphore:
+                started = time.monotonic()
+                remaining = clocks.setdefault(repo, started + deadline) - started
+                if remaining <= 0:
+                    error = "deadline exceeded"
+                    break
+                with span(f"agent {key}", 'agent', cpu=None, overlapping=True, attempt=attempt + 1):
+                    analysis = await asyncio.wait_for(backend.analyze(request, attempt), remaining)
+                if history is not None:
+                    history.record(request, time.monotonic() - started)
+                return key, analysis, None
+        except asyncio.TimeoutError:
+            error = "deadline exceeded"
+            break
+        except Exception as e:
+            error = str(e) or type(e).__name__
+
+        if attempt < retries:
+            # Exponential backoff, with jitter so retries don't all land together
+            delay = backoff * (2 ** attempt) * (0.5 + random.random())
+            await asyncio.sleep(min(delay, max(clocks[repo] - time.monotonic(), 0)))
+
+    return key, None, error
+
+
+async def dispatch_async(requests, backend, concurrency=DEFAULT_CONCURRENCY, deadline=DEFAULT_DEADLINE,
+                         retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, on_done=None, history=None):
+    """Analyze all requests concurrently.
+
+    A repo's chunks share one budget of `deadline` seconds, which starts
+    when its first chunk starts running. With a DurationHistory, requests start
+    longest-expected-first and the duration of each successful call is
+    recorded into it.
+
+    Returns (results, failures): {key: analysis} for the requests that
+    succeeded and {key: error} for the ones that did not.
+    `on_done(key, analysis, error)` is called as each request finishes.
+    """
+    if history is not None:
+        requests = history.order(requests)
+
+    # One deadline per repo, shared by its chunks and started by the first to run
+    clocks = {}
+
+    # The semaphore admits waiters in FIFO order, so tasks start in list order
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [
+        asyncio.ensure_future(run_request(
+            backend, request, semaphore, clocks, deadline, retries, backoff, history
+        ))
+        for request in requests
+    ]
+
+    results = {}
+    failures = {}
+    for task in asyncio.as_completed(tasks):
+        repo, analysis, error = await task
+        if error is None:
+            results[repo] = analysis
+        else:
+            failures[repo] = error
+        if on_done:
+            on_done(repo, analysis, error)
+
+    return results, failures
+
+
+def dispatch(requests, backend, **options):
+    """Synchronous entry point for `dispatch_async`."""
+    return asyncio.run(dispatch_async(requests, backend, **options))
+
+
+def synthetic_requests(count):
+    """Build `count` deterministic analysis requests for load testing."""
+    requests = []
+    for idx in range(count):
+        repo = f"load/repo-{idx:04d}"
+        commits = 1 + int(stable_fraction(repo, 'commits') * 200)
+        requests.append({
+            'repo': repo,
+            'prompt': f"Analyze the commits for {repo}.",
+            'analysis': {
+                'repo': repo,
+                'health': '🟢',
+                'total_commits': commits,
+                'active_branches': commits % 7,
+                'authors': [f"author-{commits % 5}"],
+                'initiatives': [],
+                'alpha_deployments': [],
+                'bugs_fixed': [],
+                'infrastructure': [],
+                'feature_branches': []
+            }
+        })
+    return requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the agent dispatcher with the local backend.")
+    parser.add_argument("--load-test", type=int, metavar="REPOS", required=True, help="Number of synthetic repos")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean simulated agent latency in seconds")
+    parser.add_argument("--fail-rate", type=float, default=0.1, help="Fraction of attempts that fail")
+    parser.add_argument("--deadline", type=float, default=DEFAULT_DEADLINE)
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    parser.add_argument("--backoff", type=float, default=0.01)
+    parser.add_argument("--history", help="Duration history file: schedule longest-first and record durations")
+    args = parser.parse_args()
+
+    requests = synthetic_requests(args.load_test)
+    backend = LocalBackend(latency=args.latency, fail_rate=args.fail_rate)
+    history = DurationHistory(args.history, 'load-test') if args.history else None
+
+    print(f"🧪 Dispatching {len(requests)} synthetic repos (concurrency {args.concurrency})...")
+    predicted = history.makespan(requests, args.concurrency) if history else None
+    started = time.monotonic()
+    results, failures = dispatch(
+        requests, backend, concurrency=args.concurrency, deadline=args.deadline,
+        retries=args.retries, backoff=args.backoff, history=history
+    )
+    elapsed = time.monotonic() - started
+    if history:
+        history.save()
+        if predicted is not None:
+            print(f"⏱️  Predicted makespan {predicted:.2f}s, actual {elapsed:.2f}s")
+
+    # Deterministic digest of the analyses, comparable across runs
+    digest = hashlib.sha256(json.dumps(results, sort_keys=True).encode()).hexdigest()[:16]
+
+    print(f"✅ {len(results)} analyzed, ❌ {len(failures)} failed in {elapsed:.2f}s "
+          f"({len(requests) / elapsed:.0f} repos/s)")
+    print(f"   Results digest: {digest}")
+    for repo, error in sorted(failures.items())[:10]:
+        print(f"   • {repo}: {error}")
+    if len(failures) > 10:
+        print(f"   • ... and {len(failures) - 10} more")
+
+    sys.exit(0 if results else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Single-pass aggregation shared by the technical and business reports.
+
+`aggregate` walks the commit table once, repo by repo, and computes every
+rollup both reports need: per repo, per author, per type, themes,
+initiatives, component health, critical issues and the top-N commit
+lists. The report generators only format the resulting `Rollup`.
+
+Rollups of consecutive slices of commits (one per repo, say) can be
+aggregated separately and folded together with `Rollup.merge`: the result
+is the rollup of all the commits, in the same order. `to_dict` and
+`from_dict` turn a rollup into plain JSON data and back, so rollups made
+on other machines can be merged too (see partial_report).
+"""
+
+import re
+
+from keyword_matcher import KeywordMatcher
+
+# Themes in priority order: a commit is filed under the first one it matches
+THEME_KEYWORDS = [
+    ('Observability & Logging', ('observability', 'cockpit', 'logging')),
+    ('Vector Database (Qdrant)', ('qdrant', 'vector')),
+    ('Authentication & Security', ('auth', 'jwt', 'token')),
+    ('Webhook System', ('webhook',)),
+    ('Data Pipelines', ('pipeline', 'workflow', 'argo')),
+    ('Service Mesh & Networking', ('istio', 'envoy')),
+    ('Database Infrastructure', ('postgres', 'pgbouncer', 'database')),
+]
+
+# Keywords that map to initiatives
+INITIATIVE_KEYWORDS = {
+    'observability': ('Platform Observability', 'cockpit', 'logging', 'monitoring', 'observability', 'loki'),
+    'status_page': ('Infrastructure Monitoring', 'uptime', 'kuma', 'status'),
+    'vector_search': ('Vector Search & AI', 'qdrant', 'vector', 'embedding', 'mistral', 'google'),
+    'authentication': ('Security & Authentication', 'auth', 'jwt', 'token', 'rbac', 'security'),
+    'data_pipelines': ('Data Processing', 'pipeline', 'workflow', 'argo', 'processor', 'ti_xml'),
+    'public_data': ('Multi-tenant Data Sharing', 'public', 'dataplane', 'cross-org'),
+    'database': ('Database Infrastructure', 'postgres', 'pgbouncer', 'pool', 'database'),
+    'networking': ('Network Infrastructure', 'istio', 'envoy', 'skupper', 'service mesh'),
+    'api_improvements': ('API & Developer Experience', 'openapi', 'client', 'api'),
+    'ui_features': ('Platform UI Enhancements', 'frontend', 'ui', 'dialog', 'toggle', 'interface'),
+    'webhooks': ('Event Processing', 'webhook', 'event'),
+    'performance': ('Performance Optimization', 'performance', 'memory', 'cpu', 'optimize', 'hpa')
+}
+
+# Map components to repos
+COMPONENT_MAP = {
+    'Backend API': ['web-app'],
+    'Frontend': ['web-app'],
+    'Data Processing': ['data-pipelines', 'data-cluster'],
+    'Infrastructure': ['k8s-charts', 'data-cluster-helm', 'data-cluster-operator'],
+    'Workers': ['workers'],
+    'Networking': ['skupper-gateway'],
+    'MCP Services': ['MCPs/mcp-base', 'MCPs/mcp-openaire', 'MCPs/mcp-datacluster']
+}
+
+CRITICAL_WORDS = ('critical', 'crash', '502', '504', 'timeout', 'memory leak')
+
+# Compiled once: each subject is classified in a single scan
+THEME_MATCHER = KeywordMatcher(THEME_KEYWORDS)
+INITIATIVE_MATCHER = KeywordMatcher(
+    (init_name, keywords) for init_name, *keywords in INITIATIVE_KEYWORDS.values()
+)
+CRITICAL_MATCHER = KeywordMatcher([('critical', CRITICAL_WORDS)])
+
+REPO_TOP_N = 10
+AUTHOR_TOP_N = 5
+THEME_ITEMS = 3
+HIGHLIGHTS = 3
+
+
+def repo_component(repo):
+    """Return the platform component a repository belongs to."""
+    for comp, repos in COMPONENT_MAP.items():
+        if any(r in repo for r in repos):
+            return comp
+    return 'Infrastructure'  # default
+
+
+def commit_snapshot(commit):
+    """Keep just the fields the renderers show for a listed commit."""
+    return {
+        'hash': commit['hash'],
+        'subject': commit['subject'],
+        'body': commit['body'],
+        'author': commit['author'],
+        'date': commit['date']
+    }
+
+
+class Rollup:
+    """Every aggregate the reports render, computed by `aggregate`.
+
+    Dicts keep the order the commits were first seen in, so renderers that
+    sort by count break ties the same way the per-report loops used to.
+    """
+
+    def __init__(self):
+        self.total_commits = 0
+        self.type_counts = {}       # type -> commits
+        self.repos = {}             # repo -> {'commits', 'types', 'top'}
+        self.authors = {}           # author -> {'commits', 'features', 'fixes', 'repos'}
+        self.themes = {}            # theme -> {'commits', 'items'}
+        self.initiatives = {}       # initiative -> {'commits', 'repos', 'highlights'}
+        self.component_health = {}  # component -> {'features', 'fixes', 'issues'}
+        self.first_seen = {}        # ('type'|'author'|'author_repo', ...) -> rank
+        self.span = 0               # ranks used, so a merged rollup ranks after this one
+        self.tracked_repos = None   # repositories the rollup covers; None means config.REPOS
+
+    @property
+    def merge_requests(self):
+        return self.type_counts.get('merge', 0)
+
+    @property
+    def active_repos(self):
+        return len([r for r, details in self.repos.items() if details['commits']])
+
+    def most_active_repo(self):
+        """Return (repo, commits) for the busiest repository."""
+        repo, details = max(self.repos.items(), key=lambda x: x[1]['commits'])
+        return repo, details['commits']
+
+    def sorted_initiatives(self, limit=None):
+        """Initiatives by commit count, descending."""
+        ranked = sorted(self.initiatives.items(), key=lambda x: x[1]['commits'], reverse=True)
+        return ranked[:limit] if limit else ranked
+
+    def top_initiative(self):
+        if not self.initiatives:
+            return ("General improvements", {'commits': 0, 'repos': set(), 'highlights': []})
+        return max(self.initiatives.items(), key=lambda x: x[1]['commits'])
+
+    def critical_issues(self):
+        """Return [(component, subject)] for every critical fix."""
+        return [
+            (component, issue)
+            for component, health in self.component_health.items()
+            for issue in health['issues']
+        ]
+
+    def health(self):
+        """Return (emoji, description) for overall platform health."""
+        total_features = self.type_counts.get('feat', 0)
+        total_fixes = self.type_counts.get('fix', 0)
+        total_issues = sum(len(c['issues']) for c in self.component_health.values())
+
+        health_emoji = "🟢"
+        health_desc = "Strong"
+        if total_fixes > total_features * 1.5:
+            health_emoji = "🟡"
+            health_desc = "Moderate"
+        if total_issues >= 3:
+            health_emoji = "🔴"
+            health_desc = "Needs Attention"
+        return health_emoji, health_desc
+
+    def sort_by_first_seen(self):
+        """Order types, authors and each author's repos by when they were first seen."""
+        first_seen = self.first_seen
+        self.type_counts = dict(sorted(self.type_counts.items(), key=lambda x: first_seen[('type', x[0])]))
+        self.authors = dict(sorted(self.authors.items(), key=lambda x: first_seen[('author', x[0])]))
+        for author, entry in self.authors.items():
+            entry['repos'] = dict(sorted(entry['repos'].items(), key=lambda x: first_seen[('author_repo', author, x[0])]))
+
+    def merge(self, other):
+        """Fold in the rollup of the commits that come after this one's; returns self.
+
+        Counts are summed, top-N lists and highlights are concatenated and
+        cut back to their limits, and first-seen order is kept.
+        """
+        for key, rank in other.first_seen.items():
+            self.first_seen.setdefault(key, rank + self.span)
+        self.span += other.span
+
+        self.total_commits += other.total_commits
+        add_counts(self.type_counts, other.type_counts)
+
+        for repo, entry in other.repos.items():
+            merge_group(self.repos.setdefault(repo, {'commits': 0, 'types': {}, 'top': {}}), entry, REPO_TOP_N)
+
+        for author, entry in other.authors.items():
+            mine = self.authors.setdefault(author, {'commits': 0, 'features': 0, 'fixes': 0, 'repos': {}})
+            for field in ('commits', 'features', 'fixes'):
+                mine[field] += entry[field]
+            for repo, group in entry['repos'].items():
+                merge_group(mine['repos'].setdefault(repo, {'commits': 0, 'types': {}, 'top': {}}), group, AUTHOR_TOP_N)
+
+        for theme, entry in other.themes.items():
+            mine = self.themes.setdefault(theme, {'commits': 0, 'items': []})
+            mine['commits'] += entry['commits']
+            mine['items'].extend(entry['items'][:THEME_ITEMS - len(mine['items'])])
+
+        for name, entry in other.initiatives.items():
+            mine = self.initiatives.setdefault(name, {'commits': 0, 'repos': set(), 'highlights': []})
+            mine['commits'] += entry['commits']
+            mine['repos'].update(entry['repos'])
+            mine['highlights'].extend(entry['highlights'][:HIGHLIGHTS - len(mine['highlights'])])
+
+        for component, entry in other.component_health.items():
+            mine = self.component_health.setdefault(component, {'features': 0, 'fixes': 0, 'issues': []})
+            mine['features'] += entry['features']
+            mine['fixes'] += entry['fixes']
+            mine['issues'].extend(entry['issues'])
+
+        if self.tracked_repos is not None or other.tracked_repos is not None:
+            tracked = list(self.tracked_repos or [])
+            tracked.extend(repo for repo in other.tracked_repos or [] if repo not in tracked)
+            self.tracked_repos = tracked
+
+        self.sort_by_first_seen()
+        return self
+
+    def to_dict(self):
+        """Return the rollup as JSON-serializable data."""
+        return {
+            'total_commits': self.total_commits,
+            'type_counts': self.type_counts,
+            'repos': self.repos,
+            'authors': self.authors,
+            'themes': self.themes,
+            'initiatives': {
+                name: dict(entry, repos=sorted(entry['repos']))
+                for name, entry in self.initiatives.items()
+            },
+            'component_health': self.component_health,
+            'first_seen': [list(key) + [rank] for key, rank in self.first_seen.items()],
+            'span': self.span,
+            'tracked_repos': self.tracked_repos,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a rollup from `to_dict` data."""
+        rollup = cls()
+        rollup.total_commits = data['total_commits']
+        rollup.type_counts = data['type_counts']
+        rollup.repos = data['repos']
+        rollup.authors = data['authors']
+        rollup.themes = data['themes']
+        rollup.initiatives = {
+            name: dict(entry, repos=set(entry['repos']))
+            for name, entry in data['initiatives'].items()
+        }
+        rollup.component_health = data['component_health']
+        rollup.first_seen = {tuple(item[:-1]): item[-1] for item in data['first_seen']}
+        rollup.span = data['span']
+        rollup.tracked_repos = data['tracked_repos']
+        return rollup
+
+
+def add_counts(target, counts):
+    for key, count in counts.items():
+        target[key] = target.get(key, 0) + count
+
+
+def merge_group(target, group, top_n):
+    """Merge a per-repo or per-author-repo entry: counts summed, top lists capped."""
+    target['commits'] += group['commits']
+    add_counts(target['types'], group['types'])
+    for ctype, top in group['top'].items():
+        mine = target['top'].setdefault(ctype, [])
+        mine.extend(top[:top_n - len(mine)])
+
+
+def merge_rollups(rollups):
+    """Merge rollups of consecutive slices of commits, in order, into a new Rollup."""
+    merged = Rollup()
+    for rollup in rollups:
+        merged.merge(rollup)
+    return merged
+
+
+def aggregate(table, rows=None):
+    """Compute a Rollup over `rows` of a CommitTable (all rows by default)."""
+    rollup = Rollup()
+    by_repo = table.group_by('repo') if rows is None else table.partition(rows, 'repo')
+
+    # First row each author / author-repo / type was seen at, to restore
+    # first-seen order after walking repo by repo
+    first_seen = rollup.first_seen
+    rollup.span = len(table)
+
+    for repo, repo_rows in by_repo.items():
+        component = repo_component(repo)
+        repo_entry = rollup.repos[repo] = {'commits': 0, 'types': {}, 'top': {}}
+
+        for row in repo_rows:
+            commit = table.row(row)
+            ctype = commit.type
+            author = commit.author
+            subject = commit.subject
+            lowered = subject.lower()
+
+            rollup.total_commits += 1
+            rollup.type_counts[ctype] = rollup.type_counts.get(ctype, 0) + 1
+            first_seen.setdefault(('type', ctype), row)
+
+            # Per repo, with the first REPO_TOP_N commits of each type
+            repo_entry['commits'] += 1
+            repo_entry['types'][ctype] = repo_entry['types'].get(ctype, 0) + 1
+            top = repo_entry['top'].setdefault(ctype, [])
+            if len(top) < REPO_TOP_N:
+                top.append(commit_snapshot(commit))
+
+            # Per author, then per repo for that author
+            author_entry = rollup.authors.get(author)
+            if author_entry is None:
+                author_entry = rollup.authors[author] = {'commits': 0, 'features': 0, 'fixes': 0, 'repos': {}}
+                first_seen[('author', author)] = row
+            author_entry['commits'] += 1
+            if ctype == 'feat':
+                author_entry['features'] += 1
+            elif ctype == 'fix':
+                author_entry['fixes'] += 1
+
+            author_repo = author_entry['repos'].get(repo)
+            if author_repo is None:
+                author_repo = author_entry['repos'][repo] = {'commits': 0, 'types': {}, 'top': {}}
+                first_seen[('author_repo', author, repo)] = row
+            author_repo['commits'] += 1
+            author_repo['types'][ctype] = author_repo['types'].get(ctype, 0) + 1
+            top = author_repo['top'].setdefault(ctype, [])
+            if len(top) < AUTHOR_TOP_N:
+                top.append(commit_snapshot(commit))
+
+            # Themes (first matching theme wins)
+            theme = THEME_MATCHER.first(subject)
+            if theme:
+                theme_entry = rollup.themes.setdefault(theme, {'commits': 0, 'items': []})
+                theme_entry['commits'] += 1
+                if len(theme_entry['items']) < THEME_ITEMS:
+                    theme_entry['items'].append(f"{repo}: {subject}")
+
+            # Track component health
+            if ctype == 'feat':
+                health = rollup.component_health.setdefault(component, {'features': 0, 'fixes': 0, 'issues': []})
+                health['features'] += 1
+            elif ctype == 'fix':
+                health = rollup.component_health.setdefault(component, {'features': 0, 'fixes': 0, 'issues': []})
+                health['fixes'] += 1
+                # Critical issues
+                if CRITICAL_MATCHER.mask(lowered):
+                    health['issues'].append(subject)
+
+            # Aggregate into initiatives
+            for init_name in INITIATIVE_MATCHER.match(lowered):
+                initiative = rollup.initiatives.setdefault(init_name, {'commits': 0, 'repos': set(), 'highlights': []})
+                initiative['commits'] += 1
+                initiative['repos'].add(repo)
+
+                # Capture significant highlights
+                if ctype == 'feat' and len(initiative['highlights']) < HIGHLIGHTS:
+                    # Clean up subject
+                    highlight = re.sub(r'^feat\([\w-]+\):\s*', '', subject)
+                    highlight = re.sub(r'^feat:\s*', '', highlight)
+                    initiative['highlights'].append(highlight)
+
+    rollup.sort_by_first_seen()
+    return rollup
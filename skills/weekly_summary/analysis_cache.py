@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of per-repo agent analyses.
+
+An analysis is keyed by a hash over the repo's commit data, the prompt
+template version, the date range and the agent backend. Re-running a
+week whose commit data is unchanged therefore skips the agent calls.
+Entries are JSON files in a size-bounded directory. The least recently
+used entries are evicted first, using file mtimes as the recency clock.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+
+CACHE_DIR = os.path.expanduser("~/.cache/weekly_summary/analyses")
+CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+
+# Header line the collector stamps on every commit file: not commit data
+COLLECTION_DATE_LINE = b'=== COLLECTION DATE:'
+
+
+def commit_file_digest(path):
+    """Return the sha256 hex digest of a commit file, without its collection date.
+
+    Re-collecting identical commits only changes the header's timestamp,
+    so the same commit data always hashes the same.
+    """
+    digest = hashlib.sha256()
+    in_header = True
+    with open(path, 'rb') as f:
+        for line in f:
+            if in_header:
+                if line.startswith(COLLECTION_DATE_LINE):
+                    continue
+                in_header = not line.startswith(b'COMMIT_START')
+            digest.update(line)
+    return digest.hexdigest()
+
+
+def analysis_key(*parts):
+    """Combine the inputs of an analysis into one cache key."""
+    return hashlib.sha256('\x1f'.join(str(p) for p in parts).encode()).hexdigest()
+
+
+class AnalysisCache:
+    """Size-bounded LRU directory of analysis JSON files."""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def get(self, key):
+        """Return the cached analysis for `key`, or None."""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                analysis = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        # Touch the entry: mtime is the LRU clock
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return analysis
+
+    def put(self, key, analysis):
+        """Store an analysis and evict least recently used entries over the size limit."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(analysis, f)
+        os.replace(tmp_path, self._path(key))
+        self.evict()
+
+    def evict(self):
+        """Remove the oldest entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for path in self.directory.glob('*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        # Always keep the newest entry, even if it alone exceeds the limit
+        for mtime, size, path in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+
+    def summary(self):
+        """One-line hit/miss report for the end of a run."""
+        lookups = self.hits + self.misses
+        rate = f" ({self.hits / lookups:.0%} hit rate)" if lookups else ""
+        return f"{self.hits} hits, {self.misses} misses, {self.evictions} evicted{rate}"
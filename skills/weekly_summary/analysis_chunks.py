@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Map-reduce helpers for analyzing a repo's commits in budgeted chunks.
+
+`chunk_commits` splits a commit stream on commit boundaries into chunks
+whose rendered text fits a character budget. Each chunk is analyzed on
+its own, and `merge_analyses` reduces the partial analyses into one.
+Because the chunks are disjoint, counts are summed and lists are
+concatenated in chunk order, so the merge is deterministic.
+"""
+
+from commit_parser import format_commit, load_body
+
+CHUNK_CHAR_BUDGET = 15000
+TRUNCATED_MARKER = "\n[... body truncated ...]"
+
+HEALTH_RANK = {'🟢': 0, '🟡': 1, '🔴': 2}
+
+
+def fit_commit(commit, budget):
+    """Render a commit, trimming its body if the block alone exceeds the budget.
+
+    Bodies not loaded up front are loaded here.
+    """
+    record = dict((field, commit[field]) for field in ('hash', 'author', 'email', 'date', 'subject'))
+    body = load_body(commit)
+
+    record['body'] = body
+    block = format_commit(record)
+    if len(block) <= budget:
+        return block
+
+    record['body'] = ''
+    room = budget - len(format_commit(record)) - len(TRUNCATED_MARKER)
+    record['body'] = body[:max(room, 0)] + TRUNCATED_MARKER
+    return format_commit(record)
+
+
+def chunk_commits(commits, budget=CHUNK_CHAR_BUDGET):
+    """Yield (text, commits) chunks whose text fits within `budget` characters.
+
+    Commits are never split across chunks; a commit too large for an
+    empty chunk gets its body trimmed.
+    """
+    blocks = []
+    chunk = []
+    size = 0
+
+    for commit in commits:
+        block = fit_commit(commit, budget)
+        if chunk and size + len(block) > budget:
+            yield ''.join(blocks), chunk
+            blocks = []
+            chunk = []
+            size = 0
+        blocks.append(block)
+        chunk.append(commit)
+        size += len(block)
+
+    if chunk:
+        yield ''.join(blocks), chunk
+
+
+def _extend_unique(target, items):
+    for item in items:
+        if item not in target:
+            target.append(item)
+
+
+def _merge_named(target, items, key):
+    """Fold dicts sharing the same `key` value: commits are summed, highlights joined."""
+    for item in items:
+        name = item.get(key)
+        existing = target.get(name)
+        if existing is None:
+            existing = target[name] = dict(item)
+            if 'highlights' in item:
+                existing['highlights'] = list(item['highlights'])
+            continue
+
+        existing['commits'] = existing.get('commits', 0) + item.get('commits', 0)
+        for field, value in item.items():
+            if field == 'highlights':
+                _extend_unique(existing.setdefault('highlights', []), value)
+            elif field != 'commits' and existing.get(field) in ('', None):
+                existing[field] = value
+
+
+def merge_analyses(parts):
+    """Reduce per-chunk analyses, in chunk order, into one analysis."""
+    merged = {}
+    initiatives = {}
+    branches = {}
+
+    for part in parts:
+        for field, value in part.items():
+            if field == 'total_commits':
+                merged[field] = merged.get(field, 0) + (value or 0)
+            elif field == 'active_branches':
+                merged[field] = max(merged.get(field, 0), value or 0)
+            elif field == 'health':
+                if HEALTH_RANK.get(value, 0) >= HEALTH_RANK.get(merged.get(field), -1):
+                    merged[field] = value
+            elif field == 'initiatives':
+                merged.setdefault(field, None)  # keep the key order of the parts
+                _merge_named(initiatives, value or [], 'name')
+            elif field == 'feature_branches':
+                merged.setdefault(field, None)
+                _merge_named(branches, value or [], 'name')
+            elif isinstance(value, list):
+                _extend_unique(merged.setdefault(field, []), value)
+            else:
+                merged.setdefault(field, value)
+
+    if 'initiatives' in merged:
+        merged['initiatives'] = list(initiatives.values())
+    if 'feature_branches' in merged:
+        merged['feature_branches'] = list(branches.values())
+
+    return merged
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Benchmark the parse, aggregate and render stages on synthetic dumps.
+
+Each case generates a deterministic commit dump in the collector's
+`=== REPO:` / `COMMIT_START` format. The same seed and parameters always
+give the same file. The stages then run on it:
+- parse: `parse_commits` into a CommitTable
+- aggregate: the single-pass `aggregate` behind both reports
+  (`aggregate_into_initiatives` is a thin wrapper around it)
+- technical: `generate_markdown_report`
+- business: `generate_business_summary`
+- orchestrated: `aggregate_reports` over one analysis per repo
+
+Each stage is timed as the best of `--repeat` runs. It is then run once
+more under tracemalloc, which gives its peak and retained memory. Results
+are written as JSON; `--compare` checks them against an earlier run and
+exits non-zero on a regression.
+
+Usage: python3 benchmark.py [--preset quick|full] [--case COMMITSxREPOS ...]
+                            [--output FILE] [--compare FILE]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+import technical_report
+import business_summary
+from aggregation import aggregate, INITIATIVE_KEYWORDS
+from orchestrate_summary import aggregate_reports
+from config import REPOS
+
+BENCH_DIR = os.path.expanduser("~/.cache/weekly_summary/benchmarks")
+BENCH_MONDAY = "2026-03-02"
+BENCH_SUNDAY = "2026-03-08"
+
+PRESETS = {
+    'quick': ['1000x12', '10000x50'],
+    'full': ['1000x12', '10000x50', '100000x200', '1000000x500'],
+}
+
+DEFAULT_AUTHORS = 8
+DEFAULT_BRANCHES = 20
+DEFAULT_SKEW = 1.1
+DEFAULT_KEYWORD_SHARE = 0.4
+DEFAULT_MERGE_SHARE = 0.1
+DEFAULT_THRESHOLD = 1.25
+
+TYPE_WEIGHTS = (
+    ('feat', 30), ('fix', 25), ('refactor', 10), ('chore', 12), ('docs', 5),
+    ('test', 5), ('ci', 3), ('perf', 2), ('wip', 2), ('other', 6),
+)
+FILLER_WORDS = (
+    "update handle support add remove improve clean cache config request response "
+    "handler model service view schema test docs version deps layout retry"
+).split()
+KEYWORDS = sorted({keyword for _, *keywords in INITIATIVE_KEYWORDS.values() for keyword in keywords})
+
+
+def zipf_weights(count, skew):
+    """Cumulative Zipf weights for `count` ranks: rank r gets 1 / r**skew."""
+    cumulative = []
+    total = 0.0
+    for rank in range(1, count + 1):
+        total += 1.0 / rank ** skew
+        cumulative.append(total)
+    return cumulative
+
+
+def repo_names(count):
+    """The configured repos first, then numbered synthetic ones."""
+    names = list(REPOS[:count])
+    names.extend(f"bench/repo-{idx:03d}" for idx in range(len(names), count))
+    return names
+
+
+def generate_dump(path, commits, repos, authors=DEFAULT_AUTHORS, branches=DEFAULT_BRANCHES,
+                  skew=DEFAULT_SKEW, keyword_share=DEFAULT_KEYWORD_SHARE,
+                  merge_share=DEFAULT_MERGE_SHARE, seed=0):
+    """Write a deterministic synthetic dump and return its size in bytes.
+
+    Commits are spread over repos and authors with Zipf weights (`skew`),
+    so a few repos and authors are much busier than the rest.
+    `keyword_share` of subjects carry an initiative keyword, and
+    `merge_share` of commits merge one of `branches` feature branches
+    into dev.
+    """
+    rng = random.Random(seed)
+    names = repo_names(repos)
+    people = [f"Author {idx:02d}" for idx in range(authors)]
+    feature_branches = [f"feature/bench-{idx:03d}" for idx in range(branches)]
+    type_names = [name for name, _ in TYPE_WEIGHTS]
+    type_weights = [weight for _, weight in TYPE_WEIGHTS]
+
+    # Commits per repo, in repo order
+    per_repo = [0] * repos
+    for idx in rng.choices(range(repos), cum_weights=zipf_weights(repos, skew), k=commits):
+        per_repo[idx] += 1
+
+    author_weights = zipf_weights(authors, skew)
+    week_start = datetime.strptime(BENCH_MONDAY, '%Y-%m-%d')
+    number = 0
+
+    with open(path, 'w') as out:
+        for name, count in zip(names, per_repo):
+            out.write(f"=== REPO: {name} ===\n")
+            for _ in range(count):
+                number += 1
+                commit_hash = hashlib.sha1(f"{seed}:{number}".encode()).hexdigest()
+                author = rng.choices(people, cum_weights=author_weights)[0]
+                date = week_start + timedelta(seconds=rng.randrange(7 * 86400))
+
+                words = rng.sample(FILLER_WORDS, 3)
+                if rng.random() < keyword_share:
+                    words[rng.randrange(3)] = rng.choice(KEYWORDS)
+
+                if rng.random() < merge_share:
+                    subject = f"Merge branch '{rng.choice(feature_branches)}' into dev"
+                else:
+                    ctype = rng.choices(type_names, type_weights)[0]
+                    subject = f"{ctype}: {' '.join(words)}" if ctype != 'other' else ' '.join(words).capitalize()
+
+                body = '\n'.join(' '.join(rng.sample(FILLER_WORDS, 6)) for _ in range(rng.randrange(4)))
+                out.write(
+                    f"COMMIT_START\n{commit_hash}|{author}|{author.lower().replace(' ', '.')}@example.com|"
+                    f"{date.strftime('%Y-%m-%d %H:%M:%S')} +0000|{subject}\n{body}\nCOMMIT_END\n\n"
+                )
+
+    return os.path.getsize(path)
+
+
+def repo_analyses(rollup):
+    """One analysis per repo, shaped like the agents' output, from a Rollup."""
+    authors = {}
+    for author, details in rollup.authors.items():
+        for repo in details['repos']:
+            authors.setdefault(repo, []).append(author)
+
+    initiatives = {}
+    for name, details in rollup.initiatives.items():
+        for repo in sorted(details['repos']):
+            initiatives.setdefault(repo, []).append(
+                {'name': name, 'impact': '; '.join(details['highlights']), 'commits': details['commits']}
+            )
+
+    return [
+        {
+            'repo': repo,
+            'health': '🟢',
+            'total_commits': details['commits'],
+            'active_branches': len(details['types']),
+            'authors': authors.get(repo, []),
+            'initiatives': initiatives.get(repo, []),
+            'alpha_deployments': [],
+            'bugs_fixed': [],
+            'infrastructure': []
+        }
+        for repo, details in rollup.repos.items()
+    ]
+
+
+def run_stages(path):
+    """Run every stage once; yield (stage, seconds) as each one finishes."""
+    started = time.perf_counter()
+    table = technical_report.parse_commits(path)
+    yield 'parse', time.perf_counter() - started
+
+    started = time.perf_counter()
+    rollup = aggregate(table)
+    yield 'aggregate', time.perf_counter() - started
+
+    started = time.perf_counter()
+    technical_report.generate_markdown_report(rollup, BENCH_MONDAY, BENCH_SUNDAY)
+    yield 'technical', time.perf_counter() - started
+
+    started = time.perf_counter()
+    business_summary.generate_business_summary(rollup, BENCH_MONDAY, BENCH_SUNDAY)
+    yield 'business', time.perf_counter() - started
+
+    analyses = repo_analyses(rollup)
+    started = time.perf_counter()
+    aggregate_reports(analyses, BENCH_MONDAY, BENCH_SUNDAY)
+    yield 'orchestrated', time.perf_counter() - started
+
+
+def measure(path, repeat=3):
+    """Return {stage: {'seconds', 'peak_bytes', 'retained_bytes'}} for one dump."""
+    results = {}
+    for _ in range(repeat):
+        for stage, seconds in run_stages(path):
+            entry = results.setdefault(stage, {'seconds': seconds})
+            entry['seconds'] = min(entry['seconds'], seconds)
+
+    # Separate pass: tracing slows every allocation down
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        for stage, _ in run_stages(path):
+            # Relative to what the earlier stages left allocated
+            current, peak = tracemalloc.get_traced_memory()
+            results[stage]['peak_bytes'] = peak - start
+            results[stage]['retained_bytes'] = current - start
+            start = current
+            tracemalloc.reset_peak()
+    finally:
+        tracemalloc.stop()
+
+    return results
+
+
+def parse_case(case):
+    """Parse 'COMMITSxREPOS' (e.g. '10000x50') into (commits, repos)."""
+    commits, _, repos = case.lower().partition('x')
+    if not commits.isdigit() or not repos.isdigit():
+        raise argparse.ArgumentTypeError(f"expected COMMITSxREPOS, got {case!r}")
+    return int(commits), int(repos)
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return [(case, stage, metric, before, after)] for metrics that grew past `threshold`."""
+    previous = {case['name']: case for case in baseline.get('cases', [])}
+    regressions = []
+    for case in results['cases']:
+        before_case = previous.get(case['name'])
+        if before_case is None:
+            continue
+        for stage, metrics in case['stages'].items():
+            before = before_case['stages'].get(stage, {})
+            for metric in ('seconds', 'peak_bytes'):
+                if before.get(metric) and metrics.get(metric, 0) > before[metric] * threshold:
+                    regressions.append((case['name'], stage, metric, before[metric], metrics[metric]))
+    return regressions
+
+
+def format_bytes(count):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(count) < 1024 or unit == 'GB':
+            return f"{count:.0f}{unit}" if unit == 'B' else f"{count:.1f}{unit}"
+        count /= 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the report stages on synthetic commit dumps.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default='quick', help="Cases to run")
+    parser.add_argument("--case", type=parse_case, action='append', metavar="COMMITSxREPOS",
+                        help="Run this case instead of the preset (repeatable)")
+    parser.add_argument("--authors", type=int, default=DEFAULT_AUTHORS)
+    parser.add_argument("--branches", type=int, default=DEFAULT_BRANCHES)
+    parser.add_argument("--skew", type=float, default=DEFAULT_SKEW, help="Zipf skew of repo and author activity")
+    parser.add_argument("--keyword-share", type=float, default=DEFAULT_KEYWORD_SHARE)
+    parser.add_argument("--merge-share", type=float, default=DEFAULT_MERGE_SHARE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (best is kept)")
+    parser.add_argument("--output", help="Results file (default: a timestamped file in the benchmark dir)")
+    parser.add_argument("--compare", metavar="FILE", help="Earlier results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Slowdown ratio reported as a regression")
+    parser.add_argument("--keep-dumps", metavar="DIR", help="Keep the generated dumps in DIR")
+    args = parser.parse_args()
+
+    cases = args.case or [parse_case(case) for case in PRESETS[args.preset]]
+    params = {
+        'authors': args.authors, 'branches': args.branches, 'skew': args.skew,
+        'keyword_share': args.keyword_share, 'merge_share': args.merge_share, 'seed': args.seed
+    }
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': params,
+        'cases': []
+    }
+
+    dump_dir = args.keep_dumps or tempfile.mkdtemp(prefix='weekly-bench-')
+    os.makedirs(dump_dir, exist_ok=True)
+
+    for commits, repos in cases:
+        name = f"{commits}x{repos}"
+        path = f"{dump_dir}/dump-{name}.txt"
+        print(f"🧪 {name}: generating {commits} commits over {repos} repos...")
+        started = time.perf_counter()
+        size = generate_dump(path, commits, repos, **params)
+        generated = time.perf_counter() - started
+
+        stages = measure(path, args.repeat)
+        results['cases'].append({
+            'name': name, 'commits': commits, 'repos': repos,
+            'dump_bytes': size, 'generate_seconds': generated, 'stages': stages
+        })
+
+        for stage, metrics in stages.items():
+            print(f"   {stage:<13} {metrics['seconds'] * 1000:9.1f} ms   "
+                  f"peak {format_bytes(metrics['peak_bytes']):>8}   retained {format_bytes(metrics['retained_bytes']):>8}")
+
+        if not args.keep_dumps:
+            os.remove(path)
+
+    if not args.keep_dumps:
+        os.rmdir(dump_dir)
+
+    output = args.output or f"{BENCH_DIR}/bench-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Results saved to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} regressions against {args.compare}:")
+            for name, stage, metric, before, after in regressions:
+                print(f"   • {name} {stage} {metric}: {before:.4g} → {after:.4g} ({after / before:.2f}x)")
+            sys.exit(1)
+        print(f"✅ No regressions against {args.compare} (threshold {args.threshold:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Branch-activity index built from one `git for-each-ref` and one `git rev-list`.
+
+Refs whose tip was committed before the window cannot have gained commits
+in it, so they are dropped straight from the for-each-ref output. The
+remaining tips are walked once with rev-list, and each ref's in-window
+commits are resolved in memory from the parent links.
+"""
+
+import json
+from datetime import datetime
+
+MAINLINE_BRANCHES = ('main', 'master', 'dev', 'develop', 'staging', 'HEAD')
+
+
+def window_bounds(monday, sunday):
+    """Return the git date strings and local epoch bounds for a week."""
+    since = f"{monday} 00:00:00"
+    until = f"{sunday} 23:59:59"
+    since_ts = int(datetime.strptime(since, '%Y-%m-%d %H:%M:%S').timestamp())
+    until_ts = int(datetime.strptime(until, '%Y-%m-%d %H:%M:%S').timestamp())
+    return since, until, since_ts, until_ts
+
+
+def branch_name(refname):
+    """Strip refs/heads/ or refs/remotes/<remote>/ from a full ref name."""
+    if refname.startswith('refs/heads/'):
+        return refname[len('refs/heads/'):]
+    if refname.startswith('refs/remotes/'):
+        return refname[len('refs/remotes/'):].split('/', 1)[-1]
+    return refname
+
+
+def list_refs(git):
+    """Return the raw for-each-ref listing the index is built from."""
+    return git([
+        "for-each-ref",
+        "--format=%(objectname) %(committerdate:unix) %(refname) %(refname:short)",
+        "refs/heads/", "refs/remotes/"
+    ])
+
+
+def build_branch_index(git, monday, sunday, refs=None, graph=None):
+    """Build the activity index for one repository.
+
+    `git` is a callable taking a git argument list and returning stdout;
+    `refs` can pass in a `list_refs` result that was already fetched.
+    The result maps every active ref (short name) to the hashes of the
+    commits it reaches inside the window, and lists every ref tip seen.
+
+    If a `graph` dict is passed, it receives the walked commit graph
+    (parents, commit times, in-window commits and the candidate ref
+    heads), so callers such as deploy_stages can reuse it without
+    walking again.
+    """
+    since, until, since_ts, until_ts = window_bounds(monday, sunday)
+
+    if refs is None:
+        refs = list_refs(git)
+
+    candidates = {}
+    tips = set()
+    for line in refs.split('\n'):
+        parts = line.split(' ', 3)
+        if len(parts) < 4 or not parts[1].isdigit():
+            continue
+        tip, committed, refname, short = parts
+        tips.add(tip)
+        if int(committed) >= since_ts:
+            candidates[short] = (tip, refname)
+
+    index = {'since': since, 'until': until, 'branches': {}, 'refnames': {}, 'tips': sorted(tips)}
+    if not candidates:
+        return index
+
+    # One history walk over every candidate tip: "<ts> <hash> <parents...>"
+    walk_tips = sorted({tip for tip, _ in candidates.values()})
+    walk = git(["rev-list", "--timestamp", "--parents", f"--since={since}", *walk_tips])
+
+    parents = {}
+    times = {}
+    in_window = set()
+    for line in walk.split('\n'):
+        parts = line.split()
+        if len(parts) < 2 or not parts[0].isdigit():
+            continue
+        commit = parts[1]
+        parents[commit] = parts[2:]
+        times[commit] = int(parts[0])
+        if since_ts <= times[commit] <= until_ts:
+            in_window.add(commit)
+
+    if graph is not None:
+        graph.update(
+            parents=parents, times=times, in_window=in_window,
+            heads={short: tip for short, (tip, _) in candidates.items()},
+            refnames={short: refname for short, (_, refname) in candidates.items()}
+        )
+
+    reachable_cache = {}
+    for short, (tip, refname) in sorted(candidates.items()):
+        if tip not in reachable_cache:
+            reachable_cache[tip] = reachable_in_window(tip, parents, in_window)
+        commits = reachable_cache[tip]
+        if commits:
+            index['branches'][short] = commits
+            index['refnames'][short] = refname
+
+    return index
+
+
+def reachable_in_window(tip, parents, in_window):
+    """Return the in-window commits reachable from `tip`."""
+    seen = set()
+    stack = [tip]
+    found = []
+
+    while stack:
+        commit = stack.pop()
+        if commit in seen or commit not in parents:
+            continue
+        seen.add(commit)
+        if commit in in_window:
+            found.append(commit)
+        stack.extend(parents[commit])
+
+    return found
+
+
+def active_branches(index):
+    """Return the sorted short names of refs with commits in the window."""
+    return sorted(index['branches'])
+
+
+def feature_branches(index):
+    """Summarize non-mainline branches with the commits only they contribute.
+
+    Commits already reachable from a mainline branch are not counted, and
+    local/remote copies of the same branch are reported once.
+    """
+    mainline = set()
+    for short, commits in index['branches'].items():
+        if branch_name(index['refnames'].get(short, short)) in MAINLINE_BRANCHES:
+            mainline.update(commits)
+
+    branches = {}
+    for short, commits in index['branches'].items():
+        name = branch_name(index['refnames'].get(short, short))
+        if name in MAINLINE_BRANCHES:
+            continue
+        own = len([c for c in commits if c not in mainline])
+        if own and own > branches.get(name, 0):
+            branches[name] = own
+
+    return [
+        {"name": name, "commits": count}
+        for name, count in sorted(branches.items(), key=lambda x: (-x[1], x[0]))
+    ]
+
+
+def save_branch_index(index, path):
+    """Write the index next to the repo's commit file."""
+    with open(path, 'w') as f:
+        json.dump(index, f, indent=2)
+
+
+def load_branch_index(path):
+    """Load a saved index, or None if the collector did not write one."""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Benchmark the collector end to end on throwaway local git repositories.
+
+Repositories are generated offline with `git fast-import`:
+- a mainline history from before the window
+- feature branches with commits inside the window, some merged into dev
+- remote-tracking copies of part of the branches
+- thousands of stale local and remote refs pointing into the old history
+
+Each repository is then collected three times by `collect_commits.py`,
+running in its own process:
+- cold: empty store and commit directory
+- warm: the same refs again, which hits the unchanged fast path
+- incremental: after a few more commits land on dev
+
+A `git` shim on PATH logs every git process the collector starts. For
+each run the harness reports wall time (including interpreter start-up),
+the git process count by subcommand, and the bytes written to the commit
+directory and the store.
+
+Usage: python3 collect_benchmark.py [--repos N] [--commits N] [--branches N]
+                                    [--merges N] [--stale-refs N] [--output FILE]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+from branch_index import window_bounds
+from config import repo_file
+
+BENCH_DIR = os.path.expanduser("~/.cache/weekly_summary/benchmarks")
+BENCH_MONDAY = "2026-03-02"
+BENCH_SUNDAY = "2026-03-08"
+
+DEFAULT_REPOS = 3
+DEFAULT_COMMITS = 2000
+DEFAULT_OLD_COMMITS = 1000
+DEFAULT_BRANCHES = 50
+DEFAULT_MERGES = 30
+DEFAULT_STALE_REFS = 2000
+DEFAULT_REMOTE_SHARE = 0.5
+INCREMENTAL_COMMITS = 20
+
+RUNS = ('cold', 'warm', 'incremental')
+COLLECTOR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "collect_commits.py")
+
+GIT_SHIM = """#!/bin/sh
+printf '%s\\n' "$1" >> "$GIT_CALL_LOG"
+exec "{git}" "$@"
+"""
+
+
+class FastImport:
+    """Builds a `git fast-import` stream of commits, merges and refs."""
+
+    def __init__(self):
+        self.lines = []
+        self.marks = 0
+        self.files = 0
+
+    def commit(self, ref, timestamp, message, parent=None, merge=None, author="Bench Author"):
+        """Add a commit touching one file; returns its mark."""
+        self.marks += 1
+        self.files += 1
+        email = author.lower().replace(' ', '.') + "@example.com"
+        content = f"change {self.marks}\n"
+        self.lines.append(f"commit {ref}\nmark :{self.marks}\n")
+        self.lines.append(f"author {author} <{email}> {timestamp} +0000\n")
+        self.lines.append(f"committer {author} <{email}> {timestamp} +0000\n")
+        self.lines.append(f"data {len(message.encode())}\n{message}\n")
+        if parent:
+            self.lines.append(f"from :{parent}\n")
+        if merge:
+            self.lines.append(f"merge :{merge}\n")
+        self.lines.append(f"M 644 inline src/file{self.files % 200}.txt\ndata {len(content)}\n{content}\n")
+        return self.marks
+
+    def reset(self, ref, mark):
+        """Point `ref` at an existing commit."""
+        self.lines.append(f"reset {ref}\nfrom :{mark}\n\n")
+
+    def run(self, repo):
+        subprocess.run(
+            ["git", "fast-import", "--quiet"], cwd=repo, check=True,
+            input=''.join(self.lines).encode()
+        )
+
+
+def generate_repo(path, commits, old_commits, branches, merges, stale_refs, remote_share, seed=0):
+    """Create a repository with in-window activity and many stale refs; returns its commit count."""
+    os.makedirs(path)
+    subprocess.run(["git", "init", "-q", "-b", "master"], cwd=path, check=True)
+
+    _, _, since_ts, until_ts = window_bounds(BENCH_MONDAY, BENCH_SUNDAY)
+    stream = FastImport()
+
+    # Mainline history from the four weeks before the window
+    old_start = since_ts - 28 * 86400
+    parent = None
+    old_marks = []
+    for idx in range(old_commits):
+        parent = stream.commit("refs/heads/master", old_start + idx * (28 * 86400 // max(old_commits, 1)),
+                               f"chore: old change {idx}", parent)
+        old_marks.append(parent)
+    master = parent
+
+    # Window activity: feature branches cut from dev, some merged back
+    span = until_ts - since_ts - 3600
+    per_branch = max((commits - merges) // max(branches, 1), 1)
+    step = max(span // max(commits + merges, 1), 1)
+    ts = since_ts + 60
+    dev = stream.commit("refs/heads/dev", ts, "chore: open dev", master)
+
+    for branch in range(branches):
+        name = f"feature/bench-{seed}-{branch:03d}"
+        tip = dev
+        for idx in range(per_branch):
+            ts += step
+            tip = stream.commit(f"refs/heads/{name}", ts, f"feat: {name} change {idx}", tip,
+                                author=f"Author {(branch + idx) % 7}")
+
+        if branch < merges:
+            ts += step
+            dev = stream.commit("refs/heads/dev", ts, f"Merge branch '{name}' into dev", dev, tip)
+
+        if branch < branches * remote_share:
+            stream.reset(f"refs/remotes/origin/{name}", tip)
+
+    stream.reset("refs/remotes/origin/dev", dev)
+    stream.reset("refs/remotes/origin/master", master)
+
+    # Stale refs into the old history, half local and half remote-tracking
+    for idx in range(stale_refs):
+        mark = old_marks[idx % len(old_marks)] if old_marks else master
+        prefix = "refs/heads/stale" if idx % 2 else "refs/remotes/origin/stale"
+        stream.reset(f"{prefix}/branch-{idx:05d}", mark)
+
+    stream.run(path)
+    return stream.marks
+
+
+def add_commits(path, count):
+    """Land `count` more commits on dev, inside the window."""
+    _, _, _, until_ts = window_bounds(BENCH_MONDAY, BENCH_SUNDAY)
+    tip = subprocess.run(["git", "rev-parse", "dev"], cwd=path, check=True,
+                         capture_output=True, text=True).stdout.strip()
+    messages = ''.join(
+        f"commit refs/heads/dev\n"
+        f"committer Bench Author <bench@example.com> {until_ts - 1800 + idx} +0000\n"
+        f"data {len(f'fix: late change {idx}')}\nfix: late change {idx}\n"
+        + (f"from {tip}\n" if idx == 0 else "")
+        + f"M 644 inline late/file{idx}.txt\ndata 2\n{idx % 10}\n\n"
+        for idx in range(count)
+    )
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=path, check=True, input=messages.encode())
+
+
+def ref_count(path):
+    output = subprocess.run(["git", "for-each-ref", "--format=x"], cwd=path, check=True,
+                            capture_output=True, text=True).stdout
+    return output.count('\n')
+
+
+def output_bytes(commit_dir, repo):
+    """Bytes of the collector's per-repo files."""
+    prefix = f"{repo_file(repo)}."
+    return sum(
+        os.path.getsize(os.path.join(commit_dir, name))
+        for name in os.listdir(commit_dir) if name.startswith(prefix)
+    ) if os.path.isdir(commit_dir) else 0
+
+
+def store_bytes(store):
+    return sum(os.path.getsize(path) for path in (store, f"{store}-wal") if os.path.exists(path))
+
+
+def collect(workspace, repo, store, commit_dir, shim_dir, log):
+    """Run the collector on one repo; returns the run's metrics."""
+    open(log, 'w').close()
+    env = dict(os.environ, PATH=f"{shim_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+               GIT_CALL_LOG=log, WEEKLY_COMMIT_DIR=commit_dir)
+
+    before_store = store_bytes(store)
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, COLLECTOR, BENCH_MONDAY, BENCH_SUNDAY, "--repos", repo, "--store", store, "--workers", "1"],
+        cwd=workspace, env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+
+    calls = {}
+    with open(log) as f:
+        for line in f:
+            command = line.strip() or '(none)'
+            calls[command] = calls.get(command, 0) + 1
+
+    status = 'ok' if result.returncode == 0 else 'error'
+    for line in result.stdout.splitlines():
+        if repo in line and ('♻️' in line or '⏭️' in line):
+            status = 'unchanged' if '♻️' in line else 'no_activity'
+
+    return {
+        'status': status,
+        'seconds': elapsed,
+        'git_processes': sum(calls.values()),
+        'git_commands': dict(sorted(calls.items())),
+        # Collected repos rewrite their files; unchanged ones keep them
+        'output_bytes_written': output_bytes(commit_dir, repo) if status != 'unchanged' else 0,
+        'store_bytes_added': store_bytes(store) - before_store,
+        'stderr': result.stderr[-2000:] if result.returncode else ''
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the collector on generated local git repositories.")
+    parser.add_argument("--repos", type=int, default=DEFAULT_REPOS, help="Repositories to generate")
+    parser.add_argument("--commits", type=int, default=DEFAULT_COMMITS, help="Commits per repo inside the window")
+    parser.add_argument("--old-commits", type=int, default=DEFAULT_OLD_COMMITS, help="Mainline commits before the window")
+    parser.add_argument("--branches", type=int, default=DEFAULT_BRANCHES, help="Feature branches per repo")
+    parser.add_argument("--merges", type=int, default=DEFAULT_MERGES, help="Feature branches merged into dev")
+    parser.add_argument("--stale-refs", type=int, default=DEFAULT_STALE_REFS, help="Stale refs per repo")
+    parser.add_argument("--remote-share", type=float, default=DEFAULT_REMOTE_SHARE,
+                        help="Share of feature branches with a remote-tracking copy")
+    parser.add_argument("--workdir", help="Keep the generated repos and outputs in this directory")
+    parser.add_argument("--output", help="Results file (default: a timestamped file in the benchmark dir)")
+    args = parser.parse_args()
+
+    git = shutil.which("git")
+    if git is None:
+        print("❌ git not found on PATH")
+        sys.exit(1)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='weekly-collect-bench-')
+    workspace = os.path.join(workdir, "repos")
+    shim_dir = os.path.join(workdir, "bin")
+    commit_dir = os.path.join(workdir, "commits")
+    store = os.path.join(workdir, "commits.db")
+    log = os.path.join(workdir, "git-calls.log")
+    for directory in (workspace, shim_dir):
+        os.makedirs(directory, exist_ok=True)
+
+    with open(os.path.join(shim_dir, "git"), 'w') as f:
+        f.write(GIT_SHIM.format(git=git))
+    os.chmod(os.path.join(shim_dir, "git"), 0o755)
+
+    params = {key: getattr(args, key) for key in
+              ('commits', 'old_commits', 'branches', 'merges', 'stale_refs', 'remote_share')}
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'git': subprocess.run([git, "--version"], capture_output=True, text=True).stdout.strip(),
+        'params': params,
+        'repos': []
+    }
+
+    # Synthetic names: the collector takes any repo directory, so --repos is not capped by REPOS
+    names = [f"repo-{idx:03d}" for idx in range(args.repos)]
+
+    try:
+        for seed, repo in enumerate(names):
+            path = os.path.join(workspace, repo)
+            print(f"🏗️  {repo}: generating {args.commits} commits, {args.branches} branches, {args.stale_refs} stale refs...")
+            started = time.perf_counter()
+            generate_repo(path, seed=seed, **params)
+            entry = {'repo': repo, 'refs': ref_count(path), 'generate_seconds': time.perf_counter() - started, 'runs': {}}
+
+            for run in RUNS:
+                if run == 'incremental':
+                    add_commits(path, INCREMENTAL_COMMITS)
+                metrics = collect(workspace, repo, store, commit_dir, shim_dir, log)
+                entry['runs'][run] = metrics
+                print(f"   {run:<12} {metrics['status']:<10} {metrics['seconds']:7.2f}s   "
+                      f"{metrics['git_processes']:3d} git processes   "
+                      f"{metrics['output_bytes_written'] / 1024:8.1f} KB written   "
+                      f"store +{metrics['store_bytes_added'] / 1024:.1f} KB")
+                if metrics['stderr']:
+                    print(f"   ❌ {metrics['stderr']}")
+
+            results['repos'].append(entry)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = args.output or f"{BENCH_DIR}/collect-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Collect commits from ALL branches (including feature branches) for the week.
+
+Each repository is collected on a bounded worker pool with its own
+timeout. Repos whose ref tips are unchanged since the previous run of the
+same week keep their existing output without any further git work. For
+the others, only commits that are new since the repo's last collection are
+fetched from git and added to the commit store, and their patch ids are
+computed in one bulk pipeline. The week's
+`/tmp/weekly_commits_by_repo/<repo>.txt` file is then written from the
+store, with rebased and cherry-picked copies of a change collapsed into
+one commit (see patch_index), counting commits as they are written.
+The same commits go to `<repo>.ndjson` with a per-day offset index (see
+commit_records).
+
+Usage: python3 collect_commits.py YYYY-MM-DD YYYY-MM-DD [--workers N] [--timeout SECONDS] [--store PATH]
+                                  [--repos NAME ...]
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import subprocess
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from branch_index import build_branch_index, active_branches, save_branch_index, window_bounds, list_refs
+from commit_parser import commit_type, format_commit
+from commit_store import CommitStore, STORE_PATH
+from commit_records import RecordWriter, index_path, save_record_index
+from patch_index import parse_patch_ids, build_patch_index, duplicate_count, save_patch_index
+from deploy_stages import build_stage_map, save_stage_map
+from fingerprints import FINGERPRINT_FILE, ref_fingerprint, load_fingerprints, save_fingerprints, same_inputs
+from config import REPOS, COMMIT_DIR, repo_file
+from instrumentation import span
+
+DEFAULT_WORKERS = 6
+DEFAULT_TIMEOUT = 300
+RECORD_SEP = '\x1e'
+FIELD_SEP = '\x1f'
+RECORD_FORMAT = "%H%x1f%an%x1f%ae%x1f%ad%x1f%ct%x1f%s%x1f%b%x1e"
+
+
+class CollectionTimeout(Exception):
+    """Raised when a repository exceeds its collection deadline."""
+
+
+def repo_output_file(repo):
+    """Return the per-repo commit file path."""
+    return f"{COMMIT_DIR}/{repo_file(repo)}.txt"
+
+
+def records_file(repo):
+    """Return the per-repo NDJSON record file path."""
+    return f"{COMMIT_DIR}/{repo_file(repo)}.ndjson"
+
+
+def records_index_file(repo):
+    """Return the per-repo record offset index path."""
+    return index_path(records_file(repo))
+
+
+def branch_index_file(repo):
+    """Return the per-repo branch-activity index path."""
+    return f"{COMMIT_DIR}/{repo_file(repo)}.branches.json"
+
+
+def patch_index_file(repo):
+    """Return the per-repo patch-id index path."""
+    return f"{COMMIT_DIR}/{repo_file(repo)}.patches.json"
+
+
+def stage_map_file(repo):
+    """Return the per-repo deployment stage map path."""
+    return f"{COMMIT_DIR}/{repo_file(repo)}.stages.json"
+
+
+def run_git(repo, args, deadline):
+    """Run a git command inside `repo` and return its stdout."""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise CollectionTimeout()
+
+    try:
+        result = subprocess.run(
+            ["git", *args], cwd=repo, capture_output=True, text=True,
+            errors='replace', timeout=remaining
+        )
+    except subprocess.TimeoutExpired:
+        raise CollectionTimeout()
+
+    return result.stdout
+
+
+def parse_record(record):
+    """Parse one RECORD_FORMAT entry into a commit record."""
+    fields = record.lstrip('\n').split(FIELD_SEP)
+    if len(fields) < 7 or not fields[4].isdigit():
+        return None
+
+    subject = fields[5].strip()
+    return {
+        'hash': fields[0],
+        'author': fields[1].strip(),
+        'email': fields[2].strip(),
+        'date': fields[3].strip(),
+        'committed_at': int(fields[4]),
+        'subject': subject,
+        'body': fields[6].strip(),
+        'type': commit_type(subject)
+    }
+
+
+def stream_git_records(repo, args, deadline, stdin_data=''):
+    """Run git log with RECORD_FORMAT and yield commit records as they arrive."""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise CollectionTimeout()
+
+    proc = subprocess.Popen(
+        ["git", *args], cwd=repo, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL, text=True, errors='replace'
+    )
+    timer = threading.Timer(remaining, proc.kill)
+    timer.start()
+
+    try:
+        # git reads all of --stdin before it starts walking history
+        proc.stdin.write(stdin_data)
+        proc.stdin.close()
+
+        pending = ''
+        while True:
+            chunk = proc.stdout.read(65536)
+            if not chunk:
+                break
+            records = (pending + chunk).split(RECORD_SEP)
+            pending = records.pop()
+            for record in records:
+                commit = parse_record(record)
+                if commit:
+                    yield commit
+        proc.wait()
+    finally:
+        timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+    if time.monotonic() >= deadline:
+        raise CollectionTimeout()
+
+
+def compute_patch_ids(repo, hashes, deadline):
+    """Return {hash: patch id} for `hashes` from one diff-tree | patch-id pipeline.
+
+    Merge commits have no diff and are left out of the result.
+    """
+    if not hashes:
+        return {}
+
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise CollectionTimeout()
+
+    diff_tree = subprocess.Popen(
+        ["git", "diff-tree", "--stdin", "-p", "--root"], cwd=repo,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    patch_id = subprocess.Popen(
+        ["git", "patch-id", "--stable"], cwd=repo,
+        stdin=diff_tree.stdout, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    diff_tree.stdout.close()  # patch-id owns the read end now
+
+    def kill():
+        diff_tree.kill()
+        patch_id.kill()
+
+    timer = threading.Timer(remaining, kill)
+    timer.start()
+
+    # Feed hashes from a thread so a full pipe cannot block the reader
+    def feed():
+        try:
+            diff_tree.stdin.write(''.join(f"{h}\n" for h in hashes).encode())
+            diff_tree.stdin.close()
+        except OSError:
+            pass
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+
+    try:
+        output = patch_id.stdout.read().decode(errors='replace')
+        patch_id.wait()
+        diff_tree.wait()
+        feeder.join()
+    finally:
+        timer.cancel()
+        for proc in (diff_tree, patch_id):
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+    if time.monotonic() >= deadline:
+        raise CollectionTimeout()
+
+    return parse_patch_ids(output)
+
+
+def fetch_new_commits(repo, store, since_ts, tips, deadline):
+    """Add commits not yet in the store to it and move the repo's high-water mark.
+
+    When the stored range already starts at or before the window, history
+    reachable from the previously seen ref tips is excluded from the walk.
+    Returns the number of newly stored commits.
+    """
+    mark = store.watermark(repo)
+    if mark and mark['low'] <= since_ts:
+        low = mark['low']
+        exclude = ''.join(f"^{tip}\n" for tip in mark['tips'])
+    else:
+        low = since_ts
+        exclude = ''
+
+    new_commits = store.add_commits(repo, stream_git_records(repo, [
+        "log", "--all", "--stdin", "--ignore-missing",
+        f"--since=@{low}", f"--format={RECORD_FORMAT}", "--date=iso"
+    ], deadline, exclude))
+
+    # Patch ids for the new commits (and any stored before ids were tracked)
+    missing = store.missing_patch_ids(repo)
+    store.set_patch_ids(repo, missing, compute_patch_ids(repo, missing, deadline))
+
+    store.set_watermark(repo, low, tips)
+    return new_commits
+
+
+def collect_repo(repo, monday, sunday, timeout, store_path=STORE_PATH, previous=None):
+    """Collect one repository's commits into the store and its output file.
+
+    `previous` is the repo's fingerprint record from the last run; when its
+    ref tips and window still match, the existing output is kept as is.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    result = {'repo': repo, 'status': 'ok', 'commits': 0, 'new_commits': 0, 'duplicates': 0, 'branches': 0, 'seconds': 0.0}
+
+    if not os.path.exists(f"{repo}/.git"):
+        result['status'] = 'not_found'
+        return result
+
+    output_file = repo_output_file(repo)
+    tmp_file = f"{output_file}.tmp"
+    tmp_records = f"{records_file(repo)}.tmp"
+
+    try:
+        refs = list_refs(lambda args: run_git(repo, args, deadline))
+    except CollectionTimeout:
+        result['status'] = 'timeout'
+        return result
+
+    result['fingerprint'] = ref_fingerprint(refs)
+    if (same_inputs({'fingerprint': result['fingerprint'], 'monday': monday, 'sunday': sunday}, previous)
+            and os.path.exists(output_file) and os.path.exists(records_index_file(repo))
+            and os.path.exists(branch_index_file(repo))
+            and os.path.exists(patch_index_file(repo)) and os.path.exists(stage_map_file(repo))):
+        result.update(status='unchanged', commits=previous['commits'], branches=previous['branches'])
+        result['seconds'] = time.monotonic() - started
+        return result
+
+    _, _, since_ts, until_ts = window_bounds(monday, sunday)
+    store = CommitStore(store_path)
+
+    try:
+        with open(tmp_file, 'w') as out, RecordWriter(tmp_records, repo) as records:
+            out.write(f"=== REPOSITORY: {repo} ===\n")
+            out.write(f"=== COLLECTION DATE: {datetime.now().strftime('%a %b %d %H:%M:%S %Y')} ===\n")
+            out.write("\n")
+
+            # Unique list of all branches with activity this week
+            graph = {}
+            index = build_branch_index(lambda args: run_git(repo, args, deadline), monday, sunday, refs, graph)
+            branches = active_branches(index)
+            result['branches'] = len(branches)
+
+            patches = {}
+            stages = build_stage_map(index, graph)
+            if not branches:
+                out.write("=== NO ACTIVITY THIS WEEK ===\n")
+                result['status'] = 'no_activity'
+            else:
+                out.write("=== ACTIVE BRANCHES ===\n")
+                out.write('\n'.join(branches) + "\n")
+                out.write("\n")
+
+                out.write("=== COMMITS ===\n")
+                out.write("\n")
+
+                # Commits from all branches, fetched incrementally into the store
+                result['new_commits'] = fetch_new_commits(repo, store, since_ts, index['tips'], deadline)
+
+                # One commit per logical change
+                for commit in store.iter_commits(since_ts, until_ts, repo, dedupe=True):
+                    out.write(format_commit(commit))
+                    records.write(commit)
+                    result['commits'] += 1
+
+                patches = build_patch_index(store.duplicate_groups(since_ts, until_ts, repo), index)
+                result['duplicates'] = duplicate_count(patches)
+
+                # Promotions to dev / staging / main, from the graph walked above
+                stages = build_stage_map(index, graph, store.commit_index(repo, since_ts, until_ts))
+
+        os.replace(tmp_file, output_file)
+        os.replace(tmp_records, records_file(repo))
+        save_record_index(records.index, records_index_file(repo))
+        save_branch_index(index, branch_index_file(repo))
+        save_patch_index(patches, patch_index_file(repo))
+        save_stage_map(stages, stage_map_file(repo))
+    except CollectionTimeout:
+        result['status'] = 'timeout'
+    except (OSError, subprocess.SubprocessError, sqlite3.Error) as e:
+        result['status'] = 'error'
+        result['error'] = str(e)
+    finally:
+        store.close()
+        for path in (tmp_file, tmp_records):
+            if os.path.exists(path):
+                os.remove(path)
+
+    result['seconds'] = time.monotonic() - started
+    return result
+
+
+def collect_all(monday, sunday, repos=None, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT, store_path=STORE_PATH):
+    """Collect every repository on a bounded worker pool and return per-repo results."""
+    repos = repos or REPOS
+    os.makedirs(COMMIT_DIR, exist_ok=True)
+
+    fingerprint_file = f"{COMMIT_DIR}/{FINGERPRINT_FILE}"
+    fingerprints = load_fingerprints(fingerprint_file)
+
+    def collect_traced(repo):
+        with span(f"collect {repo}", 'collect', cpu='thread') as args:
+            result = collect_repo(repo, monday, sunday, timeout, store_path, fingerprints.get(repo))
+            args.update(status=result['status'], commits=result['commits'])
+            return result
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(collect_traced, repo): repo for repo in repos}
+
+        for future in as_completed(futures):
+            repo = futures[future]
+            result = future.result()
+            results[repo] = result
+
+            if result['status'] == 'ok':
+                duplicates = f", {result['duplicates']} duplicates collapsed" if result['duplicates'] else ""
+                print(f"   ✅ {repo}: {result['commits']} commits collected, {result['new_commits']} new{duplicates} ({result['seconds']:.1f}s)")
+            elif result['status'] == 'no_activity':
+                print(f"   ⏭️  {repo}: No activity this week")
+            elif result['status'] == 'unchanged':
+                print(f"   ♻️  {repo}: Unchanged since last run, reusing {result['commits']} commits")
+            elif result['status'] == 'not_found':
+                print(f"   ⚠️  {repo} not found")
+            elif result['status'] == 'timeout':
+                print(f"   ⏱️  {repo}: Timed out after {timeout}s")
+            else:
+                print(f"   ❌ {repo}: Error - {result.get('error')}")
+
+    # Record fingerprints only for repos whose outputs are now current
+    for repo, result in results.items():
+        if result['status'] in ('ok', 'no_activity'):
+            fingerprints[repo] = {
+                'fingerprint': result['fingerprint'],
+                'monday': monday,
+                'sunday': sunday,
+                'commits': result['commits'],
+                'branches': result['branches']
+            }
+        elif result['status'] != 'unchanged':
+            fingerprints.pop(repo, None)
+    save_fingerprints(fingerprint_file, fingerprints)
+
+    return [results[repo] for repo in repos]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect commits from all branches for the week.")
+    parser.add_argument("monday", help="YYYY-MM-DD")
+    parser.add_argument("sunday", help="YYYY-MM-DD")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Repositories collected in parallel")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-repository timeout in seconds")
+    parser.add_argument("--store", default=STORE_PATH, help="Commit store database")
+    parser.add_argument("--repos", nargs='+', metavar="NAME", help="Collect only these repositories")
+    args = parser.parse_args()
+
+    print(f"📦 Collecting commits from all branches for week: {args.monday} to {args.sunday}")
+    print("")
+
+    results = collect_all(args.monday, args.sunday, repos=args.repos, workers=args.workers,
+                          timeout=args.timeout, store_path=args.store)
+
+    print("")
+    print(f"✅ All commits collected to: {COMMIT_DIR}")
+    print("")
+    print("📊 Summary:")
+    for result in results:
+        if result['status'] in ('ok', 'no_activity', 'unchanged'):
+            print(f"   {repo_file(result['repo'])}: {result['commits']} commits")
+
+    if any(r['status'] in ('timeout', 'error') for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
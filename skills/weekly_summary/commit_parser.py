@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Streaming parser for collected commit dumps.
+
+Reads both the combined dump (`=== REPO: <name> ===` sections) and the
+per-repo files written by the collector (`=== REPOSITORY: <name> ===`).
+The file is memory-mapped and scanned once for commit offsets; records
+are yielded one at a time and bodies are decoded only when touched, so
+memory stays flat regardless of the dump size.
+"""
+
+import os
+import re
+import mmap
+from array import array
+
+DUMP_FILE = '/tmp/weekly_commits_full.txt'
+REPO_MARKER = re.compile(r'=== REPO(?:SITORY)?: (.+?) ===')
+REPO_MARKER_BYTES = re.compile(rb'=== REPO(?:SITORY)?: (.+?) ===')
+COMMIT_START = b'COMMIT_START'
+COMMIT_END = b'COMMIT_END'
+COMMIT_TYPE_PATTERN = re.compile(r'^(feat|fix|refactor|chore|docs|test|ci|perf|revert|wip|Merge)', re.IGNORECASE)
+
+
+def commit_type(subject):
+    """Return the conventional-commit type of a subject, or 'other'."""
+    match = COMMIT_TYPE_PATTERN.match(subject)
+    return match.group(1).lower() if match else 'other'
+
+
+def parse_commit_block(lines, repo_name):
+    """Build a commit record from the lines between COMMIT_START and COMMIT_END."""
+    text = '\n'.join(lines).strip()
+    if not text:
+        return None
+
+    lines = text.split('\n')
+    header = lines[0]
+    if '|' not in header:
+        return None
+
+    parts = header.split('|')
+    if len(parts) < 5:
+        return None
+
+    subject = '|'.join(parts[4:]).strip()
+
+    return {
+        'hash': parts[0].strip(),
+        'author': parts[1].strip(),
+        'email': parts[2].strip(),
+        'date': parts[3].strip(),
+        'subject': subject,
+        'body': '\n'.join(lines[1:]).strip() if len(lines) > 1 else "",
+        'type': commit_type(subject),
+        'repo': repo_name
+    }
+
+
+def format_commit(commit):
+    """Render a commit record back into the COMMIT_START/COMMIT_END dump format.
+
+    Records whose body was not loaded are written with an empty body.
+    """
+    header = '|'.join((commit['hash'], commit['author'], commit['email'], commit['date'], commit['subject']))
+    return f"COMMIT_START\n{header}\n{commit['body'] or ''}\nCOMMIT_END\n\n"
+
+
+class DumpIndex:
+    """Memory-mapped commit dump, indexed in one scan.
+
+    `scan()` walks the file once, recording the repo sections and the byte
+    range of every commit body, and yields header-only records
+    ('body' is None). Bodies are decoded by `body()`, only for the commits
+    that are asked for, so the dump can be far larger than memory.
+
+    The file is mapped while it is scanned and unmapped by `close()` (or
+    at the end of a `with` block). Bodies asked for after that are read
+    straight from the file, as long as it is the one that was scanned.
+    """
+
+    def __init__(self, path, repo_name=None):
+        self.path = path
+        self.repo_name = repo_name
+        self.file = None
+        self.data = None
+        self.identity = None
+        self.sections = []  # (repo, offset of its marker)
+        self.body_starts = array('q')
+        self.body_ends = array('q')
+
+    def __len__(self):
+        return len(self.body_starts)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self):
+        """Map the file, if it is not mapped already."""
+        if self.data is None:
+            self.file = open(self.path, 'rb')
+            stat = os.fstat(self.file.fileno())
+            self.identity = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b''
+        return self.data
+
+    def scan(self):
+        """Index the dump and yield a header record per commit, in file order.
+
+        Each record's 'source' is (index, position) for `body()`.
+        """
+        data = self.open()
+        current_repo = self.repo_name
+        self.sections = []
+        self.body_starts = array('q')
+        self.body_ends = array('q')
+
+        pos = 0
+        while True:
+            start = data.find(COMMIT_START, pos)
+            stop = start if start != -1 else len(data)
+
+            # Repo markers between the previous commit and this one
+            for match in REPO_MARKER_BYTES.finditer(data, pos, stop):
+                current_repo = match.group(1).decode(errors='replace').strip()
+                self.sections.append((current_repo, match.start()))
+
+            if start == -1:
+                return
+
+            block_start = start + len(COMMIT_START)
+            end = data.find(COMMIT_END, block_start)
+            restart = data.find(COMMIT_START, block_start)
+            if end == -1:
+                return  # truncated last record
+            if restart != -1 and restart < end:
+                pos = restart  # truncated record: drop it and start over
+                continue
+            pos = end + len(COMMIT_END)
+
+            header_start = block_start
+            while header_start < end and data[header_start:header_start + 1].isspace():
+                header_start += 1
+            header_end = data.find(b'\n', header_start, end)
+            if header_end == -1:
+                header_end = end
+
+            if not current_repo or '(NOT FOUND)' in current_repo:
+                continue
+            commit = parse_commit_block([data[header_start:header_end].decode(errors='replace')], current_repo)
+            if commit is None:
+                continue
+
+            commit['body'] = None
+            commit['source'] = (self, len(self.body_starts))
+            self.body_starts.append(header_end)
+            self.body_ends.append(end)
+            yield commit
+
+    def body(self, position):
+        """Decode the body of the commit at `position` in scan order.
+
+        Returns '' if the file was replaced since it was scanned.
+        """
+        start, end = self.body_starts[position], self.body_ends[position]
+        if self.data is not None:
+            raw = self.data[start:end]
+        else:
+            with open(self.path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                if (stat.st_ino, stat.st_size, stat.st_mtime_ns) != self.identity:
+                    return ''
+                f.seek(start)
+                raw = f.read(end - start)
+        return raw.decode(errors='replace').strip()
+
+    def close(self):
+        """Unmap and close the file; later `body()` calls read it directly."""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        if self.file is not None:
+            self.file.close()
+        self.file = None
+        self.data = None
+
+
+def iter_commit_headers(input_file, repo_name=None):
+    """Yield header-only commit records from a dump; bodies stay on disk.
+
+    The records' 'source' lets `load_body` (and CommitTable rows) decode a
+    body when it is needed.
+    """
+    with DumpIndex(input_file, repo_name) as dump:
+        yield from dump.scan()
+
+
+def iter_commits(input_file, repo_name=None):
+    """Yield full commit records from a dump file, one at a time.
+
+    `repo_name` is used for commits that appear before any repo marker,
+    which is the case for per-repo files that were written without one.
+    """
+    with DumpIndex(input_file, repo_name) as dump:
+        for commit in dump.scan():
+            _, position = commit.pop('source')
+            commit['body'] = dump.body(position)
+            yield commit
+
+
+def load_body(commit):
+    """Return a commit's body, decoding it from its dump if it was not loaded."""
+    body = commit['body']
+    if body is not None:
+        return body
+    dump, position = commit['source']
+    return dump.body(position)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Structured per-repo commit records: NDJSON plus a per-day offset index.
+
+The collector writes each repo's commits twice: as the readable
+`<repo>.txt` used in agent prompts, and as `<repo>.ndjson`, one JSON
+object per line. JSON escapes newlines and separators, so subjects,
+bodies and author names can hold any text and a record always ends at
+the next newline. `<repo>.index.json` maps each commit day to the byte
+range of that day's records. Records are written newest first, so a day
+is a single range and readers can memory-map the file and decode only
+the days they need.
+"""
+
+import os
+import json
+import mmap
+from datetime import datetime
+
+RECORD_FIELDS = ('hash', 'author', 'email', 'date', 'committed_at', 'subject', 'body', 'type')
+
+
+def commit_day(committed_at):
+    """Return the YYYY-MM-DD day a commit timestamp falls on."""
+    return datetime.fromtimestamp(committed_at).strftime('%Y-%m-%d')
+
+
+class RecordWriter:
+    """Write commit records as NDJSON while building the per-day index.
+
+    Commits must arrive grouped by day, as they do from the commit store.
+    """
+
+    def __init__(self, path, repo):
+        self.file = open(path, 'wb')
+        self.index = {'repo': repo, 'count': 0, 'bytes': 0, 'days': {}}
+
+    def write(self, commit):
+        line = json.dumps({field: commit.get(field) for field in RECORD_FIELDS}).encode() + b'\n'
+        day = commit_day(commit['committed_at'])
+
+        entry = self.index['days'].get(day)
+        if entry is None:
+            entry = self.index['days'][day] = [self.index['bytes'], 0, 0]
+        entry[1] += len(line)
+        entry[2] += 1
+
+        self.file.write(line)
+        self.index['count'] += 1
+        self.index['bytes'] += len(line)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def index_path(records_path):
+    """Return the offset index path that belongs to a record file."""
+    return records_path[:-len('.ndjson')] + '.index.json'
+
+
+def save_record_index(index, path):
+    """Write the offset index next to the repo's record file."""
+    with open(path, 'w') as f:
+        json.dump(index, f, indent=2)
+
+
+def load_record_index(path):
+    """Load a saved offset index, or None if the collector did not write one."""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def iter_records(path, index, since=None, until=None):
+    """Yield the commit records of days in [since, until] (YYYY-MM-DD), newest first.
+
+    Only the byte ranges of the selected days are decoded.
+    """
+    ranges = [
+        (offset, length) for day, (offset, length, _) in index['days'].items()
+        if (since is None or day >= since) and (until is None or day <= until)
+    ]
+    if not ranges or not os.path.getsize(path):
+        return
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for offset, length in sorted(ranges):
+            for line in data[offset:offset + length].splitlines():
+                record = json.loads(line)
+                record['repo'] = index['repo']
+                yield record
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Persistent SQLite store of parsed commits, keyed by repo and commit hash.
+
+Each repository keeps a high-water mark: the earliest window start that
+has been collected continuously up to the last run, and the ref tips seen
+at that run. The collector only asks git for commits that are not
+reachable from those tips, so re-running the same (or an overlapping)
+week costs a for-each-ref and an almost empty git log.
+
+Commits also carry their patch id (see patch_index). With `dedupe`, reads
+collapse rebased and cherry-picked copies of a change into the earliest
+commit.
+"""
+
+import os
+import json
+import sqlite3
+import time
+
+from branch_index import window_bounds
+from commit_parser import DUMP_FILE, iter_commit_headers
+from commit_records import index_path, load_record_index, iter_records
+
+STORE_PATH = os.path.expanduser("~/.cache/weekly_summary/commits.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    repo TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    author TEXT NOT NULL,
+    email TEXT NOT NULL,
+    date TEXT NOT NULL,
+    committed_at INTEGER NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    type TEXT NOT NULL,
+    patch_id TEXT,
+    PRIMARY KEY (repo, hash)
+);
+CREATE INDEX IF NOT EXISTS commits_by_time ON commits (committed_at, repo);
+CREATE INDEX IF NOT EXISTS commits_by_patch ON commits (repo, patch_id);
+CREATE TABLE IF NOT EXISTS watermarks (
+    repo TEXT PRIMARY KEY,
+    low INTEGER NOT NULL,
+    high INTEGER NOT NULL,
+    tips TEXT NOT NULL,
+    updated_at INTEGER NOT NULL
+);
+"""
+
+COLUMNS = ('repo', 'hash', 'author', 'email', 'date', 'committed_at', 'subject', 'body', 'type')
+
+# Hidden by `dedupe`: a commit with an earlier equivalent in the same window
+HAS_EARLIER_EQUIVALENT = """
+    c.patch_id IS NOT NULL AND c.patch_id != '' AND EXISTS (
+        SELECT 1 FROM commits d
+        WHERE d.repo = c.repo AND d.patch_id = c.patch_id
+          AND d.committed_at BETWEEN ? AND ?
+          AND (d.committed_at < c.committed_at OR (d.committed_at = c.committed_at AND d.hash < c.hash))
+    )
+"""
+
+
+class CommitStore:
+    """Thin wrapper around the SQLite commit database.
+
+    Open one store per thread; SQLite serializes concurrent writers.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def watermark(self, repo):
+        """Return {'low', 'high', 'tips'} for a repo, or None if never collected."""
+        row = self.conn.execute(
+            "SELECT low, high, tips FROM watermarks WHERE repo = ?", (repo,)
+        ).fetchone()
+        if not row:
+            return None
+        return {'low': row[0], 'high': row[1], 'tips': json.loads(row[2])}
+
+    def add_commits(self, repo, commits):
+        """Insert commit records, ignoring hashes already stored. Returns the new count."""
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO commits ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                (
+                    (repo, c['hash'], c['author'], c['email'], c['date'], c['committed_at'],
+                     c['subject'], c['body'], c['type'])
+                    for c in commits
+                )
+            )
+        return self.conn.total_changes - before
+
+    def set_watermark(self, repo, low, tips):
+        """Record the collected range start and the ref tips it was collected at."""
+        high = self.conn.execute(
+            "SELECT COALESCE(MAX(committed_at), 0) FROM commits WHERE repo = ?", (repo,)
+        ).fetchone()[0]
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO watermarks (repo, low, high, tips, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (repo, low, high, json.dumps(sorted(tips)), int(time.time()))
+            )
+
+    def missing_patch_ids(self, repo):
+        """Return the hashes of a repo's commits whose patch id is not known yet."""
+        return [row[0] for row in self.conn.execute(
+            "SELECT hash FROM commits WHERE repo = ? AND patch_id IS NULL", (repo,)
+        )]
+
+    def set_patch_ids(self, repo, hashes, patch_ids):
+        """Store patch ids for `hashes`; commits without a diff (merges) get ''."""
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE commits SET patch_id = ? WHERE repo = ? AND hash = ?",
+                ((patch_ids.get(commit, ''), repo, commit) for commit in hashes)
+            )
+
+    def commit_index(self, repo, since_ts, until_ts):
+        """Return {hash: (subject, patch id)} for a repo's commits in the window."""
+        return {
+            row[0]: (row[1], row[2]) for row in self.conn.execute(
+                "SELECT hash, subject, patch_id FROM commits WHERE repo = ? AND committed_at BETWEEN ? AND ?",
+                (repo, since_ts, until_ts)
+            )
+        }
+
+    def iter_commits(self, since_ts, until_ts, repo=None, dedupe=False):
+        """Yield commit records committed inside [since_ts, until_ts], newest first.
+
+        With `dedupe`, commits whose patch id matches an earlier commit in
+        the window are skipped.
+        """
+        query = f"SELECT {', '.join('c.' + col for col in COLUMNS)} FROM commits c WHERE c.committed_at BETWEEN ? AND ?"
+        params = [since_ts, until_ts]
+        if repo is not None:
+            query += " AND c.repo = ?"
+            params.append(repo)
+        if dedupe:
+            query += f" AND NOT ({HAS_EARLIER_EQUIVALENT})"
+            params.extend([since_ts, until_ts])
+        query += " ORDER BY c.committed_at DESC, c.rowid"
+
+        for row in self.conn.execute(query, params):
+            yield dict(zip(COLUMNS, row))
+
+    def duplicate_groups(self, since_ts, until_ts, repo):
+        """Return {representative hash: [(hash, patch id)]} for changes with several commits in the window.
+
+        Members are ordered oldest first, so the representative comes first.
+        """
+        rows = self.conn.execute(
+            """
+            SELECT hash, patch_id FROM commits
+            WHERE repo = ? AND committed_at BETWEEN ? AND ? AND patch_id IN (
+                SELECT patch_id FROM commits
+                WHERE repo = ? AND committed_at BETWEEN ? AND ? AND patch_id != ''
+                GROUP BY patch_id HAVING COUNT(*) > 1
+            )
+            ORDER BY patch_id, committed_at, hash
+            """,
+            (repo, since_ts, until_ts, repo, since_ts, until_ts)
+        )
+
+        groups = {}
+        by_patch = {}
+        for commit, patch_id in rows:
+            members = by_patch.get(patch_id)
+            if members is None:
+                members = by_patch[patch_id] = groups[commit] = []
+            members.append((commit, patch_id))
+        return groups
+
+    def repos(self):
+        """Return the repos that have been collected at least once."""
+        return [row[0] for row in self.conn.execute("SELECT repo FROM watermarks ORDER BY repo")]
+
+
+def open_store_if_present(path=STORE_PATH):
+    """Open the store if a previous collection created it, else return None."""
+    if not os.path.exists(path):
+        return None
+    return CommitStore(path)
+
+
+def week_commits(monday, sunday, repo=None, path=STORE_PATH, dump_file=DUMP_FILE, records_file=None):
+    """Yield the week's commits from the store, falling back to collected files.
+
+    Commits from the store are deduplicated by patch id. The files are read
+    when there is no store yet, or when `repo` has never been collected
+    into it: the repo's NDJSON `records_file` if it has an index, else the
+    text dump. With `dump_file` None there is no text fallback.
+    """
+    store = open_store_if_present(path)
+    if store is not None and repo is not None and store.watermark(repo) is None:
+        store.close()
+        store = None
+
+    index = load_record_index(index_path(records_file)) if records_file else None
+    if store is None and index is not None:
+        yield from iter_records(records_file, index, monday, sunday)
+        return
+
+    if store is None and dump_file is None:
+        return
+
+    if store is None:
+        for commit in iter_commit_headers(dump_file, repo):
+            if repo is None or commit['repo'] == repo:
+                yield commit
+        return
+
+    _, _, since_ts, until_ts = window_bounds(monday, sunday)
+    with store:
+        yield from store.iter_commits(since_ts, until_ts, repo, dedupe=True)
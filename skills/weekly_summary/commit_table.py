@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Compact columnar table of parsed commits.
+
+Low-cardinality fields (repo, author, email, type, ISO week) are interned
+to integer ids and stored in `array` columns; dates are parsed once into
+epoch seconds plus a UTC offset. Rows are grouped by repo, author, type
+and week as they are appended, so group-bys are index lookups rather
+than fresh dict-of-list builds. A commit's week is taken from its committer
+timestamp, the date the store's week windows select on; records without
+one (parsed from a dump) fall back to the author date.
+
+Bodies of rows parsed from a dump are decoded from the memory-mapped file
+the first time a row's body is asked for.
+"""
+
+from array import array
+from datetime import datetime, timedelta, timezone
+
+GROUP_FIELDS = ('repo', 'author', 'type', 'week')
+
+
+class StringPool:
+    """Interns strings to dense integer ids in first-seen order."""
+
+    __slots__ = ('ids', 'values')
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def intern(self, value):
+        ident = self.ids.get(value)
+        if ident is None:
+            ident = len(self.values)
+            self.ids[value] = ident
+            self.values.append(value)
+        return ident
+
+    def __getitem__(self, ident):
+        return self.values[ident]
+
+    def __len__(self):
+        return len(self.values)
+
+
+def parse_date(date):
+    """Parse a git ISO date into (epoch seconds, UTC offset minutes), or None."""
+    try:
+        parsed = datetime.strptime(date, '%Y-%m-%d %H:%M:%S %z')
+    except ValueError:
+        return None
+    return int(parsed.timestamp()), int(parsed.utcoffset().total_seconds() // 60)
+
+
+def local_datetime(ts, offset):
+    """Rebuild the author-local datetime from epoch seconds and UTC offset."""
+    return datetime.fromtimestamp(ts, timezone(timedelta(minutes=offset)))
+
+
+def iso_week(ts, offset):
+    """Return the ISO week key ('YYYY-Www') of an author-local timestamp."""
+    year, week, _ = local_datetime(ts, offset).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def commit_week(committed_at):
+    """Return the ISO week key of a committer timestamp, in local time like the week windows."""
+    year, week, _ = datetime.fromtimestamp(committed_at).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class CommitRow:
+    """Read-only view of one table row.
+
+    Supports `row['subject']` as well as `row.subject`, so renderers written
+    against commit dicts work unchanged.
+    """
+
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, field):
+        return getattr(self, field)
+
+    @property
+    def hash(self):
+        return self.table.hashes[self.index]
+
+    @property
+    def repo(self):
+        return self.table.pools['repo'][self.table.columns['repo'][self.index]]
+
+    @property
+    def author(self):
+        return self.table.pools['author'][self.table.columns['author'][self.index]]
+
+    @property
+    def email(self):
+        return self.table.pools['email'][self.table.columns['email'][self.index]]
+
+    @property
+    def type(self):
+        return self.table.pools['type'][self.table.columns['type'][self.index]]
+
+    @property
+    def week(self):
+        return self.table.pools['week'][self.table.columns['week'][self.index]]
+
+    @property
+    def ts(self):
+        return self.table.ts[self.index]
+
+    @property
+    def date(self):
+        raw = self.table.raw_dates.get(self.index)
+        if raw is not None:
+            return raw
+        return local_datetime(self.table.ts[self.index], self.table.offsets[self.index]).strftime('%Y-%m-%d %H:%M:%S %z')
+
+    @property
+    def subject(self):
+        return self.table.subjects[self.index]
+
+    @property
+    def body(self):
+        body = self.table.bodies[self.index]
+        if body is None:
+            dump, position = self.table.sources[self.index]
+            body = self.table.bodies[self.index] = dump.body(position)
+        return body
+
+
+class CommitTable:
+    """Column store for commit records with incremental group indexes."""
+
+    def __init__(self):
+        self.pools = {field: StringPool() for field in ('repo', 'author', 'email', 'type', 'week')}
+        self.columns = {field: array('I') for field in self.pools}
+        self.ts = array('q')
+        self.offsets = array('h')
+        self.committed = array('q')  # committer timestamp, author timestamp when unknown
+        self.raw_dates = {}  # row -> date string that could not be parsed
+        self.hashes = []
+        self.subjects = []
+        self.bodies = []  # None until decoded from the dump
+        self.sources = {}  # row -> (DumpIndex, position) for bodies left in a dump
+        self.groups = {field: {} for field in GROUP_FIELDS}
+
+    @classmethod
+    def from_commits(cls, commits):
+        """Build a table from any iterable of commit records."""
+        table = cls()
+        for commit in commits:
+            table.append(commit)
+        return table
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def append(self, commit):
+        """Add one commit record (a parser or store dict)."""
+        row = len(self.hashes)
+
+        parsed = parse_date(commit['date'])
+        if parsed is None:
+            self.raw_dates[row] = commit['date']
+            parsed = (0, 0)
+        ts, offset = parsed
+
+        committed_at = commit.get('committed_at')
+        if committed_at is not None:
+            week = commit_week(committed_at)
+        else:
+            week = iso_week(ts, offset) if row not in self.raw_dates else 'unknown'
+
+        values = {
+            'repo': commit['repo'],
+            'author': commit['author'],
+            'email': commit['email'],
+            'type': commit['type'],
+            'week': week
+        }
+        for field, value in values.items():
+            ident = self.pools[field].intern(value)
+            self.columns[field].append(ident)
+            if field in self.groups:
+                group = self.groups[field].get(ident)
+                if group is None:
+                    group = self.groups[field][ident] = array('I')
+                group.append(row)
+
+        self.ts.append(ts)
+        self.offsets.append(offset)
+        self.committed.append(committed_at if committed_at is not None else ts)
+        self.hashes.append(commit['hash'])
+        self.subjects.append(commit['subject'])
+        self.bodies.append(commit['body'])
+        if commit['body'] is None and commit.get('source') is not None:
+            self.sources[row] = commit['source']
+
+    def row(self, index):
+        return CommitRow(self, index)
+
+    def rows(self, indexes=None):
+        """Yield row views for the given row indexes (all rows by default)."""
+        if indexes is None:
+            indexes = range(len(self))
+        for index in indexes:
+            yield CommitRow(self, index)
+
+    def group_by(self, field):
+        """Return {value: row indexes} in first-seen order, from the prebuilt index."""
+        pool = self.pools[field]
+        return {pool[ident]: rows for ident, rows in self.groups[field].items()}
+
+    def count_by(self, field):
+        """Return {value: row count} in first-seen order."""
+        pool = self.pools[field]
+        return {pool[ident]: len(rows) for ident, rows in self.groups[field].items()}
+
+    def partition(self, indexes, field):
+        """Split a subset of rows by another field, keeping row order."""
+        column = self.columns[field]
+        pool = self.pools[field]
+        parts = {}
+        for index in indexes:
+            ident = column[index]
+            part = parts.get(ident)
+            if part is None:
+                part = parts[ident] = array('I')
+            part.append(index)
+        return {pool[ident]: rows for ident, rows in parts.items()}
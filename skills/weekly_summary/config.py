@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""Shared settings for every weekly summary stage."""
+
+import os
+
+REPOS = [
+    "web-app",
+    "workers",
+    "data-pipelines",
+    "data-cluster",
+    "data-cluster-operator",
+    "data-cluster-helm",
+    "k8s-charts",
+    "skupper-gateway",
+    "MCPs/mcp-base",
+    "MCPs/mcp-boilerplate",
+    "MCPs/mcp-datacluster",
+    "MCPs/mcp-openaire"
+]
+
+# Overridable so benchmarks and test runs don't touch the real outputs
+COMMIT_DIR = os.environ.get("WEEKLY_COMMIT_DIR", "/tmp/weekly_commits_by_repo")
+AGENT_OUTPUT_DIR = "/tmp/weekly_agent_outputs"
+REPORT_DIR = "ai_docs/weekly-summaries"
+
+
+def repo_file(repo):
+    """Return the filesystem-safe name used for a repo's output files."""
+    return repo.replace('/', '_')
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Deployment-stage detection from the commit graph.
+
+A branch counts as promoted to a stage when it lands on the first-parent
+history of that stage's branch inside the window (dev → alpha, staging →
+staging, main/master → production). Two shapes are recognized:
+- merge: a merge commit whose second parent brings the branch in
+- squash: a single-parent commit whose patch id matches a commit of the
+  branch (squash merges of one commit, cherry-picks and rebase merges)
+
+Merging a stage into an earlier one (main back into dev) is not a
+promotion and is skipped. Fast-forwards are not reported, because in the
+graph they look the same as a branch just cut from the stage.
+
+The graph comes from the branch index walk, and patch ids come from the
+commit store, so detection runs no extra git commands. The resulting stage
+map is indexed by stage and by branch, and is saved as
+`<repo>.stages.json` next to the repo's commit file.
+"""
+
+import re
+import json
+from datetime import datetime
+
+from branch_index import MAINLINE_BRANCHES, branch_name, reachable_in_window
+
+STAGES = (
+    ('alpha', ('dev', 'develop')),
+    ('staging', ('staging',)),
+    ('production', ('main', 'master')),
+)
+
+# Names the merged branch when no ref leads to it (deleted after merging)
+MERGE_SUBJECT = re.compile(
+    r"Merge (?:remote-tracking )?branch '([^']+)'"
+    r"|Merge pull request #\d+ from [^/\s]+/(\S+)"
+    r"|Merged? (?:in )?(\S+/\S+) into"
+)
+
+
+def stage_of(name):
+    """Return the stage a branch name deploys to, or None."""
+    for stage, branches in STAGES:
+        if name in branches:
+            return stage
+    return None
+
+
+def stage_rank(name):
+    """Position of a branch's stage in the pipeline; -1 for other branches."""
+    for rank, (_, branches) in enumerate(STAGES):
+        if name in branches:
+            return rank
+    return -1
+
+
+def merged_branch_name(subject):
+    """Extract the merged branch from a merge subject, or None."""
+    match = MERGE_SUBJECT.search(subject or '')
+    if not match:
+        return None
+    name = next(group for group in match.groups() if group)
+    if name.startswith('origin/'):
+        name = name[len('origin/'):]
+    return name
+
+
+def first_parent_chain(tip, parents):
+    """Commits on the first-parent history of `tip` within the walked graph."""
+    chain = []
+    commit = tip
+    while commit in parents:
+        chain.append(commit)
+        commit = parents[commit][0] if parents[commit] else None
+    return chain
+
+
+def build_stage_map(index, graph, commits=None):
+    """Return the stage map for one repository.
+
+    `index` and `graph` come from build_branch_index; `commits` maps the
+    window's commit hashes to (subject, patch id) from the commit store
+    and enables squash detection and naming of deleted branches.
+    """
+    commits = commits or {}
+    parents = graph.get('parents', {})
+    times = graph.get('times', {})
+    in_window = graph.get('in_window', set())
+    refnames = graph.get('refnames', {})
+
+    # A merged commit is named after the branch whose tip it is, else the
+    # branch whose own (first-parent) line of history it sits on
+    heads = sorted(graph.get('heads', {}).items())
+    tip_owner = {}
+    line_owner = {}
+    chains = {}
+    for short, tip in heads:
+        name = branch_name(refnames.get(short, short))
+        tip_owner.setdefault(tip, name)
+        chains[short] = first_parent_chain(tip, parents)
+        for commit in chains[short]:
+            line_owner.setdefault(commit, []).append(name)
+
+    # Feature branch commits and patches, for squash detection
+    commit_owner = {}
+    patch_owner = {}
+    for short, tip in heads:
+        name = branch_name(refnames.get(short, short))
+        if name in MAINLINE_BRANCHES:
+            continue
+        for commit in index['branches'].get(short, []):
+            commit_owner.setdefault(commit, name)
+            patch_id = commits.get(commit, (None, None))[1]
+            if patch_id:
+                patch_owner.setdefault(patch_id, name)
+
+    stages = {stage: [] for stage, _ in STAGES}
+    seen = set()
+    reach_cache = {}
+
+    def reach(commit):
+        if commit not in reach_cache:
+            reach_cache[commit] = set(reachable_in_window(commit, parents, in_window))
+        return reach_cache[commit]
+
+    def merged_name(merge, merged, target):
+        if tip_owner.get(merged, target) != target:
+            return tip_owner[merged]
+        for name in line_owner.get(merged, []):
+            if name != target:
+                return name
+        return merged_branch_name(commits.get(merge, ('', None))[0]) or merged[:8]
+
+    for short, tip in heads:
+        target = branch_name(refnames.get(short, short))
+        stage = stage_of(target)
+        if stage is None:
+            continue
+
+        # The stage's first-parent history, back to the window start
+        for commit in chains[short]:
+            commit_parents = parents[commit]
+            promotion = None
+
+            if commit not in in_window:
+                pass  # committed after the window
+            elif len(commit_parents) >= 2:
+                merged = commit_parents[1]
+                name = merged_name(commit, merged, target)
+                if stage_rank(name) < stage_rank(target):
+                    promotion = {'branch': name, 'kind': 'merge', 'commits': len(reach(merged) - reach(commit_parents[0]))}
+            elif commit not in commit_owner:
+                patch_id = commits.get(commit, (None, None))[1]
+                if patch_id and patch_id in patch_owner:
+                    promotion = {'branch': patch_owner[patch_id], 'kind': 'squash', 'commits': 1}
+
+            if promotion and (stage, commit) not in seen:
+                seen.add((stage, commit))
+                promotion['commit'] = commit
+                promotion['date'] = datetime.fromtimestamp(times[commit]).strftime('%Y-%m-%d')
+                stages[stage].append(promotion)
+
+    by_branch = {}
+    for stage, promotions in stages.items():
+        promotions.sort(key=lambda p: (p['date'], p['commit']))
+        for promotion in promotions:
+            by_branch.setdefault(promotion['branch'], []).append(
+                {'stage': stage, 'date': promotion['date'], 'commit': promotion['commit']}
+            )
+
+    return {
+        'since': index['since'],
+        'until': index['until'],
+        'stages': stages,
+        'branches': dict(sorted(by_branch.items()))
+    }
+
+
+def save_stage_map(stage_map, path):
+    """Write the stage map next to the repo's commit file."""
+    with open(path, 'w') as f:
+        json.dump(stage_map, f, indent=2)
+
+
+def load_stage_map(path):
+    """Load a saved stage map, or None if the collector did not write one."""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Cheap per-repo change detection from ref tips.
+
+A repository's fingerprint is a hash of its `git for-each-ref` output, so
+any new commit, rebase, new branch or deleted branch changes it. The
+collector records the fingerprint with each week's outputs; a repo whose
+fingerprint and window match the previous run can reuse its commit file
+and analysis untouched.
+"""
+
+import json
+import hashlib
+
+FINGERPRINT_FILE = ".fingerprints.json"
+
+
+def ref_fingerprint(refs):
+    """Hash the raw for-each-ref output of a repository."""
+    return hashlib.sha256(refs.encode('utf-8', 'replace')).hexdigest()
+
+
+def load_fingerprints(path):
+    """Load {repo: record} from a fingerprint file, or {} if missing or unreadable."""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_fingerprints(path, records):
+    """Write {repo: record} to a fingerprint file."""
+    with open(path, 'w') as f:
+        json.dump(records, f, indent=2, sort_keys=True)
+
+
+def same_inputs(record, previous):
+    """True if two records describe the same ref tips over the same window."""
+    if not record or not previous:
+        return False
+    return all(record.get(k) == previous.get(k) for k in ('fingerprint', 'monday', 'sunday'))
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Spans for every pipeline phase and per-repo task, with an optional profiler.
+
+`span(name, cat)` records a phase or task while a Tracer is active and
+costs nothing otherwise. Each span keeps:
+- wall time
+- CPU time: the whole process for phases, the calling thread for tasks
+  run on worker threads
+- peak RSS of the process when the span ends
+- bytes read and written through system calls, pipes from git included
+
+At the end of a run, `finish_trace` writes a Chrome trace JSON file that
+chrome://tracing and ui.perfetto.dev can open, and prints a summary table.
+Agent calls overlap on the event loop's thread, so they are recorded as
+async events, each on its own track.
+
+With `--profile`, `profiled(name)` also runs the parse and render stages
+under cProfile and saves `<name>.prof` with a text summary next to it.
+"""
+
+import os
+import time
+import json
+import pstats
+import cProfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+TRACE_FILE = "/tmp/weekly_summary_trace.json"
+PROFILE_DIR = "/tmp/weekly_summary_profile"
+PROFILE_LINES = 30
+
+_tracer = None
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB, or None."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def io_bytes(thread=False):
+    """Return (bytes read, bytes written) so far for the process or the calling thread.
+
+    Linux only: None elsewhere.
+    """
+    path = f"/proc/self/task/{threading.get_native_id()}/io" if thread else "/proc/self/io"
+    try:
+        with open(path) as f:
+            fields = dict(line.split(': ') for line in f.read().splitlines())
+    except (OSError, ValueError):
+        return None
+    return int(fields['rchar']), int(fields['wchar'])
+
+
+class Tracer:
+    """Collects spans and writes them as a Chrome trace."""
+
+    def __init__(self, path=TRACE_FILE, profile_dir=None):
+        self.path = path
+        self.profile_dir = profile_dir
+        self.origin = time.perf_counter()
+        self.events = []
+        self.spans = []
+        self.threads = {}
+        self.lock = threading.Lock()
+        self.next_id = 0
+
+    def timestamp(self):
+        """Microseconds since the tracer started."""
+        return (time.perf_counter() - self.origin) * 1e6
+
+    @contextmanager
+    def span(self, name, cat='phase', cpu='process', overlapping=False, **args):
+        thread = cpu == 'thread'
+        cpu_clock = {'process': time.process_time, 'thread': time.thread_time}.get(cpu)
+        cpu_start = cpu_clock() if cpu_clock else None
+        io_start = io_bytes(thread) if not overlapping else None
+        start = self.timestamp()
+        try:
+            yield args
+        finally:
+            end = self.timestamp()
+            record = {'name': name, 'cat': cat, 'wall_ms': (end - start) / 1000}
+            if cpu_clock:
+                record['cpu_ms'] = (cpu_clock() - cpu_start) * 1000
+            rss = peak_rss_kb()
+            if rss is not None:
+                record['peak_rss_kb'] = rss
+            io_end = io_bytes(thread) if io_start else None
+            if io_end:
+                record['read_bytes'] = io_end[0] - io_start[0]
+                record['write_bytes'] = io_end[1] - io_start[1]
+            record.update(args)
+            self.add(record, start, end, overlapping)
+
+    def add(self, record, start, end, overlapping=False):
+        current = threading.current_thread()
+        tid = threading.get_native_id()
+        event_args = {key: value for key, value in record.items() if key not in ('name', 'cat')}
+        common = {'name': record['name'], 'cat': record['cat'], 'pid': os.getpid(), 'tid': tid}
+
+        with self.lock:
+            self.threads.setdefault(tid, current.name)
+            self.spans.append((start, record))
+            if overlapping:
+                self.next_id += 1
+                self.events.append(dict(common, ph='b', id=self.next_id, ts=start, args=event_args))
+                self.events.append(dict(common, ph='e', id=self.next_id, ts=end))
+            else:
+                self.events.append(dict(common, ph='X', ts=start, dur=end - start, args=event_args))
+
+    def write(self):
+        """Write the Chrome trace JSON file."""
+        metadata = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}}
+            for tid, name in self.threads.items()
+        ]
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({'traceEvents': metadata + self.events, 'displayTimeUnit': 'ms'}, f)
+
+    def summary(self):
+        """Return the summary table: phases by start time, then tasks per category."""
+        lines = [f"{'Phase':<28} {'Wall':>9} {'CPU':>9} {'Peak RSS':>10} {'Read':>10} {'Written':>10}"]
+        for _, record in sorted(self.spans, key=lambda item: item[0]):
+            if record['cat'] == 'phase':
+                lines.append(
+                    f"{record['name']:<28} {format_ms(record['wall_ms']):>9} {format_ms(record.get('cpu_ms')):>9} "
+                    f"{format_kb(record.get('peak_rss_kb')):>10} {format_bytes(record.get('read_bytes')):>10} "
+                    f"{format_bytes(record.get('write_bytes')):>10}"
+                )
+
+        categories = {}
+        for _, record in self.spans:
+            if record['cat'] != 'phase':
+                categories.setdefault(record['cat'], []).append(record)
+        for cat, records in categories.items():
+            slowest = max(records, key=lambda r: r['wall_ms'])
+            total = sum(r['wall_ms'] for r in records)
+            lines.append(
+                f"{cat + ' tasks':<28} {len(records):>4} × avg {format_ms(total / len(records))}, "
+                f"slowest {slowest['name']} ({format_ms(slowest['wall_ms'])})"
+            )
+        return '\n'.join(lines)
+
+
+def format_ms(ms):
+    if ms is None:
+        return '-'
+    return f"{ms / 1000:.2f}s" if ms >= 1000 else f"{ms:.0f}ms"
+
+
+def format_kb(kb):
+    return '-' if kb is None else f"{kb / 1024:.0f}MB"
+
+
+def format_bytes(count):
+    if count is None:
+        return '-'
+    for unit in ('B', 'KB', 'MB'):
+        if count < 1024:
+            return f"{count:.0f}{unit}"
+        count /= 1024
+    return f"{count:.1f}GB"
+
+
+def start_trace(path=TRACE_FILE, profile_dir=None):
+    """Start recording spans for this run and return the tracer."""
+    global _tracer
+    _tracer = Tracer(path, profile_dir)
+    return _tracer
+
+
+def finish_trace():
+    """Write the trace, print the summary table and stop recording."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is None or not tracer.spans:
+        return
+    tracer.write()
+    print(f"\n⏱️  Timing summary:\n{tracer.summary()}")
+    print(f"   Trace written to {tracer.path} (open in ui.perfetto.dev)")
+
+
+@contextmanager
+def span(name, cat='phase', cpu='process', overlapping=False, **args):
+    """Record a span if a trace is running.
+
+    `cpu` is 'process', 'thread' (tasks on worker threads) or None. Spans
+    that overlap others on the same thread (coroutines) set `overlapping`.
+    """
+    if _tracer is None:
+        yield args
+        return
+    with _tracer.span(name, cat, cpu, overlapping, **args) as span_args:
+        yield span_args
+
+
+@contextmanager
+def profiled(name):
+    """Run the block under cProfile when profiling is enabled."""
+    if _tracer is None or _tracer.profile_dir is None:
+        yield
+        return
+
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        os.makedirs(_tracer.profile_dir, exist_ok=True)
+        base = f"{_tracer.profile_dir}/{name}"
+        profile.dump_stats(f"{base}.prof")
+        with open(f"{base}.txt", 'w') as f:
+            pstats.Stats(profile, stream=f).sort_stats('cumulative').print_stats(PROFILE_LINES)
+        print(f"   🔬 Profile saved to {base}.prof")
+
+
+def add_trace_arguments(parser):
+    """Add the tracing and profiling options to an argparse parser."""
+    parser.add_argument("--trace-file", default=TRACE_FILE, help="Chrome trace JSON written at the end of the run")
+    parser.add_argument("--profile", nargs='?', const=PROFILE_DIR, metavar="DIR",
+                        help=f"cProfile the parse and render stages (default dir: {PROFILE_DIR})")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Multi-pattern keyword matcher (Aho–Corasick) for commit classification.
+
+The automaton is compiled once from a table of labels and their keywords
+and then classifies a subject in a single left-to-right scan, however many
+keywords the table holds. Matching is a case-insensitive substring match,
+the same as `kw in subject.lower()`.
+"""
+
+from collections import deque
+
+
+class KeywordMatcher:
+    """Compiled matcher mapping keyword hits back to their labels.
+
+    Labels keep the order of the table they were built from, so callers
+    that relied on dict or if/elif order get the same priority.
+    """
+
+    def __init__(self, table):
+        """Build from an iterable of (label, keywords) pairs."""
+        self.labels = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [0]  # bitmask of label indexes ending at each state
+
+        for label, keywords in table:
+            bit = 1 << len(self.labels)
+            self.labels.append(label)
+            for keyword in keywords:
+                self._add(keyword.lower(), bit)
+
+        self._link()
+
+    def _add(self, keyword, bit):
+        state = 0
+        for char in keyword:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(0)
+            state = nxt
+        self._out[state] |= bit
+
+    def _link(self):
+        """Compute failure links breadth-first and fold outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def mask(self, text):
+        """Return the bitmask of labels whose keywords occur in `text`."""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        state = 0
+        found = 0
+
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            found |= out[state]
+
+        return found
+
+    def match(self, text):
+        """Return every matching label, in table order."""
+        found = self.mask(text)
+        labels = []
+        index = 0
+        while found:
+            if found & 1:
+                labels.append(self.labels[index])
+            found >>= 1
+            index += 1
+        return labels
+
+    def first(self, text):
+        """Return the highest-priority matching label, or None."""
+        found = self.mask(text)
+        if not found:
+            return None
+        return self.labels[(found & -found).bit_length() - 1]
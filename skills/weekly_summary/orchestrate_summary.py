@@ -4,66 +4,212 @@ Orchestrate AI-powered weekly summary generation.
 
 Workflow:
 1. Spawn parallel agents to analyze each repo
-2. Detect feature branch → dev merges (Alpha deployments)
+2. Read deployment-stage promotions (feature branch → dev is an Alpha
+   deployment) from the stage map the collector derives from the commit graph
 3. Aggregate all results into final reports
+
+Agents are run by agent_dispatch: bounded concurrency, a deadline per repo,
+retries with backoff. Repos whose agent fails still get a partial analysis
+built from the locally computed metrics. Completed analyses are cached by
+content (analysis_cache), so unchanged commit files skip the agent.
 """
 
+import io
 import os
-import sys
 import json
-import subprocess
+import time
+import argparse
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-REPOS = [
-    "web-app",
-    "workers",
-    "data-pipelines",
-    "data-cluster",
-    "data-cluster-operator",
-    "data-cluster-helm",
-    "k8s-charts",
-    "skupper-gateway",
-    "MCPs/mcp-base",
-    "MCPs/mcp-boilerplate",
-    "MCPs/mcp-datacluster",
-    "MCPs/mcp-openaire"
-]
-
-COMMIT_DIR = "/tmp/weekly_commits_by_repo"
-AGENT_OUTPUT_DIR = "/tmp/weekly_agent_outputs"
-
-
-def spawn_repo_agent(repo_name, monday, sunday):
-    """Spawn an Explore agent to analyze a single repository."""
+
+from config import REPOS, COMMIT_DIR, AGENT_OUTPUT_DIR, REPORT_DIR
+from commit_store import STORE_PATH, week_commits
+from branch_index import load_branch_index, feature_branches
+from deploy_stages import load_stage_map
+from instrumentation import span, start_trace, finish_trace, add_trace_arguments
+from fingerprints import FINGERPRINT_FILE, load_fingerprints, same_inputs
+from agent_dispatch import (
+    BACKENDS, DEFAULT_CONCURRENCY, DEFAULT_DEADLINE, DEFAULT_RETRIES, HISTORY_FILE,
+    DurationHistory, make_backend, dispatch
+)
+from analysis_cache import AnalysisCache, CACHE_DIR, analysis_key, commit_file_digest
+from analysis_chunks import CHUNK_CHAR_BUDGET, chunk_commits, merge_analyses
+
+PROMPT_VERSION = 3  # bump whenever the agent prompt template changes
+
+STAGE_DESCRIPTIONS = {
+    'alpha': "Merged to dev (alpha environment)",
+    'staging': "Promoted to staging",
+    'production': "Released to production (main)",
+}
+
+
+def build_repo_request(repo_name, monday, sunday, commits=None, budget=CHUNK_CHAR_BUDGET,
+                       backend_name='local', reuse=True, store_path=STORE_PATH):
+    """Prepare the agent request for a single repository.
+
+    `commits` can pass the repo's already-parsed commit records; otherwise
+    they are read from the commit store at `store_path` (or the repo's
+    commit file).
+
+    The commits are split on commit boundaries into chunks of at most
+    `budget` characters, one agent request each. Returns None when there is
+    nothing to analyze. The request carries the chunk requests, the analysis
+    computed from local metrics and, when `reuse` is set and the ref tips,
+    week, prompt version, budget and backend are unchanged since the last
+    run, the previous analysis as 'reuse'.
+    """
 
     repo_file = repo_name.replace('/', '_')
     input_file = f"{COMMIT_DIR}/{repo_file}.txt"
     output_file = f"{AGENT_OUTPUT_DIR}/{repo_file}_analysis.json"
+    records_file = f"{COMMIT_DIR}/{repo_file}.ndjson"
+    branch_file = f"{COMMIT_DIR}/{repo_file}.branches.json"
+    stage_file = f"{COMMIT_DIR}/{repo_file}.stages.json"
 
     if not Path(input_file).exists():
         print(f"⚠️  {repo_name}: No commit file found, skipping")
         return None
 
-    # Read commit data
-    with open(input_file, 'r') as f:
-        commit_data = f.read()
-
-    if '=== NO ACTIVITY THIS WEEK ===' in commit_data:
+    # Unchanged ref tips over the same week, analyzed the same way: reuse the
+    # previous analysis
+    collected = load_fingerprints(f"{COMMIT_DIR}/{FINGERPRINT_FILE}").get(repo_name)
+    if collected:
+        collected = dict(collected, prompt_version=PROMPT_VERSION, budget=budget, backend=backend_name)
+    previous = load_previous_analysis(output_file) if reuse else None
+    if previous and same_analysis_inputs(collected, previous.get('fingerprint')):
+        return {'repo': repo_name, 'reuse': previous}
+
+    # Repo and branch context from the file header is repeated in every chunk
+    header, no_activity = read_commit_header(input_file)
+    if no_activity:
         print(f"⏭️  {repo_name}: No activity this week")
         return None
 
-    # Check for feature branch → dev merges (Alpha deployments)
-    alpha_deployments = detect_alpha_deployments(commit_data)
+    if commits is None:
+        commits = week_commits(monday, sunday, repo_name, path=store_path, dump_file=input_file, records_file=records_file)
+
+    # Deployments come from the collector's stage map; commit files collected
+    # without one fall back to scanning merge subjects
+    stage_map = load_stage_map(stage_file)
+
+    # Single pass over the commits: split them into budgeted chunks and take
+    # each chunk's count and authors
+    chunks = []
+    for commit_data, chunk in chunk_commits(commits, budget):
+        authors = []
+        alpha_deployments = []
+        for commit in chunk:
+            if commit['author'] not in authors:
+                authors.append(commit['author'])
+
+            if stage_map is None:
+                deployment = detect_alpha_deployment(commit)
+                if deployment:
+                    alpha_deployments.append(deployment)
+
+        chunks.append((commit_data, len(chunk), authors, alpha_deployments))
+
+    if not chunks:
+        chunks.append(('', 0, [], []))
+
+    # Branch activity indexed by the collector
+    branch_index = load_branch_index(branch_file) or {'branches': {}, 'refnames': {}}
+    branches = feature_branches(branch_index)
+
+    promotions = {}
+    if stage_map is not None:
+        promotions = {stage: stage_deployments(stage_map, stage) for stage in STAGE_DESCRIPTIONS}
+        repo_alpha = promotions.pop('alpha')
+        promotions = {stage: deps for stage, deps in promotions.items() if deps}
+
+    # Metrics known without the agent; the agent fills in the narrative
+    chunk_requests = []
+    for idx, (commit_data, commit_count, authors, alpha_deployments) in enumerate(chunks, 1):
+        prompt_alpha = alpha_deployments
+        if stage_map is not None:
+            # Repo-wide: every prompt sees them, the first chunk reports them
+            prompt_alpha = repo_alpha
+            alpha_deployments = repo_alpha if idx == 1 else []
+
+        chunk_requests.append({
+            'repo': repo_name,
+            'key': f"{repo_name}#{idx}",
+            'prompt': render_prompt(
+                repo_name, monday, sunday, header + commit_data, prompt_alpha, idx, len(chunks), promotions
+            ),
+            'analysis': {
+                "repo": repo_name,
+                "health": "🟢",
+                "total_commits": commit_count,
+                "active_branches": len(branch_index['branches']),
+                "authors": authors,
+                "initiatives": [],
+                "alpha_deployments": alpha_deployments,
+                "bugs_fixed": [],
+                "infrastructure": [],
+                # Repo-wide, so only reported once
+                "feature_branches": branches if idx == 1 else [],
+                "promotions": promotions if idx == 1 else {}
+            }
+        })
+
+    analysis = merge_analyses([chunk['analysis'] for chunk in chunk_requests])
+    analysis['fingerprint'] = collected
+
+    return {
+        'repo': repo_name,
+        'monday': monday,
+        'sunday': sunday,
+        'chunks': chunk_requests,
+        'analysis': analysis,
+        'output_file': output_file,
+        'data_digest': commit_file_digest(input_file),
+        'budget': budget
+    }
+
+
+def same_analysis_inputs(record, previous):
+    """True if the ref tips and week match and the analysis was made the same way."""
+    return same_inputs(record, previous) and all(
+        record.get(k) == previous.get(k) for k in ('prompt_version', 'budget', 'backend')
+    )
 
-    print(f"🤖 Spawning agent for: {repo_name}")
 
-    agent_prompt = f"""
-Analyze the commits for {repo_name} from {monday} to {sunday}.
+def read_commit_header(input_file):
+    """Return (header text, no_activity) from the top of a repo's commit file."""
+    lines = []
+    with open(input_file, 'r', errors='replace') as f:
+        for line in f:
+            if line.startswith('COMMIT_START'):
+                break
+            if '=== NO ACTIVITY THIS WEEK ===' in line:
+                return ''.join(lines), True
+            lines.append(line)
+    return ''.join(lines), False
+
+
+def render_prompt(repo_name, monday, sunday, commit_data, alpha_deployments, part=1, parts=1, promotions=None):
+    """Build the agent prompt for one chunk of a repo's commits."""
+
+    promoted = [
+        f"- {STAGE_DESCRIPTIONS[stage]}: {dep['feature']} ({dep['date']})"
+        for stage, deps in (promotions or {}).items() for dep in deps
+    ]
+
+    part_note = ""
+    if parts > 1:
+        part_note = (
+            f"\nThis is part {part} of {parts}: it holds a disjoint slice of the week's commits. "
+            "Report counts for this slice only; the parts are merged afterwards."
+        )
+
+    return f"""
+Analyze the commits for {repo_name} from {monday} to {sunday}.{part_note}
 
 # Commit Data
-{commit_data[:15000]}  # Truncate if too long
+{commit_data}
 
 # Your Task
 
@@ -73,6 +219,8 @@ Analyze these commits and generate a structured summary focused on BUSINESS VALU
 
 {"✅ ALPHA DEPLOYMENTS DETECTED:" if alpha_deployments else ""}
 {chr(10).join(f"- {dep}" for dep in alpha_deployments) if alpha_deployments else ""}
+{"✅ STAGING / PRODUCTION PROMOTIONS DETECTED:" if promoted else ""}
+{chr(10).join(promoted)}
 
 ## Output Requirements
 
@@ -157,80 +305,119 @@ Generate a JSON object with this structure:
 IMPORTANT: Output ONLY valid JSON. No markdown formatting, no explanations outside the JSON.
 """
 
-    # TODO: Actually spawn the agent using Task tool
-    # For now, we'll create a placeholder analysis
-
-    # Parse commits to extract basic metrics
-    commits = commit_data.count('COMMIT_START')
-    authors = set()
-
-    for line in commit_data.split('\n'):
-        if '|' in line and 'COMMIT_START' not in line:
-            parts = line.split('|')
-            if len(parts) >= 2:
-                authors.add(parts[1].strip())
-
-    # Create basic analysis (will be replaced by actual agent output)
-    analysis = {
-        "repo": repo_name,
-        "health": "🟢",
-        "total_commits": commits,
-        "active_branches": len([l for l in commit_data.split('\n') if 'refs/heads/' in l]),
-        "authors": list(authors),
-        "initiatives": [],
-        "alpha_deployments": alpha_deployments,
-        "bugs_fixed": [],
-        "infrastructure": [],
-        "feature_branches": []
-    }
 
-    # Save analysis
+def write_analysis(output_file, analysis):
     os.makedirs(AGENT_OUTPUT_DIR, exist_ok=True)
     with open(output_file, 'w') as f:
         json.dump(analysis, f, indent=2)
 
-    print(f"✅ {repo_name}: Analysis complete ({commits} commits)")
+
+def save_analysis(request, result=None, error=None, cache=None):
+    """Merge an agent result over the request's metrics and save it.
+
+    With an error (some or all agent calls failed), whatever was analyzed is
+    saved as partial and without a fingerprint, so the next run retries the
+    repo. Only complete analyses go into the cache.
+    """
+    analysis = dict(request['analysis'])
+    if result:
+        analysis.update(result)
+        # Metrics come from the commits, not from the agent
+        for key in ('repo', 'total_commits', 'fingerprint'):
+            analysis[key] = request['analysis'][key]
+    if error is not None:
+        analysis['partial'] = True
+        analysis['error'] = error
+        analysis['fingerprint'] = None
+
+    write_analysis(request['output_file'], analysis)
+    if error is None and cache is not None and request.get('cache_key'):
+        cache.put(request['cache_key'], analysis)
 
     return analysis
 
 
-def detect_alpha_deployments(commit_data):
+def spawn_repo_agent(repo_name, monday, sunday, commits=None, backend=None, cache=None):
+    """Analyze a single repository with an agent backend (local by default)."""
+    backend = backend or make_backend()
+    analyses = run_agents(
+        [build_repo_request(repo_name, monday, sunday, commits, backend_name=backend.name, reuse=cache is not None)],
+        backend, cache
+    )
+    return analyses[0] if analyses else None
+
+
+def load_previous_analysis(output_file):
+    """Load a repo's previous analysis, or None if missing or unreadable."""
+    try:
+        with open(output_file, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def stage_deployments(stage_map, stage):
+    """Deployment entries for one stage of a collector stage map."""
+    return [
+        {
+            "feature": promotion['branch'],
+            "description": STAGE_DESCRIPTIONS[stage],
+            "date": promotion['date']
+        }
+        for promotion in stage_map['stages'].get(stage, [])
+    ]
+
+
+def detect_alpha_deployment(commit):
+    """Detect a feature branch merge to dev (alpha deployment) from one commit.
+
+    Subject scanning is only the fallback for commit files collected
+    without a stage map.
+    """
+
+    subject = commit['subject']
+
+    # Detect merge to dev
+    if 'merge' in subject.lower() and 'dev' in subject.lower():
+        # Extract feature branch name
+        if 'feature/' in subject.lower() or 'fix/' in subject.lower():
+            # Parse branch name from merge message
+            feature = subject.split("'")[1] if "'" in subject else subject
+
+            return {
+                "feature": feature,
+                "description": f"Merged to dev (alpha environment)",
+                "date": commit['date'][:10]  # YYYY-MM-DD
+            }
+
+    return None
+
+
+def detect_alpha_deployments(commits):
     """Detect feature branch merges to dev (alpha deployments)."""
 
     deployments = []
 
-    # Look for merge commits to dev
-    lines = commit_data.split('\n')
-
-    for i, line in enumerate(lines):
-        if 'COMMIT_START' in line and i + 1 < len(lines):
-            # Get commit message
-            commit_line = lines[i + 1]
-
-            if '|' in commit_line:
-                parts = commit_line.split('|')
-                if len(parts) >= 5:
-                    date = parts[3].strip()[:10]  # YYYY-MM-DD
-                    subject = '|'.join(parts[4:]).strip()
-
-                    # Detect merge to dev
-                    if 'merge' in subject.lower() and 'dev' in subject.lower():
-                        # Extract feature branch name
-                        if 'feature/' in subject.lower() or 'fix/' in subject.lower():
-                            # Parse branch name from merge message
-                            feature = subject.split("'")[1] if "'" in subject else subject
-
-                            deployments.append({
-                                "feature": feature,
-                                "description": f"Merged to dev (alpha environment)",
-                                "date": date
-                            })
+    for commit in commits:
+        deployment = detect_alpha_deployment(commit)
+        if deployment:
+            deployments.append(deployment)
 
     return deployments
 
 
-def aggregate_reports(all_analyses, monday, sunday):
+def aggregate_reports(all_analyses, monday, sunday, repos=None):
     """Aggregate all repo analyses into final business summary."""
+    out = io.StringIO()
+    write_aggregate_report(all_analyses, monday, sunday, out, repos)
+    return out.getvalue()
+
+
+def write_aggregate_report(all_analyses, monday, sunday, out, repos=None):
+    """Stream the business summary aggregated from all repo analyses into `out`.
+
+    `repos` is the list of repositories the analyses cover, REPOS by default.
+    """
 
     # Calculate totals
     total_commits = sum(a['total_commits'] for a in all_analyses if a)
@@ -254,7 +441,7 @@ def aggregate_reports(all_analyses, monday, sunday):
                 all_alpha.append(dep)
 
     # Generate business summary
-    report = f"""# Weekly Engineering Update
+    out.write(f"""# Weekly Engineering Update
 ## {monday} to {sunday}
 
 ---
@@ -263,7 +450,7 @@ def aggregate_reports(all_analyses, monday, sunday):
 
 **Team**: {', '.join(sorted(all_authors))} • **Velocity**: {total_commits} changes shipped
 
-**Active Components**: {len([a for a in all_analyses if a])}/12 repositories with updates
+**Active Components**: {len([a for a in all_analyses if a])}/{len(repos or REPOS)} repositories with updates
 
 {"**🚀 Alpha Deployments This Week**: " + str(len(all_alpha)) + " features deployed to alpha environment" if all_alpha else ""}
 
@@ -273,7 +460,7 @@ def aggregate_reports(all_analyses, monday, sunday):
 
 | Component | Status | This Week |
 |-----------|--------|-----------|
-"""
+""")
 
     # Component status
     for analysis in all_analyses:
@@ -283,17 +470,29 @@ def aggregate_reports(all_analyses, monday, sunday):
             commits = analysis['total_commits']
             branches = analysis.get('active_branches', 0)
 
-            report += f"| {repo} | {health} | {commits} commits, {branches} active branches |\n"
+            out.write(f"| {repo} | {health} | {commits} commits, {branches} active branches |\n")
 
     # Alpha deployments section
     if all_alpha:
-        report += "\n---\n\n## 🚀 Alpha Deployments (Features in Testing)\n\n"
+        out.write("\n---\n\n## 🚀 Alpha Deployments (Features in Testing)\n\n")
         for dep in all_alpha:
-            report += f"### {dep['feature']}\n"
-            report += f"**Repo**: {dep['repo']} • **Date**: {dep['date']}\n"
-            report += f"**Status**: Deployed to alpha environment (dev branch)\n\n"
-
-    report += "\n---\n\n## ✨ Highlights: Top Initiatives\n\n"
+            out.write(f"### {dep['feature']}\n")
+            out.write(f"**Repo**: {dep['repo']} • **Date**: {dep['date']}\n")
+            out.write(f"**Status**: Deployed to alpha environment (dev branch)\n\n")
+
+    # Staging and production promotions from the collector's stage maps
+    promotions = [
+        (analysis['repo'], dep)
+        for analysis in all_analyses if analysis
+        for stage in ('staging', 'production')
+        for dep in analysis.get('promotions', {}).get(stage, [])
+    ]
+    if promotions:
+        out.write("\n---\n\n## 🚢 Staging & Production Promotions\n\n")
+        for repo, dep in promotions:
+            out.write(f"- **{repo}**: {dep['feature']} — {dep['description']} ({dep['date']})\n")
+
+    out.write("\n---\n\n## ✨ Highlights: Top Initiatives\n\n")
 
     # Aggregate and rank initiatives by commit count
     if all_initiatives:
@@ -306,18 +505,151 @@ def aggregate_reports(all_analyses, monday, sunday):
             impact = init.get('impact', '')
             commits = init.get('commits', 0)
 
-            report += f"{idx}. **{name}** ({commits} commits)\n"
-            report += f"   - {impact}\n\n"
+            out.write(f"{idx}. **{name}** ({commits} commits)\n")
+            out.write(f"   - {impact}\n\n")
     else:
-        report += "_No major initiatives identified_\n\n"
+        out.write("_No major initiatives identified_\n\n")
+
+    out.write("\n---\n\n## 🔗 Platform Health\n\n")
+    out.write(f"- **Monitoring**: Live status at [status.alien.club](https://status.alien.club)\n")
+    out.write(f"- **Alpha Environment**: {len(all_alpha)} features deployed this week\n")
+
+    out.write(f"\n---\n\n*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n")
+
+
+def run_agents(requests, backend, cache=None, history=None, **options):
+    """Dispatch agent requests and return every analysis, partial ones included.
+
+    Every chunk of every repo is dispatched as its own agent call; once a
+    repo's chunks are all back, their analyses are merged in chunk order.
+    With a cache, requests whose commit data, prompt version, date range,
+    chunk budget and backend match a cached analysis skip the agents. With a
+    DurationHistory, agent calls run longest-expected-first and the
+    predicted and actual makespans are printed.
+    """
+    analyses = []
+    pending = {}  # repo -> request
+    chunk_repo = {}  # chunk key -> (repo, chunk index)
+    chunk_results = {}  # repo -> [analysis or None per chunk]
+    chunk_errors = {}  # repo -> [error]
+
+    for request in requests:
+        if request is None:
+            continue
+        if 'reuse' in request:
+            print(f"♻️  {request['repo']}: Unchanged since last run, reusing analysis")
+            analyses.append(request['reuse'])
+            continue
+
+        if cache is not None:
+            request['cache_key'] = analysis_key(
+                request['data_digest'], PROMPT_VERSION, request['monday'], request['sunday'],
+                request['budget'], backend.name
+            )
+            cached = cache.get(request['cache_key'])
+            if cached is not None:
+                cached['fingerprint'] = request['analysis']['fingerprint']
+                write_analysis(request['output_file'], cached)
+                print(f"💾 {request['repo']}: Commit data unchanged, using cached analysis")
+                analyses.append(cached)
+                continue
+
+        repo = request['repo']
+        chunks = request['chunks']
+        print(f"🤖 Spawning agent for: {repo}" + (f" ({len(chunks)} chunks)" if len(chunks) > 1 else ""))
+        pending[repo] = request
+        chunk_results[repo] = [None] * len(chunks)
+        chunk_errors[repo] = []
+        for idx, chunk in enumerate(chunks):
+            chunk_repo[chunk['key']] = (repo, idx)
+
+    def on_done(key, result, error):
+        repo, idx = chunk_repo[key]
+        chunk_results[repo][idx] = result
+        if error is not None:
+            chunk_errors[repo].append(f"{key}: {error}" if len(chunk_results[repo]) > 1 else error)
+
+        done = sum(1 for r in chunk_results[repo] if r is not None) + len(chunk_errors[repo])
+        if done < len(chunk_results[repo]):
+            return
+
+        # Reduce: merge whichever chunks succeeded, in chunk order
+        request = pending[repo]
+        parts = [r for r in chunk_results[repo] if r is not None]
+        merged = merge_analyses(parts) if parts else None
+        errors = chunk_errors[repo]
+        analyses.append(save_analysis(request, merged, '; '.join(errors) if errors else None, cache))
+
+        if not errors:
+            print(f"✅ {repo}: Analysis complete ({request['analysis']['total_commits']} commits)")
+        else:
+            print(f"❌ {repo}: {len(errors)}/{len(chunk_results[repo])} agent calls failed ({errors[0]}), keeping partial analysis")
+
+    chunk_requests = [chunk for request in pending.values() for chunk in request['chunks']]
+    if chunk_requests:
+        predicted = None
+        if history is not None:
+            predicted = history.makespan(chunk_requests, options.get('concurrency', DEFAULT_CONCURRENCY))
+
+        started = time.monotonic()
+        with span("dispatch agents", agent_calls=len(chunk_requests)):
+            dispatch(chunk_requests, backend, on_done=on_done, history=history, **options)
+        actual = time.monotonic() - started
+
+        if history is not None:
+            history.save()
+            if predicted is None:
+                print(f"\n⏱️  Makespan: {actual:.1f}s (no duration history yet)")
+            else:
+                print(f"\n⏱️  Makespan: predicted {predicted:.1f}s, actual {actual:.1f}s")
+
+    return analyses
 
-    report += "\n---\n\n## 🔗 Platform Health\n\n"
-    report += f"- **Monitoring**: Live status at [status.alien.club](https://status.alien.club)\n"
-    report += f"- **Alpha Environment**: {len(all_alpha)} features deployed this week\n"
 
-    report += f"\n---\n\n*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n"
+def prepare_request(repo, monday, sunday, commits, budget, backend_name, reuse, store_path=STORE_PATH):
+    """Build one repo's request, or print the error and return None.
+
+    Runs in a worker process when prompts are prepared with `jobs`.
+    """
+    try:
+        with span(f"prepare {repo}", 'prepare'):
+            return build_repo_request(repo, monday, sunday, commits, budget, backend_name, reuse, store_path)
+    except Exception as e:
+        print(f"❌ {repo}: Error - {e}")
+        return None
 
-    return report
+
+def analyze_repos(monday, sunday, commits_by_repo=None, backend=None, cache=None,
+                  budget=CHUNK_CHAR_BUDGET, jobs=1, store_path=STORE_PATH, **options):
+    """Analyze every repository concurrently and return the analyses.
+
+    `commits_by_repo` maps repo names to already-parsed commit records,
+    for callers that keep the week's commits in memory. Without it, each
+    repo's commits are loaded and its prompts built on a pool of `jobs`
+    processes when `jobs` > 1. `cache` is an optional AnalysisCache;
+    without one, previous analyses are not reused either and every repo
+    goes to the agents. `budget` is the prompt chunk size in characters.
+    `options` are passed to the dispatcher (concurrency, deadline, retries,
+    backoff).
+    """
+    backend = backend or make_backend()
+    tasks = [
+        (repo, monday, sunday, commits_by_repo.get(repo, []) if commits_by_repo is not None else None,
+         budget, backend.name, cache is not None, store_path)
+        for repo in REPOS
+    ]
+    with span("prepare prompts"):
+        if jobs > 1 and commits_by_repo is None:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                requests = list(executor.map(prepare_request, *zip(*tasks)))
+        else:
+            requests = [prepare_request(*task) for task in tasks]
+
+    analyses = run_agents(requests, backend, cache, **options)
+    if cache is not None:
+        print(f"\n💾 Analysis cache: {cache.summary()}")
+
+    return analyses
 
 
 def load_agent_results():
@@ -342,14 +674,54 @@ def load_agent_results():
     return analyses
 
 
-def main():
-    if len(sys.argv) < 3:
-        print("Usage: python3 orchestrate_summary.py YYYY-MM-DD YYYY-MM-DD [--aggregate-only]")
-        sys.exit(1)
+def add_agent_arguments(parser):
+    """Add the agent dispatch options to an argparse parser."""
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="local", help="Agent backend")
+    parser.add_argument("--agent-command", help="Command backend: agent command reading the prompt on stdin")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Agents run at once")
+    parser.add_argument("--agent-timeout", type=float, default=DEFAULT_DEADLINE, help="Per-repo agent deadline in seconds, shared by the repo's chunks from when the first one starts")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Retries per agent call after a failed attempt")
+    parser.add_argument("--chunk-budget", type=int, default=CHUNK_CHAR_BUDGET, help="Characters of commit data per agent call")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="Analysis cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="Always run the agents")
+    parser.add_argument("--history-file", default=HISTORY_FILE, help="Per-repo agent durations used for scheduling")
+
+
+def agent_options(args):
+    """Return (backend, analyze_repos options) from parsed agent arguments."""
+    backend = make_backend(args.backend, args.agent_command)
+    options = {
+        'cache': None if args.no_cache else AnalysisCache(args.cache_dir),
+        'budget': args.chunk_budget,
+        'history': DurationHistory(args.history_file, backend.name),
+        'concurrency': args.concurrency,
+        'deadline': args.agent_timeout,
+        'retries': args.retries
+    }
+    return backend, options
 
-    monday = sys.argv[1]
-    sunday = sys.argv[2]
-    aggregate_only = "--aggregate-only" in sys.argv
+
+def main():
+    parser = argparse.ArgumentParser(description="Orchestrate the AI-powered weekly summary.")
+    parser.add_argument("monday", help="YYYY-MM-DD")
+    parser.add_argument("sunday", help="YYYY-MM-DD")
+    parser.add_argument("--aggregate-only", action="store_true", help="Aggregate existing agent results")
+    add_agent_arguments(parser)
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+
+    start_trace(args.trace_file, args.profile)
+    try:
+        orchestrate(args)
+    finally:
+        finish_trace()
+
+
+def orchestrate(args):
+    """Analyze (or load) the repo analyses and write the aggregated summary."""
+    monday = args.monday
+    sunday = args.sunday
+    aggregate_only = args.aggregate_only
 
     print(f"🚀 Orchestrating weekly summary: {monday} to {sunday}\n")
 
@@ -363,38 +735,25 @@ def main():
     else:
         # Phase 1: Spawn agents in parallel
         print("📊 Phase 1: Spawning AI agents for repo analysis...\n")
-        print("⚠️  NOTE: This is placeholder mode. When run via /weekly_summary,")
-        print("    Claude will spawn real Explore agents using the Task tool.\n")
+        backend, options = agent_options(args)
+        if backend.name == 'local':
+            print("⚠️  NOTE: This is placeholder mode. When run via /weekly_summary,")
+            print("    Claude will spawn real Explore agents using the Task tool.\n")
 
-        with ThreadPoolExecutor(max_workers=6) as executor:
-            futures = {
-                executor.submit(spawn_repo_agent, repo, monday, sunday): repo
-                for repo in REPOS
-            }
-
-            for future in as_completed(futures):
-                repo = futures[future]
-                try:
-                    result = future.result()
-                    if result:
-                        analyses.append(result)
-                except Exception as e:
-                    print(f"❌ {repo}: Error - {e}")
+        with span("analyze"):
+            analyses = analyze_repos(monday, sunday, backend=backend, **options)
 
         print(f"\n✅ Phase 1 complete: {len(analyses)} repos analyzed\n")
 
     # Phase 2: Aggregate results
     print("📝 Phase 2: Aggregating results into business summary...\n")
 
-    business_report = aggregate_reports(analyses, monday, sunday)
-
-    # Save report
-    output_dir = "ai_docs/weekly-summaries"
-    os.makedirs(output_dir, exist_ok=True)
+    # Save report, streamed straight into the file
+    os.makedirs(REPORT_DIR, exist_ok=True)
 
-    output_file = f"{output_dir}/{monday}-business-summary.md"
-    with open(output_file, 'w') as f:
-        f.write(business_report)
+    output_file = f"{REPORT_DIR}/{monday}-business-summary.md"
+    with span("aggregate report"), open(output_file, 'w') as f:
+        write_aggregate_report(analyses, monday, sunday, f)
 
     print(f"✅ Business summary saved to: {output_file}\n")
 
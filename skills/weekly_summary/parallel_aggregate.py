@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Parse and pre-aggregate the per-repo commit files on a process pool.
+
+Parsing and aggregation are pure-Python string work, so threads serialize
+on the GIL. Here each repo is one task on a ProcessPoolExecutor: the
+worker loads the repo's week from the commit store (or its NDJSON / text
+file when it was never stored), aggregates it, and sends back only the
+repo's `Rollup`. A repo with none of these is skipped, as it is by the
+serial path. The parent merges the rollups in REPOS order.
+
+Because commits are grouped by repo before merging, contributors and
+commit types are listed in first-seen order per repo (REPOS order), not
+across the whole week.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from config import REPOS
+from commit_store import STORE_PATH, week_commits
+from commit_table import CommitTable
+from collect_commits import repo_output_file, records_file
+from aggregation import aggregate, merge_rollups
+
+DEFAULT_JOBS = os.cpu_count() or 1
+
+
+def repo_rollup(repo, monday, sunday, store_path=STORE_PATH):
+    """Load and aggregate one repo's week. Runs in a worker process.
+
+    Only the repo's own files are read, never the combined dump.
+    """
+    dump_file = repo_output_file(repo)
+    if not os.path.exists(dump_file):
+        dump_file = None
+    commits = week_commits(monday, sunday, repo, path=store_path, dump_file=dump_file, records_file=records_file(repo))
+    return aggregate(CommitTable.from_commits(commits))
+
+
+def parallel_rollup(monday, sunday, store_path=STORE_PATH, jobs=DEFAULT_JOBS, repos=REPOS):
+    """Aggregate every repo's week on `jobs` processes and merge the results."""
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(repo_rollup, repo, monday, sunday, store_path) for repo in repos]
+        return merge_rollups(future.result() for future in futures)
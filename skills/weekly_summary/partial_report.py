@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Partial reports: one workspace's week, small enough to ship and merge.
+
+A partial file holds a workspace's `Rollup` (see aggregation) and its repo
+analyses as JSON, but no raw commits. `weekly.py partial` writes one per
+workspace; this script merges any number of them and renders the
+technical, business and orchestrated reports of the combined week:
+
+  python3 partial_report.py team-a.json team-b.json [--output merged.json]
+
+Merging is associative, so partials can be merged in stages (per team,
+then per org). Workspaces are combined in the order given and are
+expected to cover different repositories: a repo in two partials is
+counted twice.
+"""
+
+import os
+import json
+import argparse
+import platform
+
+from config import REPOS, REPORT_DIR
+from aggregation import Rollup
+from renderers import write_reports
+
+PARTIAL_VERSION = 1
+
+
+def make_partial(monday, sunday, rollup, analyses, repos=REPOS, workspace=None):
+    """Return the partial for one workspace's rollup and repo analyses."""
+    data = rollup.to_dict()
+    data['tracked_repos'] = list(rollup.tracked_repos or repos)
+    return {
+        'version': PARTIAL_VERSION,
+        'monday': monday,
+        'sunday': sunday,
+        'workspaces': [workspace or platform.node()],
+        'rollup': data,
+        'analyses': analyses,
+    }
+
+
+def merge_partials(partials):
+    """Merge partials of the same week, in order, into a new partial."""
+    partials = list(partials)
+    if not partials:
+        raise ValueError("No partial reports to merge")
+
+    first = partials[0]
+    rollup = Rollup()
+    merged = {
+        'version': PARTIAL_VERSION,
+        'monday': first['monday'],
+        'sunday': first['sunday'],
+        'workspaces': [],
+        'rollup': None,
+        'analyses': [],
+    }
+    for partial in partials:
+        if partial.get('version') != PARTIAL_VERSION:
+            raise ValueError(f"Unsupported partial report version: {partial.get('version')}")
+        if (partial['monday'], partial['sunday']) != (first['monday'], first['sunday']):
+            raise ValueError(
+                f"Partial for {partial['monday']} to {partial['sunday']} does not match "
+                f"{first['monday']} to {first['sunday']}"
+            )
+        rollup.merge(Rollup.from_dict(partial['rollup']))
+        merged['workspaces'].extend(partial['workspaces'])
+        merged['analyses'].extend(partial['analyses'])
+
+    merged['rollup'] = rollup.to_dict()
+    return merged
+
+
+def save_partial(partial, path):
+    """Write a partial report file."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(partial, f)
+
+
+def load_partial(path):
+    """Load a partial report file."""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def write_partial_reports(partial, report_dir=REPORT_DIR):
+    """Render every report for a (merged) partial and return the paths written."""
+    return write_reports(
+        report_dir, partial['monday'], partial['sunday'],
+        Rollup.from_dict(partial['rollup']), partial['analyses']
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge partial weekly reports from several workspaces.")
+    parser.add_argument("partials", nargs='+', help="Partial report files written by `weekly.py partial`")
+    parser.add_argument("--output", help="Also save the merged partial to this file")
+    parser.add_argument("--report-dir", default=REPORT_DIR, help="Directory the reports are written to")
+    args = parser.parse_args()
+
+    print(f"🧩 Merging {len(args.partials)} partial reports...")
+    merged = merge_partials(load_partial(path) for path in args.partials)
+    rollup = merged['rollup']
+    print(f"   {rollup['total_commits']} commits across {len(rollup['repos'])} repositories "
+          f"from {', '.join(merged['workspaces'])}\n")
+
+    if args.output:
+        save_partial(merged, args.output)
+        print(f"✅ Merged partial saved to {args.output}")
+
+    for output_file in write_partial_reports(merged, args.report_dir):
+        print(f"✅ Report saved to {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Patch-id index: one logical change per set of equivalent commits.
+
+Rebased and cherry-picked commits carry a new hash but the same diff, so
+`git patch-id --stable` gives them the same patch id. The collector
+computes patch ids in bulk, in a single `git diff-tree --stdin -p | git
+patch-id --stable` pipeline per repo, and stores them with the commits.
+The store then yields one representative per patch id: the earliest
+commit, which is the original change. This index records every hash of a
+collapsed change and the branches it appears on.
+"""
+
+import json
+
+
+def parse_patch_ids(output):
+    """Parse `git patch-id` output into {commit hash: patch id}."""
+    patch_ids = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            patch_id, commit = parts
+            patch_ids[commit] = patch_id
+    return patch_ids
+
+
+def build_patch_index(groups, branch_index):
+    """Describe each collapsed change.
+
+    `groups` maps a representative hash to [(hash, patch id)] for every
+    equivalent commit (see CommitStore.duplicate_groups); `branch_index` is
+    the repo's branch index. Returns {representative: {'patch_id',
+    'hashes', 'branches'}}.
+    """
+    commit_branches = {}
+    for short, commits in branch_index['branches'].items():
+        for commit in commits:
+            commit_branches.setdefault(commit, []).append(short)
+
+    index = {}
+    for representative, members in groups.items():
+        branches = []
+        for commit, _ in members:
+            for short in commit_branches.get(commit, []):
+                if short not in branches:
+                    branches.append(short)
+        index[representative] = {
+            'patch_id': members[0][1],
+            'hashes': [commit for commit, _ in members],
+            'branches': sorted(branches)
+        }
+    return index
+
+
+def duplicate_count(index):
+    """Number of commits folded into another one."""
+    return sum(len(change['hashes']) - 1 for change in index.values())
+
+
+def save_patch_index(index, path):
+    """Write the index next to the repo's commit file."""
+    with open(path, 'w') as f:
+        json.dump(index, f, indent=2)
+
+
+def load_patch_index(path):
+    """Load a saved index, or None if the collector did not write one."""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
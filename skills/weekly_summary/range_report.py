@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Multi-week retrospectives from a single collection and parse.
+
+The commit table buckets every commit into the ISO week of its committer
+date while it is loaded, the same date the week windows select on, so each
+week's Rollup is aggregated over that week's rows only.
+The span-wide rollup report is rendered next to the per-week reports.
+"""
+
+from datetime import date, datetime
+
+from aggregation import aggregate
+from branch_index import window_bounds
+
+
+def week_bounds(week):
+    """Return (monday, sunday) as YYYY-MM-DD for an ISO week key 'YYYY-Www'."""
+    year, number = week.split('-W')
+    monday = date.fromisocalendar(int(year), int(number), 1)
+    sunday = date.fromisocalendar(int(year), int(number), 7)
+    return monday.isoformat(), sunday.isoformat()
+
+
+def weekly_rollups(table, start=None, end=None):
+    """Aggregate each ISO week present in the table, oldest week first.
+
+    Returns [(week, monday, sunday, rollup)]. Weeks outside [start, end]
+    (YYYY-MM-DD) are skipped, and the first and last weeks are cut to the
+    range, rows included: a table loaded wider than the range only counts
+    the commits committed inside it. Commits whose date could not be parsed
+    are left out of the per-week reports but kept in the span rollup.
+    """
+    weeks = []
+    for week, rows in sorted(table.group_by('week').items()):
+        if week == 'unknown':
+            continue
+        bounds = week_bounds(week)
+        monday, sunday = bounds
+        if (end is not None and monday > end) or (start is not None and sunday < start):
+            continue
+        monday = max(monday, start) if start else monday
+        sunday = min(sunday, end) if end else sunday
+        if (monday, sunday) != bounds:
+            _, _, since_ts, until_ts = window_bounds(monday, sunday)
+            rows = [row for row in rows if since_ts <= table.committed[row] <= until_ts]
+        weeks.append((week, monday, sunday, aggregate(table, rows)))
+    return weeks
+
+
+def write_range_report(start, end, rollup, weeks, out):
+    """Stream the span-wide rollup report into `out`."""
+
+    total_features = rollup.type_counts.get('feat', 0)
+    total_fixes = rollup.type_counts.get('fix', 0)
+    health_emoji, health_desc = rollup.health()
+
+    out.write(f"""# Engineering Retrospective: {start} to {end}
+
+**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+---
+
+## 📊 Overview
+
+- **Total Commits**: {rollup.total_commits} over {len(weeks)} weeks
+- **Features Shipped**: {total_features}
+- **Issues Resolved**: {total_fixes}
+- **Active Repositories**: {rollup.active_repos}
+- **Contributors**: {', '.join(rollup.authors.keys())}
+- **Health**: {health_emoji} {health_desc}
+
+---
+
+## 📅 Week by Week
+
+| Week | Dates | Commits | Features | Fixes | Top Initiative |
+|------|-------|---------|----------|-------|----------------|
+""")
+
+    for week, monday, sunday, week_rollup in weeks:
+        top_name, top_details = week_rollup.top_initiative()
+        out.write(
+            f"| {week} | {monday} → {sunday} | {week_rollup.total_commits} | "
+            f"{week_rollup.type_counts.get('feat', 0)} | {week_rollup.type_counts.get('fix', 0)} | "
+            f"{top_name} ({top_details['commits']}) |\n"
+        )
+
+    out.write("\n---\n\n## ✨ Top Initiatives\n\n")
+
+    sorted_initiatives = rollup.sorted_initiatives(10)
+    if sorted_initiatives:
+        for idx, (name, details) in enumerate(sorted_initiatives, 1):
+            out.write(f"{idx}. **{name}** ({details['commits']} changes across {len(details['repos'])} components)\n")
+    else:
+        out.write("_No major initiatives identified_\n")
+
+    out.write("\n---\n\n## 🚧 Critical Issues\n\n")
+
+    critical_issues = rollup.critical_issues()
+    if critical_issues:
+        for component, issue in critical_issues[:10]:
+            out.write(f"- **{component}**: {issue}\n")
+        if len(critical_issues) > 10:
+            out.write(f"- _(and {len(critical_issues) - 10} more)_\n")
+    else:
+        out.write("_No critical issues in this period_\n")
+
+    out.write("\n---\n\n## 👥 Contributions by Author\n\n")
+
+    for author, details in sorted(rollup.authors.items(), key=lambda x: x[1]['commits'], reverse=True):
+        out.write(f"- **{author}**: {details['commits']} commits ({details['features']} features, {details['fixes']} fixes)\n")
+
+    out.write(f"\n---\n\n*Per-week technical and business reports are saved next to this file.*\n")
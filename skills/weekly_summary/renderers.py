@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Report renderers that stream into an output sink.
+
+Each renderer writes one report format section by section into any
+file-like `out` (an open file, `io.StringIO`, stdout). New formats plug in
+by subclassing `Renderer` and adding an instance to RENDERERS.
+"""
+
+import os
+
+from technical_report import write_markdown_report
+from business_summary import write_business_summary
+from orchestrate_summary import write_aggregate_report
+
+
+class Renderer:
+    """One report format. `suffix` names the file written next to the others."""
+
+    suffix = None
+
+    def output_file(self, report_dir, monday):
+        return f"{report_dir}/{monday}-{self.suffix}"
+
+    def render(self, out, monday, sunday, rollup=None, analyses=None):
+        raise NotImplementedError
+
+
+class TechnicalMarkdown(Renderer):
+    suffix = "weekly-summary.md"
+
+    def render(self, out, monday, sunday, rollup=None, analyses=None):
+        write_markdown_report(rollup, monday, sunday, out)
+
+
+class BusinessMarkdown(Renderer):
+    suffix = "business-summary.md"
+
+    def render(self, out, monday, sunday, rollup=None, analyses=None):
+        write_business_summary(rollup, monday, sunday, out)
+
+
+class OrchestratedMarkdown(Renderer):
+    suffix = "orchestrated-summary.md"
+
+    def render(self, out, monday, sunday, rollup=None, analyses=None):
+        write_aggregate_report(analyses or [], monday, sunday, out, rollup.tracked_repos if rollup else None)
+
+
+RENDERERS = {
+    'technical': TechnicalMarkdown(),
+    'business': BusinessMarkdown(),
+    'orchestrated': OrchestratedMarkdown(),
+}
+
+
+def write_reports(report_dir, monday, sunday, rollup=None, analyses=None, names=None):
+    """Stream each selected report into its file and return the paths written."""
+    os.makedirs(report_dir, exist_ok=True)
+
+    written = []
+    for name in names or RENDERERS:
+        renderer = RENDERERS[name]
+        output_file = renderer.output_file(report_dir, monday)
+        with open(output_file, 'w') as f:
+            renderer.render(f, monday, sunday, rollup, analyses)
+        written.append(output_file)
+
+    return written
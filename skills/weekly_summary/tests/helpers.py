@@ -0,0 +1,74 @@
+"""Commit records for the tests, shaped like the commit store's rows."""
+
+import os
+import hashlib
+import subprocess
+from datetime import datetime
+
+from commit_parser import commit_type
+
+REPOS = ['web-app', 'data-pipelines', 'workers', 'MCPs/mcp-base']
+AUTHORS = ['Alice', 'Bob', 'Carol']
+SUBJECTS = [
+    'feat(ui): add dialog toggle for jwt auth',
+    'fix: critical crash in qdrant vector search',
+    'fix(api): timeout on webhook event',
+    'perf: reduce memory in pipeline workflow',
+    'docs: describe istio envoy setup',
+    'Merge branch feature/x into dev',
+    'feat: postgres pool for database',
+    'chore: bump deps',
+]
+
+
+def make_commit(repo, author, subject, when, committed=None, body=''):
+    """A commit record; `when` (author date) and `committed` are local datetimes."""
+    committed = committed or when
+    return {
+        'repo': repo,
+        'hash': hashlib.sha1(f"{repo}|{author}|{subject}|{when}".encode()).hexdigest(),
+        'author': author,
+        'email': f"{author.lower()}@example.com",
+        'date': when.astimezone().strftime('%Y-%m-%d %H:%M:%S %z'),
+        'committed_at': int(committed.timestamp()),
+        'subject': subject,
+        'body': body,
+        'type': commit_type(subject),
+    }
+
+
+def sample_commits(count=60):
+    """Deterministic commits over several repos, authors and subjects."""
+    return [
+        make_commit(
+            REPOS[idx * 7 % len(REPOS)], AUTHORS[idx * 5 % len(AUTHORS)], SUBJECTS[idx % len(SUBJECTS)],
+            datetime(2026, 3, 2 + idx % 7, 8 + idx % 12, idx % 60), body=f"body {idx}"
+        )
+        for idx in range(count)
+    ]
+
+
+def by_repo(commits):
+    """The commits regrouped repo by repo, in first-seen repo order."""
+    groups = {}
+    for commit in commits:
+        groups.setdefault(commit['repo'], []).append(commit)
+    return groups
+
+
+def git(repo, *args, when=None):
+    """Run git in `repo` as a fixed identity, with both dates set to `when`."""
+    env = dict(os.environ, GIT_AUTHOR_NAME='Alice', GIT_AUTHOR_EMAIL='alice@example.com',
+               GIT_COMMITTER_NAME='Alice', GIT_COMMITTER_EMAIL='alice@example.com')
+    if when:
+        env.update(GIT_AUTHOR_DATE=when, GIT_COMMITTER_DATE=when)
+    return subprocess.run(["git", *args], cwd=repo, env=env, check=True, capture_output=True, text=True).stdout
+
+
+def commit(repo, name, when, body=None):
+    """Commit a new file `name` as 'feat: add <name>'."""
+    with open(os.path.join(repo, name), 'w') as f:
+        f.write(name)
+    git(repo, 'add', name)
+    message = ['-m', f"feat: add {name}"] + (['-m', body] if body else [])
+    git(repo, 'commit', '-q', *message, when=when)
@@ -0,0 +1,123 @@
+import asyncio
+
+from agent_dispatch import AgentError, AnalysisBackend, DurationHistory, LocalBackend, dispatch
+
+
+class ScriptedBackend(AnalysisBackend):
+    """Sleeps `delays[key]` seconds, failing the first `failures[key]` attempts."""
+
+    def __init__(self, delays=None, failures=None, default=0.0):
+        self.delays = delays or {}
+        self.failures = failures or {}
+        self.default = default
+        self.attempts = {}
+
+    async def analyze(self, request, attempt):
+        key = request.get('key', request['repo'])
+        self.attempts[key] = attempt + 1
+        await asyncio.sleep(self.delays.get(key, self.default))
+        if attempt < self.failures.get(key, 0):
+            raise AgentError(f"failed attempt {attempt + 1}")
+        return {'repo': request['repo'], 'key': key}
+
+
+def request(repo, key=None, size=10):
+    record = {'repo': repo, 'prompt': 'x' * size, 'analysis': {'repo': repo}}
+    if key:
+        record['key'] = key
+    return record
+
+
+def test_queued_repos_get_the_full_deadline():
+    # 20 serial calls take ~1s in total, each far inside its own 0.3s deadline
+    requests = [request(f"repo-{idx}") for idx in range(20)]
+
+    results, failures = dispatch(requests, ScriptedBackend(default=0.05), concurrency=1, deadline=0.3, retries=0)
+
+    assert failures == {}
+    assert len(results) == 20
+
+
+def test_slow_repo_fails_alone():
+    backend = ScriptedBackend({'slow': 1.0}, default=0.01)
+
+    results, failures = dispatch([request('slow'), request('fast')], backend, concurrency=2, deadline=0.2, retries=0)
+
+    assert failures == {'slow': "deadline exceeded"}
+    assert list(results) == ['fast']
+
+
+def test_failed_calls_are_retried():
+    backend = ScriptedBackend(failures={'flaky': 2, 'broken': 5})
+
+    results, failures = dispatch(
+        [request('flaky'), request('broken')], backend, deadline=5, retries=2, backoff=0
+    )
+
+    assert list(results) == ['flaky']
+    assert failures == {'broken': "failed attempt 3"}
+    assert backend.attempts == {'flaky': 3, 'broken': 3}
+
+
+def test_retries_stop_at_the_deadline():
+    backend = ScriptedBackend(failures={'flaky': 100})
+
+    results, failures = dispatch([request('flaky')], backend, deadline=0.3, retries=100, backoff=0.05)
+
+    # The last error is kept, and backoff never sleeps past the deadline
+    assert failures['flaky'] == f"failed attempt {backend.attempts['flaky']}"
+    assert backend.attempts['flaky'] < 100
+
+
+def test_local_backend_fails_chunks_independently():
+    requests = [request('web-app', f"web-app#{idx}") for idx in range(40)]
+
+    results, failures = dispatch(requests, LocalBackend(fail_rate=0.5), deadline=5, retries=0)
+
+    assert results and failures
+    assert len(results) + len(failures) == 40
+
+
+def test_chunks_share_their_repo_budget():
+    # Each chunk fits the deadline on its own, but not the three together
+    requests = [request('web-app', f"web-app#{idx}") for idx in range(3)] + [request('workers')]
+    backend = ScriptedBackend(default=0.15)
+
+    results, failures = dispatch(requests, backend, concurrency=1, deadline=0.35, retries=0)
+
+    assert sorted(results) == ['web-app#0', 'web-app#1', 'workers']
+    assert failures == {'web-app#2': "deadline exceeded"}
+
+
+def test_longest_first_leaves_short_repos_their_deadline(tmp_path):
+    history = DurationHistory(str(tmp_path / 'durations.json'), 'scripted')
+    history.rates.update({f"big-{idx}": 1.0 for idx in range(4)})
+    history.rates.update({f"small-{idx}": 0.1 for idx in range(4)})
+    requests = [request(f"small-{idx}", size=100) for idx in range(4)] + [request(f"big-{idx}", size=200) for idx in range(4)]
+    backend = ScriptedBackend({f"big-{idx}": 0.15 for idx in range(4)}, default=0.05)
+    finished = []
+
+    results, failures = dispatch(requests, backend, concurrency=2, deadline=0.2, retries=0,
+                                 on_done=lambda key, analysis, error: finished.append(key), history=history)
+
+    # The small repos only start after ~0.3s, longer than the deadline itself
+    assert failures == {}
+    assert len(results) == 8
+    assert set(finished[:4]) == {f"big-{idx}" for idx in range(4)}
+
+
+def test_history_orders_and_predicts_longest_first(tmp_path):
+    path = str(tmp_path / 'durations.json')
+    history = DurationHistory(path, 'scripted')
+    assert history.makespan([request('a')], 2) is None
+
+    history.record(request('a', size=1000), 2.0)
+    history.record(request('b', size=1000), 1.0)
+    history.record(request('b', size=1000), 3.0)
+    history.save()
+
+    history = DurationHistory(path, 'scripted')
+    assert history.rates == {'a': 2.0, 'b': 2.0}
+    ordered = history.order([request('a', size=500), request('b', size=2000), request('c', size=1000)])
+    assert [r['repo'] for r in ordered] == ['b', 'c', 'a']
+    assert history.makespan(ordered, 2) == 4.0
@@ -0,0 +1,70 @@
+import json
+
+from aggregation import Rollup, aggregate, merge_rollups
+from commit_table import CommitTable
+from technical_report import generate_markdown_report
+from business_summary import generate_business_summary
+
+from helpers import sample_commits, by_repo
+
+
+def rollup_of(commits):
+    return aggregate(CommitTable.from_commits(commits))
+
+
+def reports(rollup):
+    """Both commit reports, without their generation timestamps."""
+    text = generate_markdown_report(rollup, '2026-03-02', '2026-03-08') + \
+        generate_business_summary(rollup, '2026-03-02', '2026-03-08')
+    return [line for line in text.splitlines() if 'Generated' not in line]
+
+
+def test_merged_repo_rollups_match_single_pass():
+    groups = by_repo(sample_commits())
+    single = rollup_of([commit for commits in groups.values() for commit in commits])
+    merged = merge_rollups(rollup_of(commits) for commits in groups.values())
+
+    assert merged.to_dict() == single.to_dict()
+    assert reports(merged) == reports(single)
+
+
+def test_merge_is_associative():
+    commits = sample_commits(90)
+    a, b, c = (rollup_of(commits[i:i + 30]) for i in (0, 30, 60))
+
+    left = merge_rollups([merge_rollups([a, b]), c])
+    right = merge_rollups([a, merge_rollups([b, c])])
+
+    assert left.to_dict() == right.to_dict()
+    assert left.total_commits == 90
+
+
+def test_merge_leaves_its_inputs_alone():
+    groups = list(by_repo(sample_commits()).values())
+    parts = [rollup_of(commits) for commits in groups]
+    before = [part.to_dict() for part in parts]
+
+    merge_rollups(parts)
+
+    assert [part.to_dict() for part in parts] == before
+
+
+def test_top_lists_are_cut_back_to_their_limits():
+    commits = sample_commits(200)
+    merged = merge_rollups(rollup_of(commits[i:i + 10]) for i in range(0, 200, 10))
+
+    for entry in merged.repos.values():
+        assert all(len(top) <= 10 for top in entry['top'].values())
+    for entry in merged.initiatives.values():
+        assert len(entry['highlights']) <= 3
+
+
+def test_dict_round_trip_through_json():
+    rollup = rollup_of(sample_commits())
+    rollup.tracked_repos = ['web-app', 'workers']
+
+    restored = Rollup.from_dict(json.loads(json.dumps(rollup.to_dict())))
+
+    assert restored.to_dict() == rollup.to_dict()
+    assert all(isinstance(entry['repos'], set) for entry in restored.initiatives.values())
+    assert reports(restored) == reports(rollup)
@@ -0,0 +1,50 @@
+import os
+
+from analysis_cache import AnalysisCache, commit_file_digest
+
+ANALYSIS = {'repo': 'web-app', 'summary': 'x' * 100}
+
+
+def age(cache, key, seconds_ago):
+    stamp = os.path.getmtime(cache._path(key)) - seconds_ago
+    os.utime(cache._path(key), (stamp, stamp))
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    entry = len(str(ANALYSIS).encode())
+    cache = AnalysisCache(tmp_path, max_bytes=3 * entry + 20)
+    for idx, key in enumerate(['a', 'b', 'c']):
+        cache.put(key, ANALYSIS)
+        age(cache, key, 100 - idx)
+
+    assert cache.get('a') == ANALYSIS  # now the most recently used
+    cache.put('d', ANALYSIS)
+
+    assert sorted(path.stem for path in tmp_path.glob('*.json')) == ['a', 'c', 'd']
+    assert cache.get('b') is None
+    assert cache.summary() == "1 hits, 1 misses, 1 evicted (50% hit rate)"
+
+
+def test_newest_entry_is_kept_over_the_limit(tmp_path):
+    cache = AnalysisCache(tmp_path, max_bytes=10)
+
+    cache.put('a', ANALYSIS)
+    cache.put('b', ANALYSIS)
+
+    assert [path.stem for path in tmp_path.glob('*.json')] == ['b']
+
+
+def test_digest_ignores_the_collection_date(tmp_path):
+    def commit_file(name, collected, subject):
+        path = tmp_path / name
+        path.write_text(
+            f"=== REPOSITORY: web-app ===\n=== COLLECTION DATE: {collected} ===\n\n=== COMMITS ===\n\n"
+            f"COMMIT_START\nabc|Alice|a@x|2026-03-04 12:00:00 +0000|{subject}\n"
+            f"=== COLLECTION DATE: in a body ===\nCOMMIT_END\n\n"
+        )
+        return path
+
+    first = commit_file_digest(commit_file('a.txt', 'Mon Mar 09 10:00:00 2026', 'feat: x'))
+
+    assert commit_file_digest(commit_file('b.txt', 'Tue Mar 10 11:00:00 2026', 'feat: x')) == first
+    assert commit_file_digest(commit_file('c.txt', 'Mon Mar 09 10:00:00 2026', 'feat: y')) != first
@@ -0,0 +1,63 @@
+from analysis_chunks import chunk_commits, merge_analyses, TRUNCATED_MARKER
+from commit_parser import format_commit
+
+from helpers import sample_commits
+
+
+def test_chunks_fit_the_budget_and_keep_every_commit():
+    commits = sample_commits(30)
+    budget = 1000
+
+    chunks = list(chunk_commits(commits, budget))
+
+    assert len(chunks) > 1
+    assert all(len(text) <= budget for text, _ in chunks)
+    assert [c for _, chunk in chunks for c in chunk] == commits
+    assert ''.join(text for text, _ in chunks) == ''.join(format_commit(c) for c in commits)
+
+
+def test_oversized_body_is_trimmed():
+    commit = dict(sample_commits(1)[0], body='x' * 5000)
+
+    (text, chunk), = chunk_commits([commit], 500)
+
+    assert len(text) <= 500
+    assert TRUNCATED_MARKER in text
+    assert chunk == [commit]
+
+
+def test_merge_sums_counts_and_keeps_worst_health():
+    parts = [
+        {'repo': 'web-app', 'health': '🟢', 'total_commits': 10, 'active_branches': 3,
+         'authors': ['Alice', 'Bob'], 'bugs_fixed': ['crash']},
+        {'repo': 'web-app', 'health': '🔴', 'total_commits': 5, 'active_branches': 4,
+         'authors': ['Bob', 'Carol'], 'bugs_fixed': []},
+        {'repo': 'web-app', 'health': '🟡', 'total_commits': 1, 'active_branches': 1,
+         'authors': [], 'bugs_fixed': ['timeout']},
+    ]
+
+    merged = merge_analyses(parts)
+
+    assert merged == {
+        'repo': 'web-app', 'health': '🔴', 'total_commits': 16, 'active_branches': 4,
+        'authors': ['Alice', 'Bob', 'Carol'], 'bugs_fixed': ['crash', 'timeout'],
+    }
+
+
+def test_merge_folds_named_items_in_chunk_order():
+    parts = [
+        {'initiatives': [{'name': 'auth', 'commits': 2, 'highlights': ['jwt'], 'status': ''}],
+         'feature_branches': [{'name': 'feature/x', 'commits': 1}]},
+        {'initiatives': [{'name': 'search', 'commits': 1},
+                         {'name': 'auth', 'commits': 3, 'highlights': ['jwt', 'oauth'], 'status': 'done'}],
+         'feature_branches': [{'name': 'feature/x', 'commits': 2}]},
+    ]
+
+    merged = merge_analyses(parts)
+
+    assert merged['initiatives'] == [
+        {'name': 'auth', 'commits': 5, 'highlights': ['jwt', 'oauth'], 'status': 'done'},
+        {'name': 'search', 'commits': 1},
+    ]
+    assert merged['feature_branches'] == [{'name': 'feature/x', 'commits': 3}]
+    assert parts[0]['initiatives'][0]['highlights'] == ['jwt']
@@ -0,0 +1,74 @@
+import os
+from datetime import datetime
+
+from commit_parser import DumpIndex, format_commit, iter_commit_headers, iter_commits, load_body
+from commit_table import CommitTable
+
+from helpers import make_commit
+
+HEADER_FIELDS = ('repo', 'hash', 'author', 'email', 'date', 'subject', 'type')
+
+
+def commits():
+    return [
+        make_commit('web-app', 'Alice', 'feat: one | with pipe', datetime(2026, 3, 3, 9, 0), body="Why.\n\nDetails."),
+        make_commit('web-app', 'Bob', 'fix: two', datetime(2026, 3, 4, 9, 0)),
+        make_commit('workers', 'Carol', 'perf: three', datetime(2026, 3, 5, 9, 0), body="Faster."),
+    ]
+
+
+def write_dump(path, records, tail=''):
+    with open(path, 'w') as f:
+        for repo in ('web-app', 'ghost (NOT FOUND)', 'workers'):
+            f.write(f"=== REPO: {repo} ===\n\n")
+            for commit in records:
+                if commit['repo'] == repo:
+                    f.write(format_commit(commit))
+        f.write(tail)
+    return str(path)
+
+
+def headers(record):
+    return tuple(record[field] for field in HEADER_FIELDS)
+
+
+def test_scan_yields_headers_and_decodes_bodies_on_demand(tmp_path):
+    expected = commits()
+    path = write_dump(tmp_path / 'dump.txt', expected)
+
+    with DumpIndex(path) as dump:
+        records = list(dump.scan())
+        assert all(record['body'] is None for record in records)
+        assert [headers(r) for r in records] == [headers(c) for c in expected]
+        assert [s[0] for s in dump.sections] == ['web-app', 'ghost (NOT FOUND)', 'workers']
+        assert dump.body(2) == "Faster."
+
+    # Unmapped: bodies are read from the file itself
+    assert [load_body(r) for r in records] == [c['body'] for c in expected]
+
+
+def test_replaced_file_gives_empty_bodies(tmp_path):
+    path = write_dump(tmp_path / 'dump.txt', commits())
+    records = list(iter_commit_headers(path))
+
+    os.replace(write_dump(tmp_path / 'new.txt', commits()[:1]), path)
+
+    assert load_body(records[0]) == ''
+
+
+def test_truncated_records_are_dropped(tmp_path):
+    expected = commits()
+    path = write_dump(tmp_path / 'dump.txt', expected, tail="COMMIT_START\nabc|Dave|d@x|2026-03-06 09:00:00 +0000|feat: cut")
+
+    assert [(c['subject'], c['body']) for c in iter_commits(path)] == [(c['subject'], c['body']) for c in expected]
+
+
+def test_table_rows_load_bodies_lazily(tmp_path):
+    expected = commits()
+    path = write_dump(tmp_path / 'dump.txt', expected)
+
+    table = CommitTable.from_commits(iter_commit_headers(path))
+
+    assert table.bodies == [None, None, None]
+    assert table.row(0).body == "Why.\n\nDetails."
+    assert table.bodies == ["Why.\n\nDetails.", None, None]
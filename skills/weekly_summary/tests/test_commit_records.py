@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from commit_records import RecordWriter, index_path, iter_records, load_record_index, save_record_index
+
+from helpers import make_commit
+
+
+def write_records(tmp_path, commits):
+    path = str(tmp_path / 'web-app.ndjson')
+    with RecordWriter(path, 'web-app') as writer:
+        for commit in commits:
+            writer.write(commit)
+    save_record_index(writer.index, index_path(path))
+    return path, load_record_index(index_path(path))
+
+
+def week(tmp_path):
+    # Newest first, as the store yields them; awkward text survives the round trip
+    commits = [
+        make_commit('web-app', 'Zoë', 'fix: "quoted" | piped', datetime(2026, 3, 6, 18, 0), body="line 1\nCOMMIT_END\n"),
+        make_commit('web-app', 'Bob', 'feat: two', datetime(2026, 3, 4, 23, 59)),
+        make_commit('web-app', 'Alice', 'feat: one', datetime(2026, 3, 4, 0, 0)),
+        make_commit('web-app', 'Alice', 'chore: monday', datetime(2026, 3, 2, 9, 0)),
+    ]
+    return commits, write_records(tmp_path, commits)
+
+
+def test_index_maps_days_to_byte_ranges(tmp_path):
+    commits, (path, index) = week(tmp_path)
+
+    assert index_path(path) == str(tmp_path / 'web-app.index.json')
+    assert index['count'] == 4
+    assert sorted(index['days']) == ['2026-03-02', '2026-03-04', '2026-03-06']
+    assert index['days']['2026-03-04'][2] == 2
+    assert sum(length for _, length, _ in index['days'].values()) == index['bytes']
+
+
+def test_all_records_round_trip(tmp_path):
+    commits, (path, index) = week(tmp_path)
+
+    assert list(iter_records(path, index)) == commits
+
+
+def test_only_selected_days_are_read(tmp_path):
+    commits, (path, index) = week(tmp_path)
+
+    assert [r['subject'] for r in iter_records(path, index, '2026-03-03', '2026-03-05')] == ['feat: two', 'feat: one']
+    assert list(iter_records(path, index, '2026-03-09', '2026-03-15')) == []
+
+
+def test_empty_file_and_missing_index(tmp_path):
+    path, index = write_records(tmp_path, [])
+
+    assert list(iter_records(path, index)) == []
+    assert load_record_index(str(tmp_path / 'missing.index.json')) is None
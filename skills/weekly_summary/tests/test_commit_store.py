@@ -0,0 +1,98 @@
+import os
+import time
+
+import pytest
+
+import collect_commits
+from branch_index import window_bounds
+from collect_commits import fetch_new_commits
+from commit_store import CommitStore
+
+from helpers import commit, git
+
+MONDAY, SUNDAY = '2026-03-02', '2026-03-08'
+
+
+def tips(repo):
+    return git(repo, 'for-each-ref', '--format=%(objectname)', 'refs/heads/').split()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = str(tmp_path / 'web-app')
+    os.makedirs(path)
+    git(path, 'init', '-q', '-b', 'main')
+    commit(path, 'a.txt', '2026-03-03T10:00:00')
+    commit(path, 'b.txt', '2026-03-04T10:00:00')
+    return path
+
+
+@pytest.fixture
+def store(tmp_path):
+    with CommitStore(str(tmp_path / 'commits.db')) as store:
+        yield store
+
+
+@pytest.fixture
+def walks(monkeypatch):
+    """Record the tips excluded from each git log walk."""
+    excluded = []
+    stream = collect_commits.stream_git_records
+
+    def recording(repo, args, deadline, stdin_data=''):
+        excluded.append(stdin_data.split())
+        return stream(repo, args, deadline, stdin_data)
+    monkeypatch.setattr(collect_commits, 'stream_git_records', recording)
+    return excluded
+
+
+def fetch(repo, store):
+    _, _, since_ts, _ = window_bounds(MONDAY, SUNDAY)
+    return fetch_new_commits(repo, store, since_ts, tips(repo), time.monotonic() + 30)
+
+
+def test_first_fetch_stores_window_and_watermark(repo, store, walks):
+    assert fetch(repo, store) == 2
+
+    _, _, since_ts, until_ts = window_bounds(MONDAY, SUNDAY)
+    mark = store.watermark(repo)
+    assert mark['low'] == since_ts
+    assert mark['tips'] == tips(repo)
+    assert walks == [[]]
+    assert [c['subject'] for c in store.iter_commits(since_ts, until_ts, repo)] == ['feat: add b.txt', 'feat: add a.txt']
+
+
+def test_refetch_excludes_seen_tips(repo, store, walks):
+    fetch(repo, store)
+    seen = tips(repo)
+
+    assert fetch(repo, store) == 0
+    assert walks[1] == [f"^{tip}" for tip in seen]
+
+
+def test_refetch_adds_only_new_commits(repo, store, walks):
+    fetch(repo, store)
+    commit(repo, 'c.txt', '2026-03-05T10:00:00')
+
+    assert fetch(repo, store) == 1
+    assert store.watermark(repo)['tips'] == tips(repo)
+    assert store.missing_patch_ids(repo) == []
+
+
+def test_wider_window_walks_full_history(repo, store, walks):
+    fetch(repo, store)
+    _, _, since_ts, _ = window_bounds('2026-02-23', '2026-03-01')
+
+    fetch_new_commits(repo, store, since_ts, tips(repo), time.monotonic() + 30)
+
+    assert walks[1] == []
+    assert store.watermark(repo)['low'] == since_ts
+
+
+def test_bodies_come_from_the_log_stream(repo, store):
+    commit(repo, 'c.txt', '2026-03-05T10:00:00', body="Why c.txt.\n\nRefs #12")
+    fetch(repo, store)
+
+    _, _, since_ts, until_ts = window_bounds(MONDAY, SUNDAY)
+    bodies = {c['subject']: c['body'] for c in store.iter_commits(since_ts, until_ts, repo)}
+    assert bodies == {'feat: add c.txt': "Why c.txt.\n\nRefs #12", 'feat: add b.txt': '', 'feat: add a.txt': ''}
@@ -0,0 +1,77 @@
+import os
+import time
+
+import pytest
+
+from branch_index import build_branch_index, list_refs, window_bounds
+from collect_commits import fetch_new_commits, run_git
+from commit_store import CommitStore
+from deploy_stages import build_stage_map, load_stage_map, merged_branch_name, save_stage_map
+
+from helpers import commit, git
+
+MONDAY, SUNDAY = '2026-03-02', '2026-03-08'
+
+
+@pytest.fixture
+def stage_map(tmp_path):
+    repo = str(tmp_path / 'web-app')
+    os.makedirs(repo)
+    git(repo, 'init', '-q', '-b', 'main')
+    commit(repo, 'base.txt', '2026-03-02T09:00:00')
+    git(repo, 'branch', 'dev')
+    git(repo, 'branch', 'staging')
+
+    # feature/x is merged into dev: an alpha deployment
+    git(repo, 'checkout', '-q', '-b', 'feature/x', 'dev')
+    commit(repo, 'x.txt', '2026-03-03T09:00:00')
+    git(repo, 'checkout', '-q', 'dev')
+    git(repo, 'merge', '-q', '--no-ff', '-m', "Merge branch 'feature/x' into dev", 'feature/x', when='2026-03-04T09:00:00')
+
+    # feature/y lands on staging as a cherry-pick: a squash promotion
+    git(repo, 'checkout', '-q', '-b', 'feature/y', 'main')
+    commit(repo, 'y.txt', '2026-03-04T12:00:00')
+    git(repo, 'checkout', '-q', 'staging')
+    git(repo, 'cherry-pick', 'feature/y', when='2026-03-05T09:00:00')
+
+    # main merged back into dev is not a promotion
+    git(repo, 'checkout', '-q', 'main')
+    commit(repo, 'hotfix.txt', '2026-03-05T12:00:00')
+    git(repo, 'checkout', '-q', 'dev')
+    git(repo, 'merge', '-q', '--no-ff', '-m', "Merge branch 'main' into dev", 'main', when='2026-03-06T09:00:00')
+
+    deadline = time.monotonic() + 30
+    _, _, since_ts, until_ts = window_bounds(MONDAY, SUNDAY)
+    run = lambda args: run_git(repo, args, deadline)
+    refs = list_refs(run)
+    graph = {}
+    index = build_branch_index(run, MONDAY, SUNDAY, refs, graph)
+    with CommitStore(str(tmp_path / 'commits.db')) as store:
+        fetch_new_commits(repo, store, since_ts, index['tips'], deadline)
+        return build_stage_map(index, graph, store.commit_index(repo, since_ts, until_ts))
+
+
+def test_merge_and_squash_promotions(stage_map):
+    alpha = stage_map['stages']['alpha']
+    staging = stage_map['stages']['staging']
+
+    assert [(p['branch'], p['kind'], p['commits'], p['date']) for p in alpha] == [('feature/x', 'merge', 1, '2026-03-04')]
+    assert [(p['branch'], p['kind'], p['date']) for p in staging] == [('feature/y', 'squash', '2026-03-05')]
+    assert stage_map['stages']['production'] == []
+
+
+def test_stage_map_is_indexed_by_branch_and_round_trips(stage_map, tmp_path):
+    assert sorted(stage_map['branches']) == ['feature/x', 'feature/y']
+    assert [entry['stage'] for entry in stage_map['branches']['feature/y']] == ['staging']
+
+    path = str(tmp_path / 'web-app.stages.json')
+    save_stage_map(stage_map, path)
+    assert load_stage_map(path) == stage_map
+    assert load_stage_map(str(tmp_path / 'missing.json')) is None
+
+
+def test_merged_branch_name_from_subjects():
+    assert merged_branch_name("Merge branch 'feature/x' into dev") == 'feature/x'
+    assert merged_branch_name("Merge remote-tracking branch 'origin/feature/y'") == 'feature/y'
+    assert merged_branch_name("Merge pull request #12 from acme/feature/z") == 'feature/z'
+    assert merged_branch_name("feat: not a merge") is None
@@ -0,0 +1,29 @@
+from fingerprints import load_fingerprints, ref_fingerprint, same_inputs, save_fingerprints
+
+REFS = "aaa 1772445600 refs/heads/main main\nbbb 1772532000 refs/heads/dev dev\n"
+
+
+def record(refs=REFS, monday='2026-03-02', sunday='2026-03-08'):
+    return {'fingerprint': ref_fingerprint(refs), 'monday': monday, 'sunday': sunday, 'commits': 3}
+
+
+def test_same_refs_and_window_match():
+    assert same_inputs(record(), record())
+
+
+def test_moved_tip_or_other_window_differs():
+    assert not same_inputs(record(REFS.replace('bbb', 'ccc')), record())
+    assert not same_inputs(record(monday='2026-03-09', sunday='2026-03-15'), record())
+    assert not same_inputs(record(), None)
+
+
+def test_round_trip_and_unreadable_file(tmp_path):
+    path = str(tmp_path / '.fingerprints.json')
+    assert load_fingerprints(path) == {}
+
+    save_fingerprints(path, {'web-app': record()})
+    assert same_inputs(record(), load_fingerprints(path)['web-app'])
+
+    with open(path, 'w') as f:
+        f.write('{not json')
+    assert load_fingerprints(path) == {}
@@ -0,0 +1,39 @@
+import random
+
+from aggregation import INITIATIVE_KEYWORDS, THEME_KEYWORDS, THEME_MATCHER, INITIATIVE_MATCHER
+from keyword_matcher import KeywordMatcher
+
+from helpers import SUBJECTS
+
+
+def naive_match(table, text):
+    text = text.lower()
+    return [label for label, keywords in table if any(keyword in text for keyword in keywords)]
+
+
+def test_match_is_case_insensitive_substring_in_table_order():
+    matcher = KeywordMatcher([('a', ('he', 'she')), ('b', ('hers',)), ('c', ('his',))])
+
+    assert matcher.match("USHERS") == ['a', 'b']
+    assert matcher.first("USHERS") == 'a'
+    assert matcher.match("this") == ['c']
+    assert matcher.first("nothing") is None
+    assert matcher.mask("nothing") == 0
+
+
+def test_overlapping_keywords_found_through_failure_links():
+    matcher = KeywordMatcher([('long', ('abcd',)), ('inner', ('bc',)), ('tail', ('cde',))])
+
+    assert matcher.match("xabcde") == ['long', 'inner', 'tail']
+    assert matcher.match("abce") == ['inner']
+
+
+def test_agrees_with_substring_scan_on_the_report_tables():
+    initiatives = [(name, keywords) for name, *keywords in INITIATIVE_KEYWORDS.values()]
+    rng = random.Random(7)
+    words = [kw for _, keywords in THEME_KEYWORDS + initiatives for kw in keywords] + ['fix', 'the', 'x']
+    subjects = SUBJECTS + [' '.join(rng.choice(words) for _ in range(4)) for _ in range(200)]
+
+    for subject in subjects:
+        assert THEME_MATCHER.match(subject) == naive_match(THEME_KEYWORDS, subject)
+        assert INITIATIVE_MATCHER.match(subject) == naive_match(initiatives, subject)
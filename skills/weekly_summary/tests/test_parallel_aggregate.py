@@ -0,0 +1,41 @@
+import pytest
+
+import commit_store
+import parallel_aggregate
+from aggregation import aggregate
+from commit_parser import format_commit
+from commit_table import CommitTable
+
+from helpers import sample_commits
+
+
+@pytest.fixture
+def commit_dir(tmp_path, monkeypatch):
+    """Point the per-repo files at a temporary directory, with no store."""
+    monkeypatch.setattr(parallel_aggregate, 'repo_output_file', lambda repo: str(tmp_path / f"{repo}.txt"))
+    monkeypatch.setattr(parallel_aggregate, 'records_file', lambda repo: str(tmp_path / f"{repo}.ndjson"))
+    return tmp_path
+
+
+def test_uncollected_repo_is_skipped(commit_dir, monkeypatch):
+    def combined_dump(*args):
+        raise AssertionError("the combined dump must not be read per repo")
+    monkeypatch.setattr(commit_store, 'iter_commit_headers', combined_dump)
+
+    rollup = parallel_aggregate.repo_rollup('never-collected', '2026-03-02', '2026-03-08', str(commit_dir / 'none.db'))
+
+    assert rollup.total_commits == 0
+    assert rollup.repos == {}
+
+
+def test_repo_file_is_aggregated(commit_dir):
+    commits = [dict(commit, repo='web-app') for commit in sample_commits(20)]
+    with open(commit_dir / 'web-app.txt', 'w') as f:
+        f.write("=== REPOSITORY: web-app ===\n\n=== COMMITS ===\n\n")
+        for commit in commits:
+            f.write(format_commit(commit))
+
+    rollup = parallel_aggregate.repo_rollup('web-app', '2026-03-02', '2026-03-08', str(commit_dir / 'none.db'))
+
+    assert rollup.total_commits == 20
+    assert rollup.to_dict() == aggregate(CommitTable.from_commits(commits)).to_dict()
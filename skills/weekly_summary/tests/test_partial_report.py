@@ -0,0 +1,66 @@
+import pytest
+
+from aggregation import aggregate
+from commit_table import CommitTable
+from partial_report import PARTIAL_VERSION, make_partial, merge_partials, save_partial, load_partial
+
+from helpers import sample_commits, by_repo
+
+MONDAY, SUNDAY = '2026-03-02', '2026-03-08'
+
+
+def workspace_partial(commits, repos, name, monday=MONDAY, sunday=SUNDAY):
+    analyses = [{'repo': repo, 'total_commits': 1, 'authors': []} for repo in repos]
+    return make_partial(monday, sunday, aggregate(CommitTable.from_commits(commits)), analyses, repos, name)
+
+
+def test_merged_partials_match_one_workspace():
+    groups = by_repo(sample_commits())
+    repos = list(groups)
+    everything = workspace_partial([c for commits in groups.values() for c in commits], repos, 'all')
+    teams = [
+        workspace_partial([c for repo in repos[:2] for c in groups[repo]], repos[:2], 'team-a'),
+        workspace_partial([c for repo in repos[2:] for c in groups[repo]], repos[2:], 'team-b'),
+    ]
+
+    merged = merge_partials(teams)
+
+    assert merged['rollup'] == everything['rollup']
+    assert merged['analyses'] == everything['analyses']
+    assert merged['workspaces'] == ['team-a', 'team-b']
+    assert merged['rollup']['tracked_repos'] == repos
+
+
+def test_merged_partial_can_be_saved_and_merged_again(tmp_path):
+    groups = list(by_repo(sample_commits()).items())
+    partials = [workspace_partial(commits, [repo], repo) for repo, commits in groups]
+
+    path = tmp_path / 'first-two.json'
+    save_partial(merge_partials(partials[:2]), str(path))
+    staged = merge_partials([load_partial(str(path))] + partials[2:])
+
+    assert staged == merge_partials(partials)
+
+
+def test_partials_of_different_weeks_are_rejected():
+    commits = sample_commits(10)
+    partials = [
+        workspace_partial(commits, ['web-app'], 'a'),
+        workspace_partial(commits, ['workers'], 'b', '2026-03-09', '2026-03-15'),
+    ]
+
+    with pytest.raises(ValueError, match='does not match'):
+        merge_partials(partials)
+
+
+def test_unknown_partial_version_is_rejected():
+    partial = workspace_partial(sample_commits(10), ['web-app'], 'a')
+    partial['version'] = PARTIAL_VERSION + 1
+
+    with pytest.raises(ValueError, match='version'):
+        merge_partials([partial])
+
+
+def test_merging_nothing_is_an_error():
+    with pytest.raises(ValueError):
+        merge_partials([])
@@ -0,0 +1,93 @@
+import os
+import time
+from datetime import datetime
+
+from branch_index import window_bounds
+from collect_commits import fetch_new_commits
+from commit_store import CommitStore
+from patch_index import build_patch_index, duplicate_count, parse_patch_ids
+
+from helpers import commit, git, make_commit
+
+MONDAY, SUNDAY = '2026-03-02', '2026-03-08'
+
+
+def test_parse_patch_ids():
+    output = "p1 aaa\np2 bbb\n\nbroken line here\n"
+
+    assert parse_patch_ids(output) == {'aaa': 'p1', 'bbb': 'p2'}
+
+
+def stored(tmp_path):
+    original = make_commit('web-app', 'Alice', 'feat: search', datetime(2026, 3, 3, 9, 0))
+    # Same author date, new committer date and hash
+    rebased = dict(make_commit('web-app', 'Alice', 'feat: search', datetime(2026, 3, 3, 9, 0), datetime(2026, 3, 5, 9, 0)),
+                   hash='f' * 40)
+    picked = make_commit('web-app', 'Bob', 'feat: search', datetime(2026, 3, 6, 9, 0))
+    merge = make_commit('web-app', 'Bob', 'Merge branch feature/search', datetime(2026, 3, 6, 10, 0))
+    other = make_commit('web-app', 'Carol', 'fix: login', datetime(2026, 3, 4, 9, 0))
+    commits = [original, rebased, picked, merge, other]
+
+    store = CommitStore(str(tmp_path / 'commits.db'))
+    store.add_commits('web-app', commits)
+    store.set_patch_ids('web-app', [c['hash'] for c in commits],
+                        {original['hash']: 'p1', rebased['hash']: 'p1', picked['hash']: 'p1', other['hash']: 'p2'})
+    return store, commits
+
+
+def test_dedupe_keeps_the_earliest_commit_of_a_change(tmp_path):
+    store, (original, rebased, picked, merge, other) = stored(tmp_path)
+    _, _, since_ts, until_ts = window_bounds(MONDAY, SUNDAY)
+
+    with store:
+        assert store.missing_patch_ids('web-app') == []
+        deduped = [c['hash'] for c in store.iter_commits(since_ts, until_ts, 'web-app', dedupe=True)]
+        everything = list(store.iter_commits(since_ts, until_ts, 'web-app'))
+
+    assert deduped == [merge['hash'], other['hash'], original['hash']]
+    assert len(everything) == 5
+
+
+def test_copies_outside_the_window_do_not_hide_a_commit(tmp_path):
+    store, (original, rebased, picked, merge, other) = stored(tmp_path)
+    _, _, since_ts, until_ts = window_bounds('2026-03-05', SUNDAY)
+
+    with store:
+        deduped = [c['hash'] for c in store.iter_commits(since_ts, until_ts, 'web-app', dedupe=True)]
+
+    assert deduped == [merge['hash'], rebased['hash']]
+
+
+def test_patch_index_lists_every_copy_and_branch(tmp_path):
+    store, (original, rebased, picked, merge, other) = stored(tmp_path)
+    _, _, since_ts, until_ts = window_bounds(MONDAY, SUNDAY)
+    branch_index = {'branches': {'feature/search': [original['hash']], 'main': [picked['hash'], other['hash']]}}
+
+    with store:
+        index = build_patch_index(store.duplicate_groups(since_ts, until_ts, 'web-app'), branch_index)
+
+    assert index == {original['hash']: {
+        'patch_id': 'p1',
+        'hashes': [original['hash'], rebased['hash'], picked['hash']],
+        'branches': ['feature/search', 'main'],
+    }}
+    assert duplicate_count(index) == 2
+
+
+def test_cherry_pick_is_collapsed_from_git(tmp_path):
+    repo = str(tmp_path / 'web-app')
+    os.makedirs(repo)
+    git(repo, 'init', '-q', '-b', 'main')
+    commit(repo, 'a.txt', '2026-03-02T10:00:00')
+    git(repo, 'checkout', '-q', '-b', 'feature/b')
+    commit(repo, 'b.txt', '2026-03-03T10:00:00')
+    git(repo, 'checkout', '-q', 'main')
+    git(repo, 'cherry-pick', 'feature/b', when='2026-03-05T10:00:00')
+
+    _, _, since_ts, until_ts = window_bounds(MONDAY, SUNDAY)
+    tips = git(repo, 'for-each-ref', '--format=%(objectname)', 'refs/heads/').split()
+    with CommitStore(str(tmp_path / 'commits.db')) as store:
+        assert fetch_new_commits(repo, store, since_ts, tips, time.monotonic() + 30) == 3
+        subjects = [c['subject'] for c in store.iter_commits(since_ts, until_ts, repo, dedupe=True)]
+
+    assert subjects == ['feat: add b.txt', 'feat: add a.txt']
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+from commit_table import CommitTable
+from range_report import weekly_rollups
+
+from helpers import make_commit
+
+
+def weeks_of(commits, start, end):
+    table = CommitTable.from_commits(commits)
+    return [(week, monday, sunday, rollup.total_commits) for week, monday, sunday, rollup in weekly_rollups(table, start, end)]
+
+
+def test_commits_are_bucketed_by_committer_date():
+    # Rebased in March: authored in February, committed in the range
+    rebased = make_commit('web-app', 'Alice', 'feat: rebased', datetime(2026, 2, 10, 9, 0), datetime(2026, 3, 4, 9, 0))
+
+    assert weeks_of([rebased], '2026-03-02', '2026-03-15') == [('2026-W10', '2026-03-02', '2026-03-08', 1)]
+
+
+def test_week_boundaries_follow_local_midnight():
+    sunday_night = make_commit('web-app', 'Alice', 'fix: late', datetime(2026, 3, 8, 23, 59, 59))
+    monday_morning = make_commit('web-app', 'Bob', 'fix: early', datetime(2026, 3, 9, 0, 0, 0))
+
+    assert weeks_of([sunday_night, monday_morning], '2026-03-02', '2026-03-15') == [
+        ('2026-W10', '2026-03-02', '2026-03-08', 1),
+        ('2026-W11', '2026-03-09', '2026-03-15', 1),
+    ]
+
+
+def test_weeks_stay_inside_the_range():
+    commits = [
+        make_commit('web-app', 'Alice', 'feat: before', datetime(2026, 2, 25, 12, 0)),
+        make_commit('web-app', 'Alice', 'feat: first', datetime(2026, 3, 5, 12, 0)),
+        make_commit('web-app', 'Alice', 'feat: last', datetime(2026, 3, 10, 12, 0)),
+        make_commit('web-app', 'Alice', 'feat: after', datetime(2026, 3, 20, 12, 0)),
+    ]
+
+    # A range that starts and ends mid-week cuts its first and last weeks
+    assert weeks_of(commits, '2026-03-04', '2026-03-11') == [
+        ('2026-W10', '2026-03-04', '2026-03-08', 1),
+        ('2026-W11', '2026-03-09', '2026-03-11', 1),
+    ]
+
+
+def test_mid_week_range_ignores_rows_outside_it():
+    # The table was loaded for whole weeks, wider than a Wednesday-to-Tuesday range
+    commits = [
+        make_commit('web-app', 'Alice', 'feat: monday', datetime(2026, 3, 2, 12, 0)),
+        make_commit('web-app', 'Bob', 'fix: tuesday', datetime(2026, 3, 3, 23, 59)),
+        make_commit('web-app', 'Alice', 'feat: wednesday', datetime(2026, 3, 4, 0, 0)),
+        make_commit('web-app', 'Carol', 'feat: sunday', datetime(2026, 3, 8, 18, 0)),
+        make_commit('web-app', 'Alice', 'fix: next tuesday', datetime(2026, 3, 10, 9, 0)),
+        make_commit('web-app', 'Bob', 'fix: next wednesday', datetime(2026, 3, 11, 9, 0)),
+    ]
+    table = CommitTable.from_commits(commits)
+
+    weeks = weekly_rollups(table, '2026-03-04', '2026-03-10')
+
+    assert [(week, monday, sunday, rollup.total_commits) for week, monday, sunday, rollup in weeks] == [
+        ('2026-W10', '2026-03-04', '2026-03-08', 2),
+        ('2026-W11', '2026-03-09', '2026-03-10', 1),
+    ]
+    assert list(weeks[0][3].authors) == ['Alice', 'Carol']
+    assert list(weeks[1][3].authors) == ['Alice']
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Weekly summary pipeline: one entry point for every stage.
+
+Usage:
+  python3 weekly.py collect   YYYY-MM-DD YYYY-MM-DD [--workers N] [--timeout SECONDS]
+  python3 weekly.py analyze   YYYY-MM-DD YYYY-MM-DD [--backend local|command] [--concurrency N] [--jobs N]
+  python3 weekly.py aggregate YYYY-MM-DD YYYY-MM-DD [--jobs N]
+  python3 weekly.py render    YYYY-MM-DD YYYY-MM-DD [--jobs N]
+  python3 weekly.py all       YYYY-MM-DD YYYY-MM-DD [--workers N] [--timeout SECONDS] [--jobs N]
+  python3 weekly.py partial   YYYY-MM-DD YYYY-MM-DD [--partial-file FILE] [--workspace NAME] [--jobs N]
+  python3 weekly.py range     START END [--skip-collect]
+
+Every stage also accepts [--trace-file FILE] [--profile [DIR]].
+
+`all` runs collect → analyze → aggregate → render in one process: the
+week's commits are parsed once into a CommitTable and shared by the repo
+analyses and every report. Single stages load whatever they need.
+
+With `--jobs N`, the week is never parsed into one table: `analyze`
+loads each repo's commits and builds its prompts on a pool of N
+processes, and `aggregate`, `render` and `partial` parse and aggregate
+each repo on the pool (see parallel_aggregate). `all` does both.
+`collect` and `range` reject it.
+
+`partial` saves this workspace's rollup and repo analyses, without raw
+commits, for `partial_report.py` to merge with other workspaces'.
+
+`range` collects START..END once, buckets the commits into ISO weeks while
+parsing, and writes the technical and business reports of every week plus
+a `START-to-END-retrospective.md` rollup.
+
+Every stage is timed (see instrumentation): the run ends with a timing
+table and a Chrome trace in `--trace-file`. `--profile [DIR]` also
+cProfiles parsing and rendering.
+"""
+
+import argparse
+
+from config import REPORT_DIR, AGENT_OUTPUT_DIR
+from commit_store import STORE_PATH, week_commits
+from commit_table import CommitTable
+from aggregation import aggregate
+from parallel_aggregate import parallel_rollup
+from collect_commits import collect_all, DEFAULT_WORKERS, DEFAULT_TIMEOUT
+from orchestrate_summary import analyze_repos, load_agent_results, add_agent_arguments, agent_options
+from renderers import write_reports
+from partial_report import make_partial, save_partial
+from range_report import weekly_rollups, write_range_report
+from instrumentation import span, profiled, start_trace, finish_trace, add_trace_arguments
+
+
+class PipelineRun:
+    """State shared between the stages of one run."""
+
+    def __init__(self, monday, sunday, store_path=STORE_PATH, jobs=1):
+        self.monday = monday
+        self.sunday = sunday
+        self.store_path = store_path
+        self.jobs = jobs
+        self.table = None
+        self.rollup = None
+        self.analyses = None
+
+    def collect(self, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT):
+        print(f"📦 Collecting commits from all branches for week: {self.monday} to {self.sunday}\n")
+        with span("collect"):
+            collect_all(self.monday, self.sunday, workers=workers, timeout=timeout, store_path=self.store_path)
+        # Anything parsed before collection is stale now
+        self.table = None
+        self.rollup = None
+
+    def load(self):
+        """Parse the week's commits once; later stages reuse the table."""
+        if self.table is None:
+            print("📖 Parsing commits...")
+            with span("parse") as args, profiled("parse"):
+                self.table = CommitTable.from_commits(week_commits(self.monday, self.sunday, path=self.store_path))
+                args['commits'] = len(self.table)
+            print(f"   {len(self.table)} commits loaded\n")
+        return self.table
+
+    def analyze(self, backend=None, **options):
+        print("📊 Analyzing repositories...\n")
+        commits_by_repo = None
+        if self.table is not None or self.jobs <= 1:
+            table = self.load()
+            commits_by_repo = {
+                repo: list(table.rows(rows)) for repo, rows in table.group_by('repo').items()
+            }
+        with span("analyze"):
+            self.analyses = analyze_repos(
+                self.monday, self.sunday, commits_by_repo, backend,
+                jobs=self.jobs, store_path=self.store_path, **options
+            )
+        print(f"\n✅ {len(self.analyses)} repos analyzed\n")
+        return self.analyses
+
+    def aggregate(self):
+        if self.rollup is None and self.table is None and self.jobs > 1:
+            print(f"📖 Parsing and aggregating commits on {self.jobs} processes...")
+            with span("parse and aggregate") as args:
+                self.rollup = parallel_rollup(self.monday, self.sunday, self.store_path, self.jobs)
+                args['commits'] = self.rollup.total_commits
+            print(f"   {self.rollup.total_commits} commits loaded\n")
+        if self.rollup is None:
+            table = self.load()
+            with span("aggregate"):
+                self.rollup = aggregate(table)
+        return self.rollup
+
+    def load_analyses(self):
+        """This run's repo analyses, or the ones saved by an earlier run."""
+        if self.analyses is None:
+            self.analyses = load_agent_results()
+        return self.analyses
+
+    def render(self):
+        """Write the technical, business and orchestrated reports."""
+        rollup = self.aggregate()
+        analyses = self.load_analyses()
+
+        with span("render"), profiled("render"):
+            written = write_reports(REPORT_DIR, self.monday, self.sunday, rollup, analyses)
+        for output_file in written:
+            print(f"✅ Report saved to {output_file}")
+
+        return written
+
+    def save_partial(self, path=None, workspace=None):
+        """Write this workspace's partial report for merging elsewhere."""
+        path = path or f"{REPORT_DIR}/{self.monday}-partial.json"
+        rollup = self.aggregate()
+        with span("save partial"):
+            save_partial(make_partial(self.monday, self.sunday, rollup, self.load_analyses(), workspace=workspace), path)
+        print(f"✅ Partial report saved to {path}")
+        return path
+
+    def render_range(self):
+        """Write per-week reports for the span and the span-wide rollup."""
+        table = self.load()
+        with span("aggregate weeks"):
+            weeks = weekly_rollups(table, self.monday, self.sunday)
+        rollup = self.aggregate()
+
+        written = []
+        with span("render"), profiled("render"):
+            for week, monday, sunday, week_rollup in weeks:
+                print(f"📅 {week}: {week_rollup.total_commits} commits")
+                written.extend(write_reports(REPORT_DIR, monday, sunday, week_rollup, names=['technical', 'business']))
+
+            output_file = f"{REPORT_DIR}/{self.monday}-to-{self.sunday}-retrospective.md"
+            with open(output_file, 'w') as f:
+                write_range_report(self.monday, self.sunday, rollup, weeks, f)
+            written.append(output_file)
+
+        print("")
+        for output_file in written:
+            print(f"✅ Report saved to {output_file}")
+        return written
+
+
+def print_rollup(rollup):
+    """Print the headline numbers of an aggregation."""
+    print(f"📊 {rollup.total_commits} commits across {rollup.active_repos} repositories")
+    print(f"   • Contributors: {len(rollup.authors)}")
+    print(f"   • Critical issues: {len(rollup.critical_issues())}")
+    print(f"\n📊 Identified {len(rollup.initiatives)} major initiatives:")
+    for name, details in rollup.sorted_initiatives(5):
+        print(f"   • {name}: {details['commits']} commits")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Weekly summary pipeline.")
+    parser.add_argument("stage", choices=["collect", "analyze", "aggregate", "render", "all", "range", "partial"])
+    parser.add_argument("monday", help="YYYY-MM-DD")
+    parser.add_argument("sunday", help="YYYY-MM-DD")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Repositories collected in parallel")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-repository collection timeout in seconds")
+    parser.add_argument("--store", default=STORE_PATH, help="Commit store database")
+    parser.add_argument("--jobs", type=int, default=1, help="analyze/aggregate/render/partial/all: processes loading repos in parallel")
+    parser.add_argument("--skip-collect", action="store_true", help="range: use already collected commits")
+    parser.add_argument("--partial-file", help="partial: output file (default: REPORT_DIR/MONDAY-partial.json)")
+    parser.add_argument("--workspace", help="partial: name recorded for this workspace (default: host name)")
+    add_agent_arguments(parser)
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    if args.jobs > 1 and args.stage in ("collect", "range"):
+        parser.error(f"--jobs has no effect on {args.stage}")
+
+    start_trace(args.trace_file, args.profile)
+    try:
+        run_stages(args)
+    finally:
+        finish_trace()
+
+
+def run_stages(args):
+    """Run the stages selected on the command line."""
+    run = PipelineRun(args.monday, args.sunday, args.store, args.jobs)
+
+    if args.stage in ("collect", "all") or (args.stage == "range" and not args.skip_collect):
+        run.collect(args.workers, args.timeout)
+        print("")
+
+    if args.stage == "range":
+        run.render_range()
+        print("")
+        print_rollup(run.aggregate())
+        return
+
+    if args.stage in ("analyze", "all"):
+        backend, options = agent_options(args)
+        run.analyze(backend, **options)
+
+    if args.stage == "aggregate":
+        print_rollup(run.aggregate())
+
+    if args.stage == "partial":
+        run.save_partial(args.partial_file, args.workspace)
+        print("")
+        print_rollup(run.aggregate())
+
+    if args.stage in ("render", "all"):
+        run.render()
+        print("")
+        print_rollup(run.aggregate())
+        if args.stage == "all":
+            print(f"   • Analyses written to: {AGENT_OUTPUT_DIR}")
+
+
+if __name__ == "__main__":
+    main()